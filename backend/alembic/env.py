@@ -13,6 +13,7 @@ from app.models import (
     AppInfo,
     Document,
     Product,
+    ProductCounter,
     Repository,
     User,
     WorkItem,
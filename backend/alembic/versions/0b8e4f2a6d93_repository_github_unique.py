@@ -0,0 +1,72 @@
+"""repository github unique
+
+GitHub imports upsert on (user_id, github_id), which needs a unique
+index. Duplicate imports made before keep their GitHub id on the oldest
+row only; the others stay as plain repositories. The unique index is
+built CONCURRENTLY and replaces the non-unique one.
+
+Revision ID: 0b8e4f2a6d93
+Revises: f6b3d9e2c871
+Create Date: 2026-10-18 19:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0b8e4f2a6d93"
+down_revision: Union[str, None] = "f6b3d9e2c871"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE repositories SET github_id = NULL
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY user_id, github_id ORDER BY created_at, id
+            ) AS position
+            FROM repositories
+            WHERE github_id IS NOT NULL
+        ) AS ranked
+        WHERE repositories.id = ranked.id AND ranked.position > 1
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_repositories_user_github_id",
+            "repositories",
+            ["user_id", "github_id"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_repositories_user_github_id",
+            table_name="repositories",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_repositories_user_github_id",
+            "repositories",
+            ["user_id", "github_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "uq_repositories_user_github_id",
+            table_name="repositories",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
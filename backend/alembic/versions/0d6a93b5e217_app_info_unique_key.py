@@ -0,0 +1,82 @@
+"""app_info unique key per product
+
+Removes duplicate (product_id, key) rows left by the old check-then-insert,
+keeping the most recently updated, and recounts app_info totals. Then
+builds the unique index CONCURRENTLY and attaches it as
+uq_app_info_product_key. It replaces ix_app_info_user_product_key.
+
+Revision ID: 0d6a93b5e217
+Revises: f41b7c3e9d26
+Create Date: 2026-10-18 12:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0d6a93b5e217"
+down_revision: Union[str, None] = "f41b7c3e9d26"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        DELETE FROM app_info
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY product_id, key ORDER BY updated_at DESC, id DESC
+                ) AS position
+                FROM app_info
+                WHERE product_id IS NOT NULL AND key IS NOT NULL
+            ) ranked
+            WHERE position > 1
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE product_counters AS c
+        SET count = (SELECT count(*) FROM app_info a WHERE a.product_id = c.product_id)
+        WHERE c.entity = 'app_info' AND c.dimension = 'total'
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_app_info_product_key",
+            "app_info",
+            ["product_id", "key"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.execute(
+        "ALTER TABLE app_info ADD CONSTRAINT uq_app_info_product_key "
+        "UNIQUE USING INDEX uq_app_info_product_key"
+    )
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_app_info_user_product_key",
+            table_name="app_info",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_app_info_user_product_key",
+            "app_info",
+            ["user_id", "product_id", "key"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.drop_constraint("uq_app_info_product_key", "app_info", type_="unique")
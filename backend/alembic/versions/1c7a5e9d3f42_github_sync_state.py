@@ -0,0 +1,41 @@
+"""github sync state
+
+When the background refresher last checked each imported repository,
+and the ETag GitHub returned, so unchanged repositories are revalidated
+for free. A separate table: updating repositories itself would stamp
+change_xid and publish a change event for every check.
+
+Revision ID: 1c7a5e9d3f42
+Revises: 0b8e4f2a6d93
+Create Date: 2026-10-18 20:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1c7a5e9d3f42"
+down_revision: Union[str, None] = "0b8e4f2a6d93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "github_sync_state",
+        sa.Column("repository_id", sa.Uuid(), nullable=False),
+        sa.Column("etag", sqlmodel.sql.sqltypes.AutoString(length=200), nullable=True),
+        sa.Column("checked_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["repository_id"], ["repositories.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("repository_id"),
+    )
+    op.create_index("ix_github_sync_state_checked_at", "github_sync_state", ["checked_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_github_sync_state_checked_at", table_name="github_sync_state")
+    op.drop_table("github_sync_state")
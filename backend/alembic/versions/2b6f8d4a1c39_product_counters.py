@@ -0,0 +1,69 @@
+"""product counters
+
+Adds product_counters, the per-product row counts behind the product
+summary, and fills it from the child tables with the same aggregate as
+POST /products/summary/rebuild (counter_ops.rebuild). The write paths
+only apply deltas, so the counts have to be complete before the
+application starts maintaining them.
+
+Revision ID: 2b6f8d4a1c39
+Revises: 3f1c9a2b7d10
+Create Date: 2026-10-18 09:02:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2b6f8d4a1c39"
+down_revision: Union[str, None] = "3f1c9a2b7d10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> counted dimensions besides "total" (matches app.domain.counter_operations.COUNTED)
+COUNTED = {
+    "repositories": (),
+    "work_items": ("status", "type"),
+    "documents": ("type",),
+    "app_info": (),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "product_counters",
+        sa.Column("product_id", sa.Uuid(), nullable=False),
+        sa.Column("entity", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column("dimension", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column("bucket", sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("product_id", "entity", "dimension", "bucket"),
+    )
+
+    # NULL buckets count as '', as in the domain deltas
+    for table, dimensions in COUNTED.items():
+        for dimension in ("total", *dimensions):
+            bucket = "''" if dimension == "total" else f"coalesce({dimension}, '')"
+            group_by = "product_id, user_id" + ("" if dimension == "total" else f", {bucket}")
+            op.execute(
+                f"INSERT INTO product_counters "
+                f"(product_id, entity, dimension, bucket, user_id, count) "
+                f"SELECT product_id, '{table}', '{dimension}', {bucket}, user_id, count(*) "
+                f"FROM {table} WHERE product_id IS NOT NULL GROUP BY {group_by} "
+                f"ON CONFLICT (product_id, entity, dimension, bucket) "
+                f"DO UPDATE SET count = excluded.count"
+            )
+
+    op.create_index("ix_product_counters_user_id", "product_counters", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("product_counters")
@@ -0,0 +1,163 @@
+"""baseline schema
+
+The schema init_db() created before migrations were introduced: the
+tables and the single-column indexes of the original models, nothing
+else. Databases previously created by init_db() are therefore stamped
+at this revision (`alembic stamp 3f1c9a2b7d10`) and then upgraded; every
+later object comes from a later revision.
+
+Revision ID: 3f1c9a2b7d10
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c9a2b7d10"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps() -> list:
+    return [
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+    ]
+
+
+def _owned() -> list:
+    return [
+        sa.Column("id", sa.Uuid(), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        *_timestamps(),
+    ]
+
+
+# Single-column indexes of the original models (index=True), as init_db() created them
+INDEXES = [
+    ("ix_users_id", "users", "id"),
+    ("ix_users_github_username", "users", "github_username"),
+    ("ix_products_id", "products", "id"),
+    ("ix_products_user_id", "products", "user_id"),
+    ("ix_products_name", "products", "name"),
+    ("ix_repositories_id", "repositories", "id"),
+    ("ix_repositories_user_id", "repositories", "user_id"),
+    ("ix_repositories_name", "repositories", "name"),
+    ("ix_repositories_github_id", "repositories", "github_id"),
+    ("ix_repositories_product_id", "repositories", "product_id"),
+    ("ix_work_items_id", "work_items", "id"),
+    ("ix_work_items_user_id", "work_items", "user_id"),
+    ("ix_work_items_title", "work_items", "title"),
+    ("ix_work_items_status", "work_items", "status"),
+    ("ix_work_items_product_id", "work_items", "product_id"),
+    ("ix_work_items_repository_id", "work_items", "repository_id"),
+    ("ix_documents_id", "documents", "id"),
+    ("ix_documents_user_id", "documents", "user_id"),
+    ("ix_documents_title", "documents", "title"),
+    ("ix_documents_product_id", "documents", "product_id"),
+    ("ix_documents_repository_id", "documents", "repository_id"),
+    ("ix_app_info_id", "app_info", "id"),
+    ("ix_app_info_user_id", "app_info", "user_id"),
+    ("ix_app_info_key", "app_info", "key"),
+    ("ix_app_info_product_id", "app_info", "product_id"),
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("email", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+        sa.Column("github_username", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+        sa.Column("avatar_url", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "products",
+        *_owned(),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(length=2000), nullable=True),
+        sa.Column("icon", sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+        sa.Column("color", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "repositories",
+        *_owned(),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+        sa.Column("full_name", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(length=2000), nullable=True),
+        sa.Column("url", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column("default_branch", sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+        sa.Column("is_private", sa.Boolean(), nullable=True),
+        sa.Column("language", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+        sa.Column("github_id", sa.Integer(), nullable=True),
+        sa.Column("stars_count", sa.Integer(), nullable=True),
+        sa.Column("forks_count", sa.Integer(), nullable=True),
+        sa.Column("product_id", sa.Uuid(), nullable=True),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "work_items",
+        *_owned(),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("type", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+        sa.Column("priority", sa.Integer(), nullable=True),
+        sa.Column("product_id", sa.Uuid(), nullable=True),
+        sa.Column("repository_id", sa.Uuid(), nullable=True),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.ForeignKeyConstraint(["repository_id"], ["repositories.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "documents",
+        *_owned(),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column("content", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("type", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+        sa.Column("is_pinned", sa.Boolean(), nullable=True),
+        sa.Column("product_id", sa.Uuid(), nullable=True),
+        sa.Column("repository_id", sa.Uuid(), nullable=True),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.ForeignKeyConstraint(["repository_id"], ["repositories.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "app_info",
+        *_owned(),
+        sa.Column("key", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+        sa.Column("value", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("category", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+        sa.Column("is_secret", sa.Boolean(), nullable=True),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column("product_id", sa.Uuid(), nullable=True),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    for name, table, column in INDEXES:
+        op.create_index(name, table, [column])
+
+
+def downgrade() -> None:
+    op.drop_table("app_info")
+    op.drop_table("documents")
+    op.drop_table("work_items")
+    op.drop_table("repositories")
+    op.drop_table("products")
+    op.drop_table("users")
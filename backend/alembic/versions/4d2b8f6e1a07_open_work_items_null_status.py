@@ -0,0 +1,55 @@
+"""open work items index covers NULL status
+
+ix_work_items_open was partial on `status <> 'done'`, which is NULL, not
+true, for work items without a status, so they were neither indexed nor
+shown as open. The predicate now includes them. The new index is built
+CONCURRENTLY under a temporary name and swapped in, so open work items
+are never left without an index.
+
+Revision ID: 4d2b8f6e1a07
+Revises: 1c7a5e9d3f42
+Create Date: 2026-10-18 21:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4d2b8f6e1a07"
+down_revision: Union[str, None] = "1c7a5e9d3f42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = ["user_id", "product_id", "created_at", "id"]
+
+
+def swap(predicate: str) -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_work_items_open_new",
+            "work_items",
+            COLUMNS,
+            postgresql_where=sa.text(predicate),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_work_items_open",
+            table_name="work_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute("ALTER INDEX ix_work_items_open_new RENAME TO ix_work_items_open")
+
+
+def upgrade() -> None:
+    swap("status IS NULL OR status <> 'done'")
+
+
+def downgrade() -> None:
+    swap("status <> 'done'")
@@ -0,0 +1,74 @@
+"""change feed notify triggers
+
+Row-level AFTER triggers on products and their child tables publish every
+committed change on the forum_changes channel for the SSE change feed.
+Event ids come from the forum_change_seq sequence. Payloads carry only
+ids, well under the 8000-byte NOTIFY limit.
+
+Revision ID: 5e8b2c4f9a71
+Revises: 0d6a93b5e217
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8b2c4f9a71"
+down_revision: Union[str, None] = "0d6a93b5e217"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PUBLISHED = ("products", "repositories", "work_items", "documents", "app_info")
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE IF NOT EXISTS forum_change_seq")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION forum_notify_change() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            changed record;
+            product uuid;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                changed := OLD;
+            ELSE
+                changed := NEW;
+            END IF;
+            IF TG_TABLE_NAME = 'products' THEN
+                product := changed.id;
+            ELSE
+                product := changed.product_id;
+            END IF;
+            PERFORM pg_notify('forum_changes', json_build_object(
+                'id', nextval('forum_change_seq'),
+                'table', TG_TABLE_NAME,
+                'op', lower(TG_OP),
+                'row_id', changed.id,
+                'product_id', product
+            )::text);
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for table in PUBLISHED:
+        op.execute(
+            f"CREATE OR REPLACE TRIGGER {table}_notify_change "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION forum_notify_change()"
+        )
+
+
+def downgrade() -> None:
+    for table in PUBLISHED:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS forum_notify_change()")
+    op.execute("DROP SEQUENCE IF EXISTS forum_change_seq")
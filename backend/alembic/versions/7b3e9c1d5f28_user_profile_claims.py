@@ -0,0 +1,32 @@
+"""users.profile_issued_at
+
+The users row takes its email, GitHub username and avatar from the claims
+of the caller's Supabase token. This records the issue time (iat) of the
+token they were last taken from, so a token issued before a profile
+change, still valid on another device, does not write the old values back.
+
+Revision ID: 7b3e9c1d5f28
+Revises: 4d2b8f6e1a07
+Create Date: 2026-10-18 22:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7b3e9c1d5f28"
+down_revision: Union[str, None] = "4d2b8f6e1a07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("profile_issued_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "profile_issued_at")
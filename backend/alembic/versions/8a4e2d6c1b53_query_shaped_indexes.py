@@ -0,0 +1,96 @@
+"""query-shaped indexes
+
+Composite indexes matching the domain queries (user_id, product_id
+[, status/type/category], created_at, id), a partial index for open work
+items, and removal of the single-column indexes they make redundant.
+Every index is built or dropped CONCURRENTLY, so this is safe to run
+against live tables.
+
+Revision ID: 8a4e2d6c1b53
+Revises: 2b6f8d4a1c39
+Create Date: 2026-10-18 09:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8a4e2d6c1b53"
+down_revision: Union[str, None] = "2b6f8d4a1c39"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial predicate)
+INDEXES = [
+    ("ix_products_user_created", "products", ["user_id", "created_at", "id"], None),
+    ("ix_products_user_name", "products", ["user_id", "name"], None),
+    ("ix_repositories_user_product_created", "repositories", ["user_id", "product_id", "created_at", "id"], None),
+    ("ix_repositories_user_github_id", "repositories", ["user_id", "github_id"], None),
+    ("ix_work_items_user_product_created", "work_items", ["user_id", "product_id", "created_at", "id"], None),
+    ("ix_work_items_user_product_status_created", "work_items", ["user_id", "product_id", "status", "created_at", "id"], None),
+    ("ix_work_items_user_product_type_created", "work_items", ["user_id", "product_id", "type", "created_at", "id"], None),
+    ("ix_work_items_open", "work_items", ["user_id", "product_id", "created_at", "id"], "status <> 'done'"),
+    ("ix_documents_user_product_created", "documents", ["user_id", "product_id", "created_at", "id"], None),
+    ("ix_documents_user_product_type_created", "documents", ["user_id", "product_id", "type", "created_at", "id"], None),
+    ("ix_app_info_user_product_created", "app_info", ["user_id", "product_id", "created_at", "id"], None),
+    ("ix_app_info_user_product_category_created", "app_info", ["user_id", "product_id", "category", "created_at", "id"], None),
+    ("ix_app_info_user_product_key", "app_info", ["user_id", "product_id", "key"], None),
+]
+
+# Single-column indexes from the original models: duplicates of the primary
+# key, or prefixes/low-selectivity columns covered by the composites above.
+LEGACY_INDEXES = [
+    ("ix_users_id", "users", ["id"]),
+    ("ix_products_id", "products", ["id"]),
+    ("ix_products_user_id", "products", ["user_id"]),
+    ("ix_products_name", "products", ["name"]),
+    ("ix_repositories_id", "repositories", ["id"]),
+    ("ix_repositories_user_id", "repositories", ["user_id"]),
+    ("ix_repositories_name", "repositories", ["name"]),
+    ("ix_repositories_github_id", "repositories", ["github_id"]),
+    ("ix_work_items_id", "work_items", ["id"]),
+    ("ix_work_items_user_id", "work_items", ["user_id"]),
+    ("ix_work_items_status", "work_items", ["status"]),
+    ("ix_work_items_title", "work_items", ["title"]),
+    ("ix_documents_id", "documents", ["id"]),
+    ("ix_documents_user_id", "documents", ["user_id"]),
+    ("ix_documents_title", "documents", ["title"]),
+    ("ix_app_info_id", "app_info", ["id"]),
+    ("ix_app_info_user_id", "app_info", ["user_id"]),
+    ("ix_app_info_key", "app_info", ["key"]),
+]
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, table, _ in LEGACY_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in LEGACY_INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,90 @@
+"""bounded search vectors
+
+The generated search_vector columns ran to_tsvector over whole document
+bodies and work item descriptions. A tsvector is limited to 1 MB, so an
+insert or update of a long enough body failed outright. Each column now
+indexes only its first 100,000 characters, which is about as far as
+tsvector positions (capped at 16,383) still tell words apart.
+
+A new column is added next to the old one, which rewrites the table as
+the original did. Its GIN index is built CONCURRENTLY, then the old
+column is dropped and the new one renamed in one short transaction, so
+search keeps its index throughout.
+
+Revision ID: 9e4a7c2b6d15
+Revises: 7b3e9c1d5f28
+Create Date: 2026-10-18 23:20:00.000000
+
+"""
+from typing import Dict, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4a7c2b6d15"
+down_revision: Union[str, None] = "7b3e9c1d5f28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> searched columns, title weighted A and body weighted B
+COLUMNS = {"documents": ("title", "content"), "work_items": ("title", "description")}
+
+# Matches app.models.base.SEARCH_MAX_CHARS
+MAX_CHARS = 100_000
+
+
+def expressions(bounded: bool) -> Dict[str, str]:
+    parts = {}
+    for table, (title, body) in COLUMNS.items():
+        source = [f"coalesce({title}, '')", f"coalesce({body}, '')"]
+        if bounded:
+            source = [f"left({column}, {MAX_CHARS})" for column in source]
+        parts[table] = (
+            f"setweight(to_tsvector('english', {source[0]}), 'A') || "
+            f"setweight(to_tsvector('english', {source[1]}), 'B')"
+        )
+    return parts
+
+
+def swap(bounded: bool) -> None:
+    for table, expression in expressions(bounded).items():
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector_new",
+                postgresql.TSVECTOR(),
+                sa.Computed(expression, persisted=True),
+            ),
+        )
+
+    with op.get_context().autocommit_block():
+        for table in COLUMNS:
+            op.create_index(
+                f"ix_{table}_search_vector_new",
+                table,
+                ["search_vector_new"],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+    for table in COLUMNS:
+        # Takes the old column's index with it
+        op.drop_column(table, "search_vector")
+        op.alter_column(table, "search_vector_new", new_column_name="search_vector")
+        op.execute(
+            f"ALTER INDEX ix_{table}_search_vector_new RENAME TO ix_{table}_search_vector"
+        )
+
+
+def upgrade() -> None:
+    swap(bounded=True)
+
+
+def downgrade() -> None:
+    swap(bounded=False)
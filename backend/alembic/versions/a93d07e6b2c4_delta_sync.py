@@ -0,0 +1,130 @@
+"""delta sync
+
+Adds change_xid to every synced table: the 64-bit id of the transaction
+that last inserted or updated the row, stamped by a BEFORE trigger. Adds
+a tombstones table that an AFTER DELETE statement trigger fills. Existing
+rows keep change_xid 0 and are returned by a full sync. The constant
+default makes ADD COLUMN metadata-only. The (user_id, change_xid, id)
+indexes are built CONCURRENTLY.
+
+Revision ID: a93d07e6b2c4
+Revises: 5e8b2c4f9a71
+Create Date: 2026-10-18 15:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a93d07e6b2c4"
+down_revision: Union[str, None] = "5e8b2c4f9a71"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SYNCED = ("products", "repositories", "work_items", "documents", "app_info")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tombstones",
+        sa.Column("entity", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column("entity_id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("product_id", sa.Uuid(), nullable=True),
+        sa.Column("change_xid", sa.BigInteger(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("entity", "entity_id"),
+    )
+    op.create_index(
+        "ix_tombstones_user_change", "tombstones", ["user_id", "change_xid", "entity_id"]
+    )
+    op.create_index("ix_tombstones_deleted_at", "tombstones", ["deleted_at"])
+
+    for table in SYNCED:
+        op.add_column(
+            table,
+            sa.Column("change_xid", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION forum_stamp_change() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.change_xid := pg_current_xact_id()::text::bigint;
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION forum_record_tombstones() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_TABLE_NAME = 'products' THEN
+                INSERT INTO tombstones (entity, entity_id, user_id, product_id, change_xid)
+                SELECT TG_TABLE_NAME, id, user_id, id, pg_current_xact_id()::text::bigint
+                FROM deleted_rows
+                ON CONFLICT (entity, entity_id) DO UPDATE
+                    SET change_xid = EXCLUDED.change_xid, deleted_at = now();
+            ELSE
+                INSERT INTO tombstones (entity, entity_id, user_id, product_id, change_xid)
+                SELECT TG_TABLE_NAME, id, user_id, product_id, pg_current_xact_id()::text::bigint
+                FROM deleted_rows
+                ON CONFLICT (entity, entity_id) DO UPDATE
+                    SET change_xid = EXCLUDED.change_xid, deleted_at = now();
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for table in SYNCED:
+        op.execute(
+            f"CREATE OR REPLACE TRIGGER {table}_stamp_change "
+            f"BEFORE INSERT OR UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION forum_stamp_change()"
+        )
+        op.execute(
+            f"CREATE OR REPLACE TRIGGER {table}_record_tombstones "
+            f"AFTER DELETE ON {table} REFERENCING OLD TABLE AS deleted_rows "
+            "FOR EACH STATEMENT EXECUTE FUNCTION forum_record_tombstones()"
+        )
+
+    with op.get_context().autocommit_block():
+        for table in SYNCED:
+            op.create_index(
+                f"ix_{table}_user_change",
+                table,
+                ["user_id", "change_xid", "id"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in SYNCED:
+            op.drop_index(
+                f"ix_{table}_user_change",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+    for table in SYNCED:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_record_tombstones ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_stamp_change ON {table}")
+        op.drop_column(table, "change_xid")
+    op.execute("DROP FUNCTION IF EXISTS forum_record_tombstones()")
+    op.execute("DROP FUNCTION IF EXISTS forum_stamp_change()")
+
+    op.drop_index("ix_tombstones_deleted_at", table_name="tombstones")
+    op.drop_index("ix_tombstones_user_change", table_name="tombstones")
+    op.drop_table("tombstones")
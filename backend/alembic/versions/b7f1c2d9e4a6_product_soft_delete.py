@@ -0,0 +1,74 @@
+"""product soft delete and cascading foreign keys
+
+Adds products.deleted_at: a delete marks the product and a background
+purge removes its children in batches, then the product itself. Child
+product_id foreign keys become ON DELETE CASCADE so the final product
+delete takes anything the batches missed. The constraints are re-added
+NOT VALID, which is a brief catalog change, and the migration transaction
+is committed before they are validated, so each validating scan holds
+only SHARE UPDATE EXCLUSIVE and does not block writes. The partial index of deleted
+products is built CONCURRENTLY.
+
+Revision ID: b7f1c2d9e4a6
+Revises: a93d07e6b2c4
+Create Date: 2026-10-18 16:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7f1c2d9e4a6"
+down_revision: Union[str, None] = "a93d07e6b2c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CHILDREN = ("repositories", "work_items", "documents", "app_info")
+
+
+def _replace_product_fks(on_delete: str) -> None:
+    # Swapping the constraint takes ACCESS EXCLUSIVE but checks no rows (NOT VALID)
+    for table in CHILDREN:
+        op.execute(
+            f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_product_id_fkey, "
+            f"ADD CONSTRAINT {table}_product_id_fkey FOREIGN KEY (product_id) "
+            f"REFERENCES products(id) {on_delete} NOT VALID"
+        )
+    # Committed first, so each scan holds only SHARE UPDATE EXCLUSIVE on its table
+    with op.get_context().autocommit_block():
+        for table in CHILDREN:
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_product_id_fkey")
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("deleted_at", sa.DateTime(), nullable=True))
+    _replace_product_fks("ON DELETE CASCADE")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_products_deleted_at",
+            "products",
+            ["deleted_at"],
+            postgresql_where=sa.text("deleted_at IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_products_deleted_at",
+            table_name="products",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    # Products still waiting for their purge would reappear; finish them first
+    op.execute("DELETE FROM products WHERE deleted_at IS NOT NULL")
+    op.drop_column("products", "deleted_at")
+    _replace_product_fks("")
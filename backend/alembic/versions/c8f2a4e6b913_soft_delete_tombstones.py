@@ -0,0 +1,62 @@
+"""soft delete tombstones
+
+A soft-deleted product stayed in delta sync as a live row until the
+background purge deleted it and the delete trigger wrote its tombstone.
+A row-level trigger now writes the tombstone when deleted_at is set, in
+the same transaction. Products already waiting for the purge get theirs
+here.
+
+Revision ID: c8f2a4e6b913
+Revises: 9e4a7c2b6d15
+Create Date: 2026-10-19 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c8f2a4e6b913"
+down_revision: Union[str, None] = "9e4a7c2b6d15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION forum_tombstone_soft_delete() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO tombstones (entity, entity_id, user_id, product_id, change_xid)
+            VALUES (TG_TABLE_NAME, NEW.id, NEW.user_id, NEW.id, pg_current_xact_id()::text::bigint)
+            ON CONFLICT (entity, entity_id) DO UPDATE
+                SET change_xid = EXCLUDED.change_xid, deleted_at = now();
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        "CREATE OR REPLACE TRIGGER products_tombstone_soft_delete "
+        "AFTER UPDATE OF deleted_at ON products FOR EACH ROW "
+        "WHEN (OLD.deleted_at IS NULL AND NEW.deleted_at IS NOT NULL) "
+        "EXECUTE FUNCTION forum_tombstone_soft_delete()"
+    )
+    op.execute(
+        """
+        INSERT INTO tombstones (entity, entity_id, user_id, product_id, change_xid)
+        SELECT 'products', id, user_id, id, pg_current_xact_id()::text::bigint
+        FROM products
+        WHERE deleted_at IS NOT NULL
+        ON CONFLICT (entity, entity_id) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS products_tombstone_soft_delete ON products")
+    op.execute("DROP FUNCTION IF EXISTS forum_tombstone_soft_delete()")
@@ -0,0 +1,62 @@
+"""document revisions
+
+Adds document_revisions: a zlib snapshot of a document every N saves
+and a compressed line diff for each save in between. Payloads are
+already compressed, so the column is stored EXTERNAL to keep TOAST from
+compressing them again. Existing documents get their first revision on
+their next save.
+
+Revision ID: d4c8e1a7f305
+Revises: b7f1c2d9e4a6
+Create Date: 2026-10-18 16:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4c8e1a7f305"
+down_revision: Union[str, None] = "b7f1c2d9e4a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_revisions",
+        sa.Column("id", sa.Uuid(), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("document_id", sa.Uuid(), nullable=False),
+        sa.Column("number", sa.Integer(), nullable=False),
+        sa.Column("snapshot_number", sa.Integer(), nullable=False),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column("size", sa.Integer(), nullable=True),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("ALTER TABLE document_revisions ALTER COLUMN payload SET STORAGE EXTERNAL")
+    op.create_index(
+        "uq_document_revisions_document_number",
+        "document_revisions",
+        ["document_id", "number"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_document_revisions_snapshots",
+        "document_revisions",
+        ["document_id", "created_at"],
+        postgresql_where=sa.text("number = snapshot_number"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_revisions_snapshots", table_name="document_revisions")
+    op.drop_index("uq_document_revisions_document_number", table_name="document_revisions")
+    op.drop_table("document_revisions")
@@ -0,0 +1,51 @@
+"""document content storage
+
+Switches documents.content to lz4 TOAST compression (Postgres 14+),
+which compresses and decompresses large bodies faster than the default
+pglz. Only values written afterwards are recompressed. Servers built
+without lz4 keep pglz and log a notice.
+
+Adds documents.content_gzip: a gzip copy of bodies above
+DOCUMENT_GZIP_MIN_BYTES, written by the application, that
+GET /api/docs/{id}/content streams to gzip-capable clients as stored.
+It is stored EXTERNAL so TOAST does not try to compress it again.
+Existing documents get their copy on their next save.
+
+Revision ID: e2a5f8c3b619
+Revises: d4c8e1a7f305
+Create Date: 2026-10-18 17:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a5f8c3b619"
+down_revision: Union[str, None] = "d4c8e1a7f305"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("documents", sa.Column("content_gzip", sa.LargeBinary(), nullable=True))
+    op.execute("ALTER TABLE documents ALTER COLUMN content_gzip SET STORAGE EXTERNAL")
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            ALTER TABLE documents ALTER COLUMN content SET COMPRESSION lz4;
+        EXCEPTION WHEN feature_not_supported THEN
+            RAISE NOTICE 'lz4 not available; documents.content keeps pglz';
+        END
+        $$
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE documents ALTER COLUMN content SET COMPRESSION default")
+    op.drop_column("documents", "content_gzip")
@@ -0,0 +1,55 @@
+"""quick-find trigram indexes
+
+pg_trgm GIN indexes on the labels matched by /api/quickfind. CREATE
+EXTENSION needs a role allowed to create it (superuser, or a trusted
+extension on Postgres 13+).
+
+Revision ID: f41b7c3e9d26
+Revises: c27d5e91f4a8
+Create Date: 2026-10-18 11:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f41b7c3e9d26"
+down_revision: Union[str, None] = "c27d5e91f4a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, column)
+TRGM_INDEXES = [
+    ("ix_products_name_trgm", "products", "name"),
+    ("ix_repositories_full_name_trgm", "repositories", "full_name"),
+    ("ix_work_items_title_trgm", "work_items", "title"),
+    ("ix_documents_title_trgm", "documents", "title"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for name, table, column in TRGM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    # The extension is left installed; other objects may depend on it
+    with op.get_context().autocommit_block():
+        for name, table, _ in TRGM_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,45 @@
+"""workspace pinned documents index
+
+Partial index over pinned documents, so the product workspace query
+reads them without scanning every document of the product. Built
+CONCURRENTLY.
+
+Revision ID: f6b3d9e2c871
+Revises: e2a5f8c3b619
+Create Date: 2026-10-18 17:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6b3d9e2c871"
+down_revision: Union[str, None] = "e2a5f8c3b619"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_documents_pinned",
+            "documents",
+            ["user_id", "product_id", "updated_at", "id"],
+            postgresql_where=sa.text("is_pinned"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_documents_pinned",
+            table_name="documents",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
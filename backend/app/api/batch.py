@@ -0,0 +1,127 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, MutableMapping, Optional
+from urllib.parse import urlsplit
+
+from fastapi import Request
+
+from app.core.database import BATCH_SCOPE, BatchContext
+from app.core.exceptions import ValidationError
+from app.models.batch import BatchItem, BatchItemResult
+
+logger = logging.getLogger(__name__)
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+METHODS = frozenset({"GET", *WRITE_METHODS})
+
+# Event streams never finish, and batches do not nest
+UNBATCHABLE_SUFFIXES = ("/events", "/batch")
+
+# Results are embedded in JSON, so sub-requests never get compressed bodies
+DROPPED_HEADERS = frozenset({"accept-encoding", "content-length", "content-type", "host"})
+
+
+def check_item(index: int, item: BatchItem) -> None:
+    """Raise ValidationError unless the item is a call the batch can run."""
+    path = urlsplit(item.url).path
+    if item.method.upper() not in METHODS:
+        raise ValidationError(f"Request {index}: unsupported method {item.method}")
+    if not path.startswith("/api/") or path.rstrip("/").endswith(UNBATCHABLE_SUFFIXES):
+        raise ValidationError(f"Request {index}: {item.url} cannot be batched")
+
+
+def is_write(item: BatchItem) -> bool:
+    return item.method.upper() in WRITE_METHODS
+
+
+async def dispatch(request: Request, item: BatchItem, context: BatchContext) -> BatchItemResult:
+    """
+    Run one item through the app in-process and capture its response.
+
+    The sub-request goes through the full middleware and exception
+    handling stack, like a separate HTTP call, but its dependencies take
+    the user and session from `context` (see BATCH_SCOPE).
+    """
+    url = urlsplit(item.url)
+    body = b"" if item.body is None else json.dumps(item.body).encode()
+    headers = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in item.headers.items()
+        if name.lower() not in DROPPED_HEADERS
+    ]
+    if "host" in request.headers:
+        headers.append((b"host", request.headers["host"].encode("latin-1")))
+    if body:
+        headers.append((b"content-type", b"application/json"))
+        headers.append((b"content-length", str(len(body)).encode()))
+
+    scope: MutableMapping[str, Any] = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": item.method.upper(),
+        "scheme": request.url.scheme,
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+        "state": dict(request.scope.get("state", {})),
+        BATCH_SCOPE: context,
+    }
+
+    finished = asyncio.Event()
+    body_sent = False
+    status: Optional[int] = None
+    response_headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Only report a disconnect once the response is complete
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for name, value in message.get("headers", []):
+                key = name.decode("latin-1").lower()
+                if key != "content-length":
+                    value = value.decode("latin-1")
+                    previous = response_headers.get(key)
+                    response_headers[key] = f"{previous}, {value}" if previous else value
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                finished.set()
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        # ServerErrorMiddleware has already sent the 500 and re-raises for the server to log
+        logger.exception("Batch request %s %s failed", item.method, item.url)
+    finally:
+        finished.set()
+
+    return BatchItemResult(
+        id=item.id,
+        status=status or 500,
+        headers=response_headers,
+        body=_decode(response_headers.get("content-type", ""), b"".join(chunks)),
+    )
+
+
+def _decode(content_type: str, raw: bytes) -> Any:
+    if not raw:
+        return None
+    if content_type.startswith("application/json"):
+        return json.loads(raw)
+    return raw.decode("utf-8", errors="replace")
@@ -0,0 +1,111 @@
+import hashlib
+import uuid as uuid_pkg
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+from app.domain.base_operations import Fingerprint
+
+
+def make_etag(
+    request: Request,
+    user_id: uuid_pkg.UUID,
+    fingerprint: Fingerprint,
+    variant: str = "",
+) -> str:
+    """
+    Strong ETag over the route, query parameters, user and result fingerprint.
+
+    `variant` tells apart representations of the same result, such as a
+    gzip-encoded body.
+    """
+    last_modified = fingerprint.last_modified.isoformat() if fingerprint.last_modified else ""
+    params = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    raw = f"{request.url.path}?{params}|{user_id}|{fingerprint.count}|{last_modified}"
+    if variant:
+        raw += f"|{variant}"
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    user_id: uuid_pkg.UUID,
+    fingerprint: Fingerprint,
+    variant: str = "",
+) -> Optional[Response]:
+    """
+    Set the validators on `response` and evaluate the request's preconditions.
+
+    Returns a 304 response when the client's copy is current, so the route
+    can skip loading and serializing rows. If-None-Match takes precedence
+    over If-Modified-Since (RFC 9110). Last-Modified cannot reflect deleted
+    rows, so clients that only send If-Modified-Since may miss a deletion
+    until something else changes; the ETag includes the row count and does
+    not have that gap.
+    """
+    headers = {
+        "ETag": make_etag(request, user_id, fingerprint, variant),
+        "Cache-Control": "private, no-cache",
+    }
+    if fingerprint.last_modified is not None:
+        headers["Last-Modified"] = _http_date(fingerprint.last_modified)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return None
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and fingerprint.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        if _as_utc(fingerprint.last_modified).replace(microsecond=0) <= _as_utc(since):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
+
+
+def serialized_response(
+    request: Request,
+    body: str,
+    media_type: str = "application/json",
+) -> Response:
+    """
+    Response for a body that is already serialized, e.g. JSON built by Postgres.
+
+    The ETag is a hash of the body itself, so the load cannot be skipped,
+    but an unchanged body is answered with a bodiless 304.
+    """
+    content = body.encode()
+    headers = {
+        "ETag": '"' + hashlib.sha256(content).hexdigest()[:32] + '"',
+        "Cache-Control": "private, no-cache",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content, media_type=media_type, headers=headers)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match requires
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(_as_utc(value).replace(microsecond=0), usegmt=True)
@@ -1,28 +1,55 @@
 import uuid as uuid_pkg
+from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.core.database import get_db
+from app.core.database import BATCH_SCOPE, BatchContext, after_commit, get_db
+from app.core.principal_cache import Principal, principal_cache
 from app.models.user import User
 
 security = HTTPBearer(auto_error=False)
 
 
+def profile_claims(payload: dict) -> dict:
+    """User columns carried by a Supabase token."""
+    metadata = payload.get("user_metadata", {})
+    return {
+        "email": payload.get("email"),
+        "github_username": metadata.get("user_name"),
+        "avatar_url": metadata.get("avatar_url"),
+    }
+
+
+def issued_at(payload: dict) -> Optional[datetime]:
+    iat = payload.get("iat")
+    if iat is None:
+        return None
+    return datetime.fromtimestamp(float(iat), timezone.utc).replace(tzinfo=None)
+
+
 async def get_current_user(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: AsyncSession = Depends(get_db),
 ) -> User:
     """
     Validate Supabase JWT and return current user.
 
-    Creates user record on first API call if not exists.
+    Creates user record on first API call if not exists. Verified tokens are
+    cached, so steady-state requests skip both the decode and the users lookup.
     """
+    batch: Optional[BatchContext] = request.scope.get(BATCH_SCOPE)
+    if batch is not None:
+        # Sub-request of /api/batch, which authenticated once for all of them
+        request.state.user_id = batch.user.id
+        return batch.user
+
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -31,6 +58,11 @@ async def get_current_user(
 
     token = credentials.credentials
 
+    cached = principal_cache.get(token)
+    if cached is not None:
+        request.state.user_id = cached.user.id
+        return cached.user
+
     try:
         payload = jwt.decode(
             token,
@@ -51,34 +83,70 @@ async def get_current_user(
             detail="Could not validate credentials",
         )
 
+    # Lets the session router apply read-your-writes stickiness for this user
+    request.state.user_id = user_id
+
     # Get or create user
     statement = select(User).where(User.id == user_id)
     result = await db.execute(statement)
     user = result.scalar_one_or_none()
 
-    if not user:
-        # Create user on first API call
-        user = User(
-            id=user_id,
-            email=payload.get("email"),
-            github_username=payload.get("user_metadata", {}).get("user_name"),
-            avatar_url=payload.get("user_metadata", {}).get("avatar_url"),
-        )
+    claims = profile_claims(payload)
+    if user is None:
+        # Create user on first API call. Not cached until a later request finds
+        # the committed row, so a rolled-back insert never lands in the cache.
+        user = User(id=user_id, profile_issued_at=issued_at(payload), **claims)
         db.add(user)
         await db.flush()
         await db.refresh(user)
+        return user
+
+    changed = {
+        name: value
+        for name, value in claims.items()
+        if value is not None and getattr(user, name) != value
+    }
+    iat = issued_at(payload)
+    if changed and iat is not None and (user.profile_issued_at or datetime.min) < iat:
+        # The profile changed in Supabase; a newer token carries it to the row.
+        # The user's other cached tokens hold the old row, so they go once this
+        # commits, and this token is cached by the next request like a new user.
+        for name, value in changed.items():
+            setattr(user, name, value)
+        user.profile_issued_at = iat
+        await db.flush()
+        after_commit(db, lambda: principal_cache.invalidate_user(user_id))
+    else:
+        principal_cache.set(token, Principal(claims=payload, user=user))
 
     return user
 
 
 async def get_current_user_optional(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: AsyncSession = Depends(get_db),
 ) -> Optional[User]:
     """Get current user if authenticated, None otherwise."""
-    if not credentials:
+    if not credentials and BATCH_SCOPE not in request.scope:
         return None
     try:
-        return await get_current_user(credentials, db)
+        return await get_current_user(request, credentials, db)
     except HTTPException:
         return None
+
+
+async def get_github_token(
+    token: Optional[str] = Header(
+        None,
+        alias="X-GitHub-Token",
+        description="The user's GitHub OAuth token (Supabase session provider_token)",
+    ),
+) -> str:
+    """GitHub token for routes that call the GitHub API on the user's behalf."""
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="X-GitHub-Token header is required",
+        )
+    return token
@@ -0,0 +1,14 @@
+from typing import Any, Sequence
+
+from fastapi import Response
+
+from app.domain.pagination import next_cursor
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def set_next_cursor(response: Response, rows: Sequence[Any], limit: int) -> None:
+    """Advertise the cursor for the next page, if there is one."""
+    cursor = next_cursor(rows, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
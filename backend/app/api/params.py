@@ -0,0 +1,12 @@
+from typing import List, Optional
+
+FIELDS_DESCRIPTION = "Comma-separated columns to return (id and timestamps are always included)"
+INCLUDE_DESCRIPTION = "Comma-separated large columns to add back to the default list response"
+
+
+def split_csv(value: Optional[str]) -> List[str]:
+    """Split a comma-separated query parameter, dropping blanks."""
+    if not value:
+        return []
+    return [part.strip() for part in value.split(",") if part.strip()]
+
@@ -1,6 +1,18 @@
 from fastapi import APIRouter
 
-from app.api.v1 import products, repositories, work_items, documents, app_info
+from app.api.v1 import (
+    products,
+    repositories,
+    work_items,
+    documents,
+    app_info,
+    search,
+    quickfind,
+    events,
+    sync,
+    batch,
+    github,
+)
 
 api_router = APIRouter(prefix="/api")
 
@@ -9,3 +21,9 @@ api_router.include_router(repositories.router)
 api_router.include_router(work_items.router)
 api_router.include_router(documents.router)
 api_router.include_router(app_info.router)
+api_router.include_router(search.router)
+api_router.include_router(quickfind.router)
+api_router.include_router(events.router)
+api_router.include_router(sync.router)
+api_router.include_router(batch.router)
+api_router.include_router(github.router)
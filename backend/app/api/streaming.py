@@ -0,0 +1,63 @@
+from typing import Iterator, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+def accepts_encoding(header: Optional[str], encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows `encoding` (q > 0, directly or via *)."""
+    if not header:
+        return False
+    wildcard = False
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        name = name.strip().lower()
+        if name == encoding:
+            return quality > 0
+        if name == "*":
+            wildcard = quality > 0
+    return wildcard
+
+
+def byte_range(header: Optional[str], length: int) -> Optional[Tuple[int, int]]:
+    """
+    The inclusive (start, end) selected by a Range header, or None to send everything.
+
+    Only single byte ranges are served; anything else is ignored, as RFC
+    9110 allows. Raises 416 when the range lies past the end.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else length - 1
+        else:
+            # Suffix range: the last N bytes
+            start, end = max(length - int(last), 0), length - 1
+    except ValueError:
+        return None
+    if start >= length:
+        raise HTTPException(
+            status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            detail="Range not satisfiable",
+            headers={"Content-Range": f"bytes */{length}"},
+        )
+    if start < 0 or end < start:
+        return None
+    return start, min(end, length - 1)
+
+
+def iter_chunks(body: bytes, start: int, end: int, chunk_size: int) -> Iterator[memoryview]:
+    """Slices of body[start:end + 1] without copying it."""
+    view = memoryview(body)
+    for offset in range(start, end + 1, chunk_size):
+        yield view[offset : min(offset + chunk_size, end + 1)]
@@ -1,78 +1,168 @@
+import json
 import uuid as uuid_pkg
-from typing import List, Optional
+from typing import AsyncIterator, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import check_not_modified
 from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.pagination import set_next_cursor
+from app.api.params import FIELDS_DESCRIPTION, INCLUDE_DESCRIPTION, split_csv
+from app.core.database import get_db, get_read_db
+from app.core.envfile import format_env_line, iter_lines, parse_env_line, parse_ndjson_line
 from app.domain import app_info_ops
+from app.models.app_info import AppInfoImportResult, AppInfoRead
 from app.models.user import User
 
 router = APIRouter(prefix="/app-info", tags=["app info"])
 
+ImportFormat = Literal["env", "ndjson"]
 
-@router.get("", response_model=List[dict])
+MEDIA_TYPES = {"env": "text/plain; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+@router.get("", response_model=List[AppInfoRead], response_model_exclude_unset=True)
 async def list_app_info(
+    request: Request,
+    response: Response,
     product_id: uuid_pkg.UUID = Query(..., description="Filter by product"),
     category: Optional[str] = Query(None, description="Filter by category"),
-    skip: int = 0,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    skip: int = Query(0, deprecated=True, description="Deprecated: use cursor"),
     limit: int = 100,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List app info entries for a product."""
+    fingerprint = await app_info_ops.fingerprint_by_product(
+        db, user_id=current_user.id, product_id=product_id, category=category
+    )
+    not_modified = check_not_modified(request, response, current_user.id, fingerprint)
+    if not_modified:
+        return not_modified
+
     entries = await app_info_ops.get_by_product(
         db,
         user_id=current_user.id,
         product_id=product_id,
         category=category,
+        cursor=cursor,
         skip=skip,
         limit=limit,
+        fields=split_csv(fields),
+        include=split_csv(include),
     )
-    return [
-        {
-            "id": str(e.id),
-            "key": e.key,
-            "value": "********" if e.is_secret else e.value,
-            "category": e.category,
-            "is_secret": e.is_secret,
-            "description": e.description,
-            "product_id": str(e.product_id) if e.product_id else None,
-            "created_at": e.created_at.isoformat(),
-            "updated_at": e.updated_at.isoformat(),
-        }
-        for e in entries
-    ]
-
-
-@router.get("/{app_info_id}")
+    set_next_cursor(response, entries, limit)
+    return entries
+
+
+@router.post("/import", response_model=AppInfoImportResult)
+async def import_app_info(
+    request: Request,
+    product_id: uuid_pkg.UUID = Query(..., description="Product to import into"),
+    format: ImportFormat = Query("env", description="env (KEY=value lines) or ndjson"),
+    category: Optional[str] = Query(None, description="Category for env entries"),
+    is_secret: bool = Query(False, description="Mark env entries as secret"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Import entries from a streamed request body, upserting by key.
+
+    The body is parsed line by line as it arrives and written in batches;
+    a parse error rolls back the whole import. ndjson lines are objects
+    with key, value, category, is_secret and description.
+    """
+
+    async def entries() -> AsyncIterator[dict]:
+        async for number, line in iter_lines(request.stream()):
+            if format == "ndjson":
+                record = parse_ndjson_line(line, number)
+                if record is not None:
+                    yield record
+            else:
+                pair = parse_env_line(line, number)
+                if pair is not None:
+                    key, value = pair
+                    yield {"key": key, "value": value, "category": category, "is_secret": is_secret}
+
+    return await app_info_ops.import_entries(
+        db, user_id=current_user.id, product_id=product_id, entries=entries()
+    )
+
+
+@router.get("/export")
+async def export_app_info(
+    product_id: uuid_pkg.UUID = Query(..., description="Product to export"),
+    format: ImportFormat = Query("env", description="env (KEY=value lines) or ndjson"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Stream a product's entries in key order.
+
+    Secret values are never exported: env output comments the key out and
+    ndjson output sends a null value, which a re-import leaves unchanged.
+    """
+
+    async def lines() -> AsyncIterator[str]:
+        async for rows in app_info_ops.iter_by_product(
+            db, user_id=current_user.id, product_id=product_id
+        ):
+            for row in rows:
+                value = None if row.is_secret else row.value
+                if format == "ndjson":
+                    yield json.dumps(
+                        {
+                            "key": row.key,
+                            "value": value,
+                            "category": row.category,
+                            "is_secret": bool(row.is_secret),
+                            "description": row.description,
+                        }
+                    ) + "\n"
+                elif row.is_secret:
+                    yield f"# {row.key}: secret, not exported\n"
+                else:
+                    yield format_env_line(row.key, value)
+
+    filename = "app-info.env" if format == "env" else "app-info.ndjson"
+    return StreamingResponse(
+        lines(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/{app_info_id}", response_model=AppInfoRead)
 async def get_app_info(
+    request: Request,
+    response: Response,
     app_info_id: uuid_pkg.UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single app info entry."""
+    fingerprint = await app_info_ops.fingerprint_one(db, user_id=current_user.id, id=app_info_id)
+    not_modified = check_not_modified(request, response, current_user.id, fingerprint)
+    if not_modified:
+        return not_modified
+
     entry = await app_info_ops.get_by_user(db, user_id=current_user.id, id=app_info_id)
     if not entry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="App info not found",
         )
-    return {
-        "id": str(entry.id),
-        "key": entry.key,
-        "value": "********" if entry.is_secret else entry.value,
-        "category": entry.category,
-        "is_secret": entry.is_secret,
-        "description": entry.description,
-        "product_id": str(entry.product_id) if entry.product_id else None,
-        "created_at": entry.created_at.isoformat(),
-        "updated_at": entry.updated_at.isoformat(),
-    }
-
-
-@router.post("", status_code=status.HTTP_201_CREATED)
+    return entry
+
+
+@router.post("", response_model=AppInfoRead, status_code=status.HTTP_201_CREATED)
 async def create_app_info(
     product_id: uuid_pkg.UUID,
     key: str,
@@ -84,17 +174,8 @@ async def create_app_info(
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new app info entry."""
-    # Check for duplicate key in product
-    existing = await app_info_ops.get_by_key(
-        db, user_id=current_user.id, product_id=product_id, key=key
-    )
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="App info with this key already exists for this product",
-        )
-
-    entry = await app_info_ops.create(
+    # Single INSERT ... ON CONFLICT DO NOTHING; the unique key makes this race-free
+    entry = await app_info_ops.create_unique(
         db,
         obj_in={
             "product_id": product_id,
@@ -106,20 +187,15 @@ async def create_app_info(
         },
         user_id=current_user.id,
     )
-    return {
-        "id": str(entry.id),
-        "key": entry.key,
-        "value": "********" if entry.is_secret else entry.value,
-        "category": entry.category,
-        "is_secret": entry.is_secret,
-        "description": entry.description,
-        "product_id": str(entry.product_id) if entry.product_id else None,
-        "created_at": entry.created_at.isoformat(),
-        "updated_at": entry.updated_at.isoformat(),
-    }
-
-
-@router.patch("/{app_info_id}")
+    if entry is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="App info with this key already exists for this product",
+        )
+    return entry
+
+
+@router.patch("/{app_info_id}", response_model=AppInfoRead)
 async def update_app_info(
     app_info_id: uuid_pkg.UUID,
     key: Optional[str] = None,
@@ -131,13 +207,6 @@ async def update_app_info(
     db: AsyncSession = Depends(get_db),
 ):
     """Update an app info entry."""
-    entry = await app_info_ops.get_by_user(db, user_id=current_user.id, id=app_info_id)
-    if not entry:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="App info not found",
-        )
-
     update_data = {}
     if key is not None:
         update_data["key"] = key
@@ -150,18 +219,21 @@ async def update_app_info(
     if description is not None:
         update_data["description"] = description
 
-    updated = await app_info_ops.update(db, db_obj=entry, obj_in=update_data)
-    return {
-        "id": str(updated.id),
-        "key": updated.key,
-        "value": "********" if updated.is_secret else updated.value,
-        "category": updated.category,
-        "is_secret": updated.is_secret,
-        "description": updated.description,
-        "product_id": str(updated.product_id) if updated.product_id else None,
-        "created_at": updated.created_at.isoformat(),
-        "updated_at": updated.updated_at.isoformat(),
-    }
+    try:
+        updated = await app_info_ops.update(
+            db, id=app_info_id, user_id=current_user.id, obj_in=update_data
+        )
+    except IntegrityError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="App info with this key already exists for this product",
+        ) from exc
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="App info not found",
+        )
+    return updated
 
 
 @router.delete("/{app_info_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,86 @@
+import asyncio
+from typing import List
+
+from fastapi import APIRouter, Depends, Request, status
+
+from app.api.batch import check_item, dispatch, is_write
+from app.api.deps import get_current_user
+from app.config import settings
+from app.core.database import BatchContext, write_session
+from app.core.exceptions import ValidationError
+from app.models.batch import BatchItemResult, BatchRequest, BatchResponse
+from app.models.user import User
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+
+class _Aborted(Exception):
+    """Rolls back an atomic batch after a failed request."""
+
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(
+    request: Request,
+    batch: BatchRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Run several API calls in one round trip, authenticated once.
+
+    Each item is answered as its route would answer it, with its own
+    status code. Batches that only read run their calls concurrently.
+    Batches with writes run in order on one shared session, so later
+    calls see earlier writes. Each call commits or rolls back on its own
+    unless `atomic` is set. In atomic mode the first failure rolls back
+    the whole batch and the remaining calls are not run; they get 424.
+    """
+    if len(batch.requests) > settings.batch_max_items:
+        raise ValidationError(f"At most {settings.batch_max_items} requests per batch")
+    for index, item in enumerate(batch.requests):
+        check_item(index, item)
+
+    if not any(is_write(item) for item in batch.requests):
+        # Each read takes its own pooled read session, up to the concurrency limit
+        context = BatchContext(user=current_user)
+        semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+
+        async def run(item):
+            async with semaphore:
+                return await dispatch(request, item, context)
+
+        responses = await asyncio.gather(*(run(item) for item in batch.requests))
+        return {"committed": True, "responses": responses}
+
+    responses: List[BatchItemResult] = []
+    try:
+        async with write_session(request.state) as session:
+            context = BatchContext(user=current_user, session=session)
+            for item in batch.requests:
+                if batch.atomic:
+                    result = await dispatch(request, item, context)
+                    responses.append(result)
+                    if result.status >= 400:
+                        raise _Aborted()
+                    continue
+
+                # A savepoint per write keeps a failed call from undoing the others
+                savepoint = await session.begin_nested() if is_write(item) else None
+                result = await dispatch(request, item, context)
+                if savepoint is not None:
+                    if result.status >= 400:
+                        await savepoint.rollback()
+                    else:
+                        await savepoint.commit()
+                responses.append(result)
+    except _Aborted:
+        skipped = [
+            BatchItemResult(
+                id=item.id,
+                status=status.HTTP_424_FAILED_DEPENDENCY,
+                body={"detail": "Not run: an earlier request in the atomic batch failed"},
+            )
+            for item in batch.requests[len(responses):]
+        ]
+        return {"committed": False, "responses": [*responses, *skipped]}
+
+    return {"committed": True, "responses": responses}
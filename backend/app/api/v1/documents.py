@@ -1,78 +1,200 @@
 import uuid as uuid_pkg
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import check_not_modified
 from app.api.deps import get_current_user
-from app.core.database import get_db
-from app.domain import document_ops
+from app.api.pagination import set_next_cursor
+from app.api.params import FIELDS_DESCRIPTION, INCLUDE_DESCRIPTION, split_csv
+from app.api.streaming import accepts_encoding, byte_range, iter_chunks
+from app.config import settings
+from app.core.database import get_db, get_read_db
+from app.domain import document_ops, revision_ops
+from app.models.document import DocumentRead
+from app.models.document_revision import DocumentRevisionRead, DocumentVersion
 from app.models.user import User
 
 router = APIRouter(prefix="/docs", tags=["documents"])
 
 
-@router.get("", response_model=List[dict])
+@router.get("", response_model=List[DocumentRead], response_model_exclude_unset=True)
 async def list_documents(
+    request: Request,
+    response: Response,
     product_id: uuid_pkg.UUID = Query(..., description="Filter by product"),
     type: Optional[str] = Query(None, description="Filter by type"),
-    skip: int = 0,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    skip: int = Query(0, deprecated=True, description="Deprecated: use cursor"),
     limit: int = 100,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List documents for a product."""
+    fingerprint = await document_ops.fingerprint_by_product(
+        db, user_id=current_user.id, product_id=product_id, type=type
+    )
+    not_modified = check_not_modified(request, response, current_user.id, fingerprint)
+    if not_modified:
+        return not_modified
+
     docs = await document_ops.get_by_product(
         db,
         user_id=current_user.id,
         product_id=product_id,
         type=type,
+        cursor=cursor,
         skip=skip,
         limit=limit,
+        fields=split_csv(fields),
+        include=split_csv(include),
     )
-    return [
-        {
-            "id": str(d.id),
-            "title": d.title,
-            "content": d.content,
-            "type": d.type,
-            "is_pinned": d.is_pinned,
-            "product_id": str(d.product_id) if d.product_id else None,
-            "repository_id": str(d.repository_id) if d.repository_id else None,
-            "created_at": d.created_at.isoformat(),
-            "updated_at": d.updated_at.isoformat(),
-        }
-        for d in docs
-    ]
-
-
-@router.get("/{document_id}")
+    set_next_cursor(response, docs, limit)
+    return docs
+
+
+@router.get("/{document_id}", response_model=DocumentRead)
 async def get_document(
+    request: Request,
+    response: Response,
     document_id: uuid_pkg.UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single document."""
+    fingerprint = await document_ops.fingerprint_one(db, user_id=current_user.id, id=document_id)
+    not_modified = check_not_modified(request, response, current_user.id, fingerprint)
+    if not_modified:
+        return not_modified
+
     doc = await document_ops.get_by_user(db, user_id=current_user.id, id=document_id)
     if not doc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document not found",
         )
-    return {
-        "id": str(doc.id),
-        "title": doc.title,
-        "content": doc.content,
-        "type": doc.type,
-        "is_pinned": doc.is_pinned,
-        "product_id": str(doc.product_id) if doc.product_id else None,
-        "repository_id": str(doc.repository_id) if doc.repository_id else None,
-        "created_at": doc.created_at.isoformat(),
-        "updated_at": doc.updated_at.isoformat(),
-    }
-
-
-@router.post("", status_code=status.HTTP_201_CREATED)
+    return doc
+
+
+@router.get(
+    "/{document_id}/content",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/markdown": {}}}, 206: {"description": "Partial content"}},
+)
+async def get_document_content(
+    request: Request,
+    document_id: uuid_pkg.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Stream a document's raw markdown body.
+
+    Supports a single byte Range (with If-Range) and gzip: large bodies are
+    kept gzipped and sent as stored to clients that accept gzip. Ranges
+    always address the uncompressed body.
+    """
+    range_header = request.headers.get("range")
+    accept_gzip = not range_header and accepts_encoding(
+        request.headers.get("accept-encoding"), "gzip"
+    )
+
+    response = Response()
+    fingerprint = await document_ops.fingerprint_one(db, user_id=current_user.id, id=document_id)
+    not_modified = check_not_modified(
+        request, response, current_user.id, fingerprint, variant="gzip" if accept_gzip else ""
+    )
+    if not_modified:
+        not_modified.headers["vary"] = "Accept-Encoding"
+        return not_modified
+
+    content = await document_ops.get_content(
+        db, user_id=current_user.id, id=document_id, accept_gzip=accept_gzip
+    )
+    if content is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found",
+        )
+    body, encoding = content
+
+    # Validators set by check_not_modified; the length is set below
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    headers.update({"accept-ranges": "bytes", "vary": "Accept-Encoding"})
+    if encoding:
+        headers["content-encoding"] = encoding
+
+    if_range = request.headers.get("if-range")
+    if if_range is not None and if_range != headers["etag"]:
+        range_header = None
+    selected = byte_range(range_header, len(body))
+    if selected is None:
+        start, end, status_code = 0, len(body) - 1, status.HTTP_200_OK
+    else:
+        start, end = selected
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["content-range"] = f"bytes {start}-{end}/{len(body)}"
+    headers["content-length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        iter_chunks(body, start, end, settings.document_stream_chunk_bytes),
+        status_code=status_code,
+        media_type="text/markdown; charset=utf-8",
+        headers=headers,
+    )
+
+
+@router.get("/{document_id}/revisions", response_model=List[DocumentRevisionRead])
+async def list_document_revisions(
+    document_id: uuid_pkg.UUID,
+    before: Optional[int] = Query(None, description="Only revisions numbered below this"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum revisions to return"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List a document's saved revisions, newest first."""
+    revisions = await revision_ops.get_by_document(
+        db,
+        user_id=current_user.id,
+        document_id=document_id,
+        before=before,
+        limit=limit,
+    )
+    if revisions is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found",
+        )
+    return revisions
+
+
+@router.get("/{document_id}/revisions/{number}", response_model=DocumentVersion)
+async def get_document_revision(
+    document_id: uuid_pkg.UUID,
+    number: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get a document's title and content as of one revision."""
+    version = await revision_ops.get_version(
+        db,
+        user_id=current_user.id,
+        document_id=document_id,
+        number=number,
+    )
+    if not version:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Revision not found",
+        )
+    return version
+
+
+@router.post("", response_model=DocumentRead, status_code=status.HTTP_201_CREATED)
 async def create_document(
     product_id: uuid_pkg.UUID,
     title: str,
@@ -96,20 +218,10 @@ async def create_document(
         },
         user_id=current_user.id,
     )
-    return {
-        "id": str(doc.id),
-        "title": doc.title,
-        "content": doc.content,
-        "type": doc.type,
-        "is_pinned": doc.is_pinned,
-        "product_id": str(doc.product_id) if doc.product_id else None,
-        "repository_id": str(doc.repository_id) if doc.repository_id else None,
-        "created_at": doc.created_at.isoformat(),
-        "updated_at": doc.updated_at.isoformat(),
-    }
-
-
-@router.patch("/{document_id}")
+    return doc
+
+
+@router.patch("/{document_id}", response_model=DocumentRead)
 async def update_document(
     document_id: uuid_pkg.UUID,
     title: Optional[str] = None,
@@ -120,13 +232,6 @@ async def update_document(
     db: AsyncSession = Depends(get_db),
 ):
     """Update a document."""
-    doc = await document_ops.get_by_user(db, user_id=current_user.id, id=document_id)
-    if not doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found",
-        )
-
     update_data = {}
     if title is not None:
         update_data["title"] = title
@@ -137,18 +242,15 @@ async def update_document(
     if is_pinned is not None:
         update_data["is_pinned"] = is_pinned
 
-    updated = await document_ops.update(db, db_obj=doc, obj_in=update_data)
-    return {
-        "id": str(updated.id),
-        "title": updated.title,
-        "content": updated.content,
-        "type": updated.type,
-        "is_pinned": updated.is_pinned,
-        "product_id": str(updated.product_id) if updated.product_id else None,
-        "repository_id": str(updated.repository_id) if updated.repository_id else None,
-        "created_at": updated.created_at.isoformat(),
-        "updated_at": updated.updated_at.isoformat(),
-    }
+    updated = await document_ops.update(
+        db, id=document_id, user_id=current_user.id, obj_in=update_data
+    )
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found",
+        )
+    return updated
 
 
 @router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
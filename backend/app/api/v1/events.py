@@ -0,0 +1,90 @@
+import asyncio
+import uuid as uuid_pkg
+from typing import AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.config import settings
+from app.core.change_feed import ChangeEvent, Subscription, change_feed
+from app.core.database import get_read_db
+from app.domain import product_ops
+from app.models.user import User
+
+router = APIRouter(prefix="/products", tags=["events"])
+
+
+@router.get("/{product_id}/events")
+async def product_events(
+    product_id: uuid_pkg.UUID,
+    last_event_id: Optional[str] = Header(None),
+    resume_from: Optional[str] = Query(
+        None, description="Event id to resume after, for clients that cannot send Last-Event-ID"
+    ),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Server-Sent Events stream of changes to a product and its children.
+
+    Each `change` event carries the table, operation, row id and product id
+    of one committed row change; clients refetch what they display. A
+    `reset` event means missed changes cannot be replayed and the client
+    should reload everything.
+
+    The product check runs on a read-only session, which hands its
+    connection back as soon as the query returns, so the long-lived
+    stream holds no pooled connection.
+    """
+    product = await product_ops.get_by_user(db, user_id=current_user.id, id=product_id)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found",
+        )
+
+    if not change_feed.connected:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Change feed unavailable",
+        )
+
+    subscription, backlog = change_feed.subscribe(product_id, last_event_id or resume_from)
+    return StreamingResponse(
+        _stream(subscription, backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream(
+    subscription: Subscription,
+    backlog: Optional[List[ChangeEvent]],
+) -> AsyncIterator[str]:
+    try:
+        if backlog is None:
+            yield "event: reset\ndata: {}\n\n"
+        else:
+            for event in backlog:
+                yield _format(event)
+
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), settings.events_keepalive_seconds
+                )
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                return
+            yield _format(event)
+    finally:
+        change_feed.unsubscribe(subscription)
+
+
+def _format(event: ChangeEvent) -> str:
+    return f"id: {event.id}\nevent: change\ndata: {event.data}\n\n"
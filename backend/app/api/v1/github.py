@@ -0,0 +1,50 @@
+from typing import List
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user, get_github_token
+from app.core.database import get_db, get_read_db
+from app.domain import github_ops
+from app.models.github import GitHubImportRequest, GitHubImportResult, GitHubRepository
+from app.models.user import User
+
+router = APIRouter(prefix="/github", tags=["github"])
+
+
+@router.get("/repos", response_model=List[GitHubRepository])
+async def list_github_repos(
+    token: str = Depends(get_github_token),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    List the GitHub repositories the token can see.
+
+    All pages are fetched at once and revalidated with ETags, so listing
+    again is fast and does not use up the GitHub rate limit. Repositories
+    already imported carry their product_id.
+    """
+    return await github_ops.list_with_imports(db, user_id=current_user.id, token=token)
+
+
+@router.post("/import", response_model=GitHubImportResult)
+async def import_github_repos(
+    body: GitHubImportRequest,
+    token: str = Depends(get_github_token),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Import GitHub repositories under a product.
+
+    Repositories imported before are refreshed and moved to the product
+    instead of duplicated. Ids the token cannot see are reported as missing.
+    """
+    return await github_ops.import_repos(
+        db,
+        user_id=current_user.id,
+        token=token,
+        product_id=body.product_id,
+        github_ids=body.github_ids,
+    )
@@ -1,73 +1,177 @@
 import uuid as uuid_pkg
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import check_not_modified, serialized_response
 from app.api.deps import get_current_user
-from app.core.database import get_db
-from app.domain import product_ops
-from app.models.product import Product
+from app.api.pagination import set_next_cursor
+from app.api.params import FIELDS_DESCRIPTION, INCLUDE_DESCRIPTION, split_csv
+from app.core.database import after_commit, get_db, get_read_db
+from app.core.jobs import start_once
+from app.domain import (
+    app_info_ops,
+    counter_ops,
+    document_ops,
+    github_ops,
+    product_ops,
+    repository_ops,
+    work_item_ops,
+)
+from app.models.product import ProductDetail, ProductRead, ProductSummary, ProductWorkspace
 from app.models.user import User
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+# Child collections that can be embedded in the product detail response
+EMBEDDABLE = {
+    "repositories": repository_ops,
+    "work_items": work_item_ops,
+    "documents": document_ops,
+    "app_info": app_info_ops,
+}
 
-@router.get("", response_model=List[dict])
+
+@router.get("", response_model=List[ProductRead], response_model_exclude_unset=True)
 async def list_products(
-    skip: int = 0,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    skip: int = Query(0, deprecated=True, description="Deprecated: use cursor"),
     limit: int = 100,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List all products for the current user."""
+    fingerprint = await product_ops.fingerprint_by_user(db, user_id=current_user.id)
+    not_modified = check_not_modified(request, response, current_user.id, fingerprint)
+    if not_modified:
+        return not_modified
+
     products = await product_ops.get_multi_by_user(
-        db, user_id=current_user.id, skip=skip, limit=limit
+        db,
+        user_id=current_user.id,
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+        fields=split_csv(fields),
+        include=split_csv(include),
     )
-    return [
-        {
-            "id": str(p.id),
-            "name": p.name,
-            "description": p.description,
-            "icon": p.icon,
-            "color": p.color,
-            "created_at": p.created_at.isoformat(),
-            "updated_at": p.updated_at.isoformat(),
-        }
-        for p in products
-    ]
-
-
-@router.get("/{product_id}")
+    set_next_cursor(response, products, limit)
+    return products
+
+
+@router.get("/summary", response_model=List[ProductSummary])
+async def get_products_summary(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Per-product counts and status/type breakdowns for every product, from the counters table."""
+    summary = await counter_ops.get_summary(db, user_id=current_user.id)
+    return [{"product_id": product_id, **entities} for product_id, entities in summary.items()]
+
+
+@router.post("/summary/rebuild", status_code=status.HTTP_204_NO_CONTENT)
+async def rebuild_products_summary(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Recompute the current user's counters from the underlying tables."""
+    await counter_ops.rebuild(db, user_id=current_user.id)
+
+
+@router.get(
+    "/{product_id}",
+    response_model=ProductDetail,
+    response_model_exclude_unset=True,
+)
 async def get_product(
+    request: Request,
+    response: Response,
     product_id: uuid_pkg.UUID,
+    embed: Optional[str] = Query(
+        None,
+        description="Comma-separated children to include: repositories, work_items, documents, app_info",
+    ),
+    embed_skip: int = 0,
+    embed_limit: int = Query(20, le=100),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get a single product with all related entities."""
-    product = await product_ops.get_with_relations(
-        db, user_id=current_user.id, id=product_id
-    )
-    if not product:
+    """Get a single product with child counts, optionally embedding a page of each child."""
+    embedded = split_csv(embed)
+    unknown = [name for name in embedded if name not in EMBEDDABLE]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot embed: {', '.join(unknown)}",
+        )
+
+    fingerprint = await product_ops.fingerprint_detail(db, user_id=current_user.id, id=product_id)
+    if fingerprint is not None:
+        github_ops.mark_viewed(product_id)
+        not_modified = check_not_modified(request, response, current_user.id, fingerprint)
+        if not_modified:
+            return not_modified
+
+    found = await product_ops.get_with_counts(db, user_id=current_user.id, id=product_id)
+    if not found:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found",
         )
-    return {
-        "id": str(product.id),
-        "name": product.name,
-        "description": product.description,
-        "icon": product.icon,
-        "color": product.color,
-        "created_at": product.created_at.isoformat(),
-        "updated_at": product.updated_at.isoformat(),
-        "repositories_count": len(product.repositories),
-        "work_items_count": len(product.work_items),
-        "documents_count": len(product.documents),
-    }
-
-
-@router.post("", status_code=status.HTTP_201_CREATED)
+    product, counts = found
+    # Built from explicit keys so that only requested embeds are "set" and serialized
+    detail = {**ProductRead.model_validate(product).model_dump(), **counts}
+
+    for name in embedded:
+        detail[name] = await EMBEDDABLE[name].get_by_product(
+            db,
+            user_id=current_user.id,
+            product_id=product.id,
+            skip=embed_skip,
+            limit=embed_limit,
+        )
+
+    return ProductDetail.model_validate(detail, from_attributes=True)
+
+
+@router.get("/{product_id}/workspace", response_model=ProductWorkspace)
+async def get_product_workspace(
+    request: Request,
+    product_id: uuid_pkg.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Everything the product page shows, in one query.
+
+    Returns the product, its repositories, open work items grouped by
+    status, pinned document titles and app info keys. The JSON is built
+    by Postgres and sent as is.
+    """
+    workspace = await product_ops.get_workspace(db, user_id=current_user.id, id=product_id)
+    if workspace is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found",
+        )
+    github_ops.mark_viewed(product_id)
+    return serialized_response(request, workspace)
+
+
+@router.post("", response_model=ProductRead, status_code=status.HTTP_201_CREATED)
 async def create_product(
     name: str,
     description: Optional[str] = None,
@@ -90,18 +194,10 @@ async def create_product(
         obj_in={"name": name, "description": description, "icon": icon, "color": color},
         user_id=current_user.id,
     )
-    return {
-        "id": str(product.id),
-        "name": product.name,
-        "description": product.description,
-        "icon": product.icon,
-        "color": product.color,
-        "created_at": product.created_at.isoformat(),
-        "updated_at": product.updated_at.isoformat(),
-    }
-
-
-@router.patch("/{product_id}")
+    return product
+
+
+@router.patch("/{product_id}", response_model=ProductRead)
 async def update_product(
     product_id: uuid_pkg.UUID,
     name: Optional[str] = None,
@@ -112,13 +208,6 @@ async def update_product(
     db: AsyncSession = Depends(get_db),
 ):
     """Update a product."""
-    product = await product_ops.get_by_user(db, user_id=current_user.id, id=product_id)
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Product not found",
-        )
-
     update_data = {}
     if name is not None:
         update_data["name"] = name
@@ -129,28 +218,36 @@ async def update_product(
     if color is not None:
         update_data["color"] = color
 
-    updated = await product_ops.update(db, db_obj=product, obj_in=update_data)
-    return {
-        "id": str(updated.id),
-        "name": updated.name,
-        "description": updated.description,
-        "icon": updated.icon,
-        "color": updated.color,
-        "created_at": updated.created_at.isoformat(),
-        "updated_at": updated.updated_at.isoformat(),
-    }
+    updated = await product_ops.update(
+        db, id=product_id, user_id=current_user.id, obj_in=update_data
+    )
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found",
+        )
+    return updated
 
 
-@router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{product_id}", status_code=status.HTTP_202_ACCEPTED)
 async def delete_product(
     product_id: uuid_pkg.UUID,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Delete a product and all related entities."""
+    """
+    Delete a product and all related entities.
+
+    The product is gone from reads as soon as the delete commits; its
+    repositories, work items, documents and app info are purged in the
+    background after that.
+    """
     deleted = await product_ops.delete(db, id=product_id, user_id=current_user.id)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found",
         )
+    # The purge only sees committed soft deletes; inside /api/batch that is the batch's commit
+    after_commit(db, lambda: start_once(product_ops.purge, product_id))
+    return Response(status_code=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,24 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.core.database import get_read_db
+from app.domain import quickfind_ops
+from app.domain.quickfind_operations import FETCH_LIMIT
+from app.models.search import QuickFindHit
+from app.models.user import User
+
+router = APIRouter(prefix="/quickfind", tags=["search"])
+
+
+@router.get("", response_model=List[QuickFindHit])
+async def quickfind(
+    q: str = Query(..., min_length=1, max_length=200, description="Text typed so far"),
+    limit: int = Query(10, le=FETCH_LIMIT),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Type-ahead matches across product, repository, work item and document names."""
+    return await quickfind_ops.find(db, user_id=current_user.id, q=q, limit=limit)
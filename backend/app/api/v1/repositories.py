@@ -1,86 +1,80 @@
 import uuid as uuid_pkg
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import check_not_modified
 from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.pagination import set_next_cursor
+from app.api.params import FIELDS_DESCRIPTION, INCLUDE_DESCRIPTION, split_csv
+from app.core.database import get_db, get_read_db
 from app.domain import repository_ops
+from app.models.repository import RepositoryRead
 from app.models.user import User
 
 router = APIRouter(prefix="/repositories", tags=["repositories"])
 
 
-@router.get("", response_model=List[dict])
+@router.get("", response_model=List[RepositoryRead], response_model_exclude_unset=True)
 async def list_repositories(
+    request: Request,
+    response: Response,
     product_id: uuid_pkg.UUID = Query(..., description="Filter by product"),
-    skip: int = 0,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    skip: int = Query(0, deprecated=True, description="Deprecated: use cursor"),
     limit: int = 100,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List repositories for a product."""
+    fingerprint = await repository_ops.fingerprint_by_product(
+        db, user_id=current_user.id, product_id=product_id
+    )
+    not_modified = check_not_modified(request, response, current_user.id, fingerprint)
+    if not_modified:
+        return not_modified
+
     repos = await repository_ops.get_by_product(
         db,
         user_id=current_user.id,
         product_id=product_id,
+        cursor=cursor,
         skip=skip,
         limit=limit,
+        fields=split_csv(fields),
+        include=split_csv(include),
     )
-    return [
-        {
-            "id": str(r.id),
-            "name": r.name,
-            "full_name": r.full_name,
-            "description": r.description,
-            "url": r.url,
-            "default_branch": r.default_branch,
-            "is_private": r.is_private,
-            "language": r.language,
-            "github_id": r.github_id,
-            "stars_count": r.stars_count,
-            "forks_count": r.forks_count,
-            "product_id": str(r.product_id) if r.product_id else None,
-            "created_at": r.created_at.isoformat(),
-            "updated_at": r.updated_at.isoformat(),
-        }
-        for r in repos
-    ]
-
-
-@router.get("/{repository_id}")
+    set_next_cursor(response, repos, limit)
+    return repos
+
+
+@router.get("/{repository_id}", response_model=RepositoryRead)
 async def get_repository(
+    request: Request,
+    response: Response,
     repository_id: uuid_pkg.UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single repository."""
+    fingerprint = await repository_ops.fingerprint_one(db, user_id=current_user.id, id=repository_id)
+    not_modified = check_not_modified(request, response, current_user.id, fingerprint)
+    if not_modified:
+        return not_modified
+
     repo = await repository_ops.get_by_user(db, user_id=current_user.id, id=repository_id)
     if not repo:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Repository not found",
         )
-    return {
-        "id": str(repo.id),
-        "name": repo.name,
-        "full_name": repo.full_name,
-        "description": repo.description,
-        "url": repo.url,
-        "default_branch": repo.default_branch,
-        "is_private": repo.is_private,
-        "language": repo.language,
-        "github_id": repo.github_id,
-        "stars_count": repo.stars_count,
-        "forks_count": repo.forks_count,
-        "product_id": str(repo.product_id) if repo.product_id else None,
-        "created_at": repo.created_at.isoformat(),
-        "updated_at": repo.updated_at.isoformat(),
-    }
-
-
-@router.post("", status_code=status.HTTP_201_CREATED)
+    return repo
+
+
+@router.post("", response_model=RepositoryRead, status_code=status.HTTP_201_CREATED)
 async def create_repository(
     product_id: uuid_pkg.UUID,
     name: str,
@@ -110,19 +104,10 @@ async def create_repository(
         },
         user_id=current_user.id,
     )
-    return {
-        "id": str(repo.id),
-        "name": repo.name,
-        "full_name": repo.full_name,
-        "description": repo.description,
-        "url": repo.url,
-        "product_id": str(repo.product_id) if repo.product_id else None,
-        "created_at": repo.created_at.isoformat(),
-        "updated_at": repo.updated_at.isoformat(),
-    }
-
-
-@router.patch("/{repository_id}")
+    return repo
+
+
+@router.patch("/{repository_id}", response_model=RepositoryRead)
 async def update_repository(
     repository_id: uuid_pkg.UUID,
     name: Optional[str] = None,
@@ -133,13 +118,6 @@ async def update_repository(
     db: AsyncSession = Depends(get_db),
 ):
     """Update a repository."""
-    repo = await repository_ops.get_by_user(db, user_id=current_user.id, id=repository_id)
-    if not repo:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Repository not found",
-        )
-
     update_data = {}
     if name is not None:
         update_data["name"] = name
@@ -150,17 +128,15 @@ async def update_repository(
     if default_branch is not None:
         update_data["default_branch"] = default_branch
 
-    updated = await repository_ops.update(db, db_obj=repo, obj_in=update_data)
-    return {
-        "id": str(updated.id),
-        "name": updated.name,
-        "full_name": updated.full_name,
-        "description": updated.description,
-        "url": updated.url,
-        "product_id": str(updated.product_id) if updated.product_id else None,
-        "created_at": updated.created_at.isoformat(),
-        "updated_at": updated.updated_at.isoformat(),
-    }
+    updated = await repository_ops.update(
+        db, id=repository_id, user_id=current_user.id, obj_in=update_data
+    )
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Repository not found",
+        )
+    return updated
 
 
 @router.delete("/{repository_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,37 @@
+import uuid as uuid_pkg
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.api.params import split_csv
+from app.core.database import get_read_db
+from app.domain import search_ops
+from app.models.search import SearchHit
+from app.models.user import User
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=List[SearchHit])
+async def search(
+    q: str = Query(..., min_length=1, max_length=500, description="Web-style search query"),
+    product_id: Optional[uuid_pkg.UUID] = Query(None, description="Restrict to one product"),
+    kind: Optional[str] = Query(
+        None,
+        description="Comma-separated kinds to search: documents, work_items (default: all)",
+    ),
+    limit: int = Query(20, le=100),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Full-text search over document and work item titles and bodies, best matches first."""
+    return await search_ops.search(
+        db,
+        user_id=current_user.id,
+        q=q,
+        product_id=product_id,
+        kinds=split_csv(kind),
+        limit=limit,
+    )
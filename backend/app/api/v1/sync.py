@@ -0,0 +1,31 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.core.database import get_read_db
+from app.domain import sync_ops
+from app.models.sync import SyncPage
+from app.models.user import User
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("", response_model=SyncPage)
+async def sync(
+    since: Optional[str] = Query(
+        None, description="Token from the previous sync; omit for a full download"
+    ),
+    limit: int = Query(500, ge=1, le=1000, description="Maximum rows per entity type"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Everything created, updated or deleted since a sync token, across all entity types.
+
+    Repeat with the returned token while `has_more` is true. Rows may be
+    repeated across rounds, so apply them as upserts. A token older than
+    the tombstone retention period gets 410 Gone; sync again without it.
+    """
+    return await sync_ops.changes(db, user_id=current_user.id, since=since, limit=limit)
@@ -1,82 +1,150 @@
 import uuid as uuid_pkg
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import check_not_modified
 from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.pagination import set_next_cursor
+from app.api.params import FIELDS_DESCRIPTION, INCLUDE_DESCRIPTION, split_csv
+from app.core.database import get_db, get_read_db
+from app.core.exceptions import NotFoundError
 from app.domain import work_item_ops
 from app.models.user import User
+from app.models.work_item import (
+    BulkResult,
+    WorkItemCreate,
+    WorkItemRead,
+    WorkItemStatusMove,
+    WorkItemUpdate,
+)
 
 router = APIRouter(prefix="/work", tags=["work items"])
 
+# Largest batch accepted by the bulk endpoints
+BULK_LIMIT = 1000
 
-@router.get("", response_model=List[dict])
+
+@router.get("", response_model=List[WorkItemRead], response_model_exclude_unset=True)
 async def list_work_items(
+    request: Request,
+    response: Response,
     product_id: uuid_pkg.UUID = Query(..., description="Filter by product"),
     status: Optional[str] = Query(None, description="Filter by status"),
     type: Optional[str] = Query(None, description="Filter by type"),
-    skip: int = 0,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    skip: int = Query(0, deprecated=True, description="Deprecated: use cursor"),
     limit: int = 100,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List work items for a product."""
+    fingerprint = await work_item_ops.fingerprint_by_product(
+        db, user_id=current_user.id, product_id=product_id, status=status, type=type
+    )
+    not_modified = check_not_modified(request, response, current_user.id, fingerprint)
+    if not_modified:
+        return not_modified
+
     items = await work_item_ops.get_by_product(
         db,
         user_id=current_user.id,
         product_id=product_id,
         status=status,
         type=type,
+        cursor=cursor,
         skip=skip,
         limit=limit,
+        fields=split_csv(fields),
+        include=split_csv(include),
     )
-    return [
-        {
-            "id": str(w.id),
-            "title": w.title,
-            "description": w.description,
-            "type": w.type,
-            "status": w.status,
-            "priority": w.priority,
-            "product_id": str(w.product_id) if w.product_id else None,
-            "repository_id": str(w.repository_id) if w.repository_id else None,
-            "created_at": w.created_at.isoformat(),
-            "updated_at": w.updated_at.isoformat(),
-        }
-        for w in items
-    ]
-
-
-@router.get("/{work_item_id}")
+    set_next_cursor(response, items, limit)
+    return items
+
+
+@router.post("/bulk", response_model=List[WorkItemRead], status_code=status.HTTP_201_CREATED)
+async def bulk_create_work_items(
+    items: List[WorkItemCreate] = Body(..., max_length=BULK_LIMIT),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Create many work items in one statement; all or nothing."""
+    return await work_item_ops.bulk_create(
+        db,
+        user_id=current_user.id,
+        items=[item.model_dump() for item in items],
+    )
+
+
+@router.patch("/bulk", response_model=List[WorkItemRead])
+async def bulk_update_work_items(
+    updates: List[WorkItemUpdate] = Body(..., max_length=BULK_LIMIT),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Update many work items in one statement; all or nothing."""
+    return await work_item_ops.bulk_update(
+        db,
+        user_id=current_user.id,
+        updates=[update.model_dump() for update in updates],
+    )
+
+
+@router.delete("/bulk", response_model=BulkResult)
+async def bulk_delete_work_items(
+    ids: List[uuid_pkg.UUID] = Body(..., max_length=BULK_LIMIT),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Delete many work items in one statement; all or nothing."""
+    count = await work_item_ops.bulk_delete(db, user_id=current_user.id, ids=ids)
+    return BulkResult(count=count)
+
+
+@router.post("/bulk/status", response_model=BulkResult)
+async def move_work_items_status(
+    move: WorkItemStatusMove,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Move every work item in a product from one status to another."""
+    count = await work_item_ops.move_status(
+        db,
+        user_id=current_user.id,
+        product_id=move.product_id,
+        from_status=move.from_status,
+        to_status=move.to_status,
+    )
+    return BulkResult(count=count)
+
+
+@router.get("/{work_item_id}", response_model=WorkItemRead)
 async def get_work_item(
+    request: Request,
+    response: Response,
     work_item_id: uuid_pkg.UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single work item."""
+    fingerprint = await work_item_ops.fingerprint_one(db, user_id=current_user.id, id=work_item_id)
+    not_modified = check_not_modified(request, response, current_user.id, fingerprint)
+    if not_modified:
+        return not_modified
+
     item = await work_item_ops.get_by_user(db, user_id=current_user.id, id=work_item_id)
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Work item not found",
         )
-    return {
-        "id": str(item.id),
-        "title": item.title,
-        "description": item.description,
-        "type": item.type,
-        "status": item.status,
-        "priority": item.priority,
-        "product_id": str(item.product_id) if item.product_id else None,
-        "repository_id": str(item.repository_id) if item.repository_id else None,
-        "created_at": item.created_at.isoformat(),
-        "updated_at": item.updated_at.isoformat(),
-    }
-
-
-@router.post("", status_code=status.HTTP_201_CREATED)
+    return item
+
+
+@router.post("", response_model=WorkItemRead, status_code=status.HTTP_201_CREATED)
 async def create_work_item(
     product_id: uuid_pkg.UUID,
     title: str,
@@ -102,21 +170,10 @@ async def create_work_item(
         },
         user_id=current_user.id,
     )
-    return {
-        "id": str(item.id),
-        "title": item.title,
-        "description": item.description,
-        "type": item.type,
-        "status": item.status,
-        "priority": item.priority,
-        "product_id": str(item.product_id) if item.product_id else None,
-        "repository_id": str(item.repository_id) if item.repository_id else None,
-        "created_at": item.created_at.isoformat(),
-        "updated_at": item.updated_at.isoformat(),
-    }
-
-
-@router.patch("/{work_item_id}")
+    return item
+
+
+@router.patch("/{work_item_id}", response_model=WorkItemRead)
 async def update_work_item(
     work_item_id: uuid_pkg.UUID,
     title: Optional[str] = None,
@@ -128,13 +185,6 @@ async def update_work_item(
     db: AsyncSession = Depends(get_db),
 ):
     """Update a work item."""
-    item = await work_item_ops.get_by_user(db, user_id=current_user.id, id=work_item_id)
-    if not item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Work item not found",
-        )
-
     update_data = {}
     if title is not None:
         update_data["title"] = title
@@ -147,19 +197,13 @@ async def update_work_item(
     if priority is not None:
         update_data["priority"] = priority
 
-    updated = await work_item_ops.update(db, db_obj=item, obj_in=update_data)
-    return {
-        "id": str(updated.id),
-        "title": updated.title,
-        "description": updated.description,
-        "type": updated.type,
-        "status": updated.status,
-        "priority": updated.priority,
-        "product_id": str(updated.product_id) if updated.product_id else None,
-        "repository_id": str(updated.repository_id) if updated.repository_id else None,
-        "created_at": updated.created_at.isoformat(),
-        "updated_at": updated.updated_at.isoformat(),
-    }
+    updated = await work_item_ops.update(
+        db, id=work_item_id, user_id=current_user.id, obj_in=update_data
+    )
+    if not updated:
+        # `status` is shadowed by the query parameter here
+        raise NotFoundError("Work item")
+    return updated
 
 
 @router.delete("/{work_item_id}", status_code=status.HTTP_204_NO_CONTENT)
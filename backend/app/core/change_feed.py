@@ -0,0 +1,222 @@
+import asyncio
+import json
+import logging
+import uuid as uuid_pkg
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Set
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "forum_changes"
+
+# Tables whose row changes are published; products are their own product_id
+PUBLISHED = ("products", "repositories", "work_items", "documents", "app_info")
+
+# Kept in sync with the change_feed migration; used by init_db in development
+TRIGGER_DDL = [
+    "CREATE SEQUENCE IF NOT EXISTS forum_change_seq",
+    """
+    CREATE OR REPLACE FUNCTION forum_notify_change() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        changed record;
+        product uuid;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            changed := OLD;
+        ELSE
+            changed := NEW;
+        END IF;
+        IF TG_TABLE_NAME = 'products' THEN
+            product := changed.id;
+        ELSE
+            product := changed.product_id;
+        END IF;
+        PERFORM pg_notify('forum_changes', json_build_object(
+            'id', nextval('forum_change_seq'),
+            'table', TG_TABLE_NAME,
+            'op', lower(TG_OP),
+            'row_id', changed.id,
+            'product_id', product
+        )::text);
+        RETURN NULL;
+    END
+    $$
+    """,
+    *(
+        f"CREATE OR REPLACE TRIGGER {table}_notify_change "
+        f"AFTER INSERT OR UPDATE OR DELETE ON {table} "
+        "FOR EACH ROW EXECUTE FUNCTION forum_notify_change()"
+        for table in PUBLISHED
+    ),
+]
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """One committed row change, as published by the notify trigger."""
+
+    id: str
+    product_id: Optional[uuid_pkg.UUID]
+    data: str
+
+
+class Subscription:
+    """A client's bounded queue of events for one product."""
+
+    def __init__(self, product_id: uuid_pkg.UUID, max_queue: int):
+        self.product_id = product_id
+        # None marks the end of the stream: the client lagged or the listener dropped
+        self.queue: asyncio.Queue[Optional[ChangeEvent]] = asyncio.Queue(maxsize=max_queue + 1)
+        self.max_queue = max_queue
+
+    def push(self, event: Optional[ChangeEvent]) -> bool:
+        """Queue an event; False once the client has fallen max_queue events behind."""
+        if event is not None and self.queue.qsize() >= self.max_queue:
+            return False
+        self.queue.put_nowait(event)
+        return True
+
+    def close(self) -> None:
+        """End the stream, dropping anything still queued; the client resumes by event id."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class ChangeFeed:
+    """
+    Fans Postgres notifications out to per-product SSE subscribers.
+
+    Each worker holds one dedicated LISTEN connection outside the pool, so
+    subscribers cost a queue, not a database connection. Notifications
+    arrive in commit order on every worker, so the last `replay_size`
+    events are kept in arrival order and a reconnecting client resumes
+    right after the last event id it saw. When that id is no longer
+    buffered the client is told to reset and refetch.
+
+    A subscriber that falls `queue_size` events behind is disconnected; it
+    reconnects with Last-Event-ID and catches up from the replay buffer.
+    If the listener connection drops, the buffer and every stream are
+    closed, since notifications sent meanwhile are lost.
+    """
+
+    def __init__(self, dsn: str, replay_size: int, queue_size: int, keepalive_seconds: float):
+        self.dsn = dsn
+        self.queue_size = queue_size
+        self.keepalive_seconds = keepalive_seconds
+        self.connected = False
+        self._replay: Deque[ChangeEvent] = deque(maxlen=replay_size)
+        self._subscribers: Dict[uuid_pkg.UUID, Set[Subscription]] = {}
+
+    def subscribe(
+        self,
+        product_id: uuid_pkg.UUID,
+        last_event_id: Optional[str] = None,
+    ) -> tuple[Subscription, Optional[List[ChangeEvent]]]:
+        """
+        Register a subscriber; returns it with the events to replay first.
+
+        The backlog is None when `last_event_id` is given but no longer
+        buffered. Runs without awaiting, so no event falls between the
+        backlog and the live queue.
+        """
+        backlog: Optional[List[ChangeEvent]] = []
+        if last_event_id:
+            backlog = self._since(product_id, last_event_id)
+        subscription = Subscription(product_id, self.queue_size)
+        self._subscribers.setdefault(product_id, set()).add(subscription)
+        return subscription, backlog
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.product_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.product_id]
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def _since(self, product_id: uuid_pkg.UUID, last_event_id: str) -> Optional[List[ChangeEvent]]:
+        events = list(self._replay)
+        for index in range(len(events) - 1, -1, -1):
+            if events[index].id == last_event_id:
+                return [event for event in events[index + 1 :] if event.product_id == product_id]
+        return None
+
+    def _on_notify(
+        self, connection: Any, pid: int, channel: str, payload: str  # noqa: ARG002 - asyncpg's
+    ) -> None:
+        try:
+            decoded = json.loads(payload)
+            product_id = decoded.get("product_id")
+            event = ChangeEvent(
+                id=str(decoded["id"]),
+                product_id=uuid_pkg.UUID(product_id) if product_id else None,
+                data=payload,
+            )
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed change notification: %r", payload)
+            return
+
+        self._replay.append(event)
+        for subscription in list(self._subscribers.get(event.product_id, ())):
+            if not subscription.push(event):
+                self.unsubscribe(subscription)
+                subscription.close()
+
+    def _drop_all(self) -> None:
+        self._replay.clear()
+        for subscribers in list(self._subscribers.values()):
+            for subscription in subscribers:
+                subscription.close()
+        self._subscribers.clear()
+
+    async def run(self) -> None:
+        """Background loop for the app lifespan: listen, and reconnect on failure."""
+        while True:
+            try:
+                conn = await asyncpg.connect(self.dsn)
+            except Exception:
+                logger.warning("Change feed could not connect; retrying", exc_info=True)
+                await asyncio.sleep(self.keepalive_seconds)
+                continue
+
+            lost = asyncio.Event()
+            conn.add_termination_listener(lambda _, lost=lost: lost.set())
+            try:
+                await conn.add_listener(CHANNEL, self._on_notify)
+                self.connected = True
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), self.keepalive_seconds)
+                    except asyncio.TimeoutError:
+                        # Surfaces a silently dead TCP connection
+                        await conn.execute("SELECT 1")
+            except Exception:
+                logger.warning("Change feed connection lost; reconnecting", exc_info=True)
+            finally:
+                self.connected = False
+                self._drop_all()
+                if not conn.is_closed():
+                    conn.terminate()
+            await asyncio.sleep(1)
+
+
+def _asyncpg_dsn(url: str) -> str:
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+change_feed = ChangeFeed(
+    dsn=_asyncpg_dsn(settings.database_url),
+    replay_size=settings.events_replay_size,
+    queue_size=settings.events_queue_size,
+    keepalive_seconds=settings.events_keepalive_seconds,
+)
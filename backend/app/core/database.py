@@ -1,10 +1,26 @@
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import logging
+import uuid as uuid_pkg
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, List, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import Result, ScalarResult
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
 from sqlmodel import SQLModel
 
 from app.config import settings
+from app.core.cache import TTLCache
+from app.core.change_feed import TRIGGER_DDL
+from app.core.result_cache import result_cache
+from app.models.sync import SYNC_TRIGGER_DDL
+
+logger = logging.getLogger(__name__)
 
 engine = create_async_engine(
     settings.database_url,
@@ -15,27 +31,307 @@ engine = create_async_engine(
     pool_pre_ping=True,
 )
 
+# Shares the pool with `engine`; every transaction is started as BEGIN READ ONLY.
+read_engine = engine.execution_options(postgresql_readonly=True)
+
+
+class ReplicaRouter:
+    """
+    Picks the engine for read-only sessions.
+
+    Reads go round-robin to healthy replicas. A user who committed a write in
+    the last `sticky_seconds` reads from the primary instead, so they always
+    see their own writes. With no healthy replica, reads fall back to the
+    primary.
+
+    A replica in use can be up to `max_lag_seconds` behind, and a lag past
+    that is only noticed at the next health check, so the window is never
+    shorter than the two together; otherwise a writer could read, and the
+    result cache store, rows from before their write. Recent writers are
+    tracked per process: a write on one worker does not pin reads served
+    by another, so clients that spread requests over workers should read
+    their own writes from the write's response.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: List[AsyncEngine],
+        sticky_seconds: float,
+        max_lag_seconds: float,
+        health_check_interval: float,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.sticky_seconds = max(sticky_seconds, max_lag_seconds + health_check_interval)
+        self._healthy = set(range(len(replicas)))
+        self._cycle = itertools.cycle(range(len(replicas)))
+        self._recent_writers: TTLCache[bool] = TTLCache(
+            max_size=10_000, ttl_seconds=self.sticky_seconds
+        )
+
+        for index, replica in enumerate(replicas):
+            self._watch_disconnects(index, replica)
+
+    def _watch_disconnects(self, index: int, replica: AsyncEngine) -> None:
+        @event.listens_for(replica.sync_engine, "handle_error")
+        def _on_error(context: Any) -> None:
+            if context.is_disconnect:
+                self.mark_unhealthy(index)
+
+    def record_write(self, user_id: Optional[uuid_pkg.UUID]) -> None:
+        """Pin a user's reads to the primary for the stickiness window."""
+        if user_id is not None and self.replicas:
+            self._recent_writers.set(user_id, True)
+
+    def mark_unhealthy(self, index: int) -> None:
+        if index in self._healthy:
+            logger.warning("Replica %d marked unhealthy", index)
+            self._healthy.discard(index)
+
+    def reader(self, user_id: Optional[uuid_pkg.UUID] = None) -> AsyncEngine:
+        """Engine to use for the next read."""
+        if not self._healthy or (user_id is not None and user_id in self._recent_writers):
+            return self.primary
+        for _ in range(len(self.replicas)):
+            index = next(self._cycle)
+            if index in self._healthy:
+                return self.replicas[index]
+        return self.primary
+
+    async def check_health(self) -> None:
+        """Probe every replica and update the healthy set (reachable and within max lag)."""
+        for index, replica in enumerate(self.replicas):
+            try:
+                async with replica.connect() as conn:
+                    lag = await conn.scalar(
+                        text(
+                            "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+                            "THEN 0 ELSE COALESCE(EXTRACT(EPOCH FROM "
+                            "now() - pg_last_xact_replay_timestamp()), 0) END"
+                        )
+                    )
+            except Exception:
+                self.mark_unhealthy(index)
+                continue
+
+            if lag is not None and float(lag) > self.max_lag_seconds:
+                logger.warning("Replica %d lagging by %.1fs", index, float(lag))
+                self._healthy.discard(index)
+            elif index not in self._healthy:
+                logger.info("Replica %d healthy again", index)
+                self._healthy.add(index)
+
+    async def run_health_checks(self, interval_seconds: float) -> None:
+        """Background loop for the app lifespan."""
+        while True:
+            await self.check_health()
+            await asyncio.sleep(interval_seconds)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.dispose()
+
+
+replica_router = ReplicaRouter(
+    primary=read_engine,
+    replicas=[
+        create_async_engine(
+            url,
+            echo=settings.debug,
+            future=True,
+            pool_size=5,
+            max_overflow=10,
+            pool_pre_ping=True,
+        ).execution_options(postgresql_readonly=True)
+        for url in settings.database_replica_urls
+    ],
+    sticky_seconds=settings.replica_sticky_seconds,
+    max_lag_seconds=settings.replica_max_lag_seconds,
+    health_check_interval=settings.replica_health_check_interval,
+)
+
+
+# Session.info key of the engine a read-only session was routed to
+READER = "forum.reader"
+
+
+class RoutingSession(Session):
+    """
+    Sync session that picks an engine per statement.
+
+    A read-only session asks `replica_router` once and keeps that engine
+    for every statement, so all its reads see one replica, which only moves
+    forward: an ETag fingerprint or a sync watermark is never ahead of the
+    rows read after it. Everything else (and every write) goes to the
+    primary.
+    """
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Any:  # noqa: ARG002
+        user_id = getattr(self.info.get("state"), "user_id", None)
+        if self.info.get("read_only"):
+            reader = self.info.get(READER)
+            if reader is None:
+                reader = self.info[READER] = replica_router.reader(user_id)
+            return reader.sync_engine
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+            replica_router.record_write(user_id)
+        return engine.sync_engine
+
+
+# Session.info key of the callbacks queued by `after_commit`
+AFTER_COMMIT = "forum.after_commit"
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Run `callback` once the session's transaction commits; dropped if it rolls back.
+
+    For side effects that must not happen for uncommitted writes, such as
+    starting a job on the written rows or clearing an in-process cache
+    that a concurrent read could refill with the old rows. Callbacks run
+    synchronously inside the commit, so they should only schedule work.
+    """
+    session.info.setdefault(AFTER_COMMIT, []).append(callback)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    # Releasing a savepoint (e.g. per /api/batch item) is not the commit yet
+    if session.in_nested_transaction():
+        return
+    for callback in session.info.pop(AFTER_COMMIT, []):
+        try:
+            callback()
+        except Exception:
+            logger.exception("After-commit callback failed")
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_after_commit(session: Session) -> None:
+    # Callbacks of a rolled-back savepoint are kept; they must tolerate a no-op
+    if not session.in_nested_transaction():
+        session.info.pop(AFTER_COMMIT, None)
+
+
+class ReadOnlySession(AsyncSession):
+    """
+    Session for GET routes.
+
+    Runs in a read-only transaction and never commits. Each execute() fully
+    materializes its result and then hands the connection back to the pool,
+    so it is not held while the response is serialized. scalar() and
+    scalars() go through execute(); streaming is refused, since a
+    server-side cursor holds the connection until it is read to the end.
+    """
+
+    async def execute(
+        self,
+        statement: Any,
+        params: Optional[Any] = None,
+        **kw: Any,
+    ) -> Result[Any]:
+        result = await super().execute(statement, params, **kw)
+        frozen = result.freeze()
+        await self.close()
+        return frozen()
+
+    async def scalar(self, statement: Any, params: Optional[Any] = None, **kw: Any) -> Any:
+        result = await self.execute(statement, params, **kw)
+        return result.scalar()
+
+    async def scalars(
+        self,
+        statement: Any,
+        params: Optional[Any] = None,
+        **kw: Any,
+    ) -> ScalarResult[Any]:
+        result = await self.execute(statement, params, **kw)
+        return result.scalars()
+
+    async def stream(self, *args: Any, **kw: Any) -> Any:
+        raise NotImplementedError("Read-only sessions do not stream; page with execute()")
+
+    async def stream_scalars(self, *args: Any, **kw: Any) -> Any:
+        raise NotImplementedError("Read-only sessions do not stream; page with execute()")
+
+
 async_session_maker = sessionmaker(
-    engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+read_session_maker = sessionmaker(
+    class_=ReadOnlySession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
+    info={"read_only": True},
 )
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency that yields an async database session."""
-    async with async_session_maker() as session:
+# ASGI scope key under which /api/batch passes its sub-requests a BatchContext
+BATCH_SCOPE = "forum.batch"
+
+
+@dataclass
+class BatchContext:
+    """What a batch sub-request shares with the batch: its user and, for writes, its session."""
+
+    user: Any
+    session: Optional[AsyncSession] = None
+
+
+@asynccontextmanager
+async def write_session(state: Any) -> AsyncIterator[AsyncSession]:
+    """A session committed on success and rolled back on error, as get_db yields it."""
+    async with async_session_maker(info={"state": state}) as session:
         try:
             yield session
             await session.commit()
         except Exception:
+            result_cache.discard(session)
             await session.rollback()
             raise
+        await result_cache.flush(session)
+        if session.info.get("wrote"):
+            # Restart the stickiness window from the moment the write is visible
+            replica_router.record_write(getattr(state, "user_id", None))
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that yields an async database session."""
+    batch: Optional[BatchContext] = request.scope.get(BATCH_SCOPE)
+    if batch is not None and batch.session is not None:
+        # The batch commits or rolls back its shared session itself
+        yield batch.session
+        return
+    async with write_session(request.state) as session:
+        yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that yields a read-only session (no commit) for GET routes."""
+    batch: Optional[BatchContext] = request.scope.get(BATCH_SCOPE)
+    if batch is not None and batch.session is not None:
+        # Reads in a writing batch see its uncommitted writes
+        yield batch.session
+        return
+    async with read_session_maker(info={"state": request.state}) as session:
+        yield session
 
 
 async def init_db() -> None:
     """Create all tables (for development only - use Alembic in production)."""
     async with engine.begin() as conn:
+        # Trigram indexes for quick-find need the extension
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(SQLModel.metadata.create_all)
+        for statement in [*TRIGGER_DDL, *SYNC_TRIGGER_DDL]:
+            await conn.execute(text(statement))
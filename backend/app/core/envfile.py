@@ -0,0 +1,112 @@
+import json
+import re
+from typing import AsyncIterator, Optional, Tuple
+
+import pydantic
+
+from app.core.exceptions import ValidationError
+from app.models.app_info import AppInfoBase
+
+# Longest line accepted from a streamed upload
+MAX_LINE_BYTES = 64 * 1024
+
+_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_.\-]*$")
+_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", '"': '"', "\\": "\\"}
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Yield (line number, text) from a byte stream without buffering the whole body."""
+    buffer = b""
+    number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            number += 1
+            yield number, _decode(_checked(line, number), number)
+        # The unfinished tail is checked now so it cannot grow without bound
+        _checked(buffer, number + 1)
+    if buffer:
+        yield number + 1, _decode(buffer, number + 1)
+
+
+def parse_env_line(line: str, number: int) -> Optional[Tuple[str, str]]:
+    """
+    Parse one .env line into (key, value); None for blanks and comments.
+
+    Supports `export KEY=...`, single quotes (literal), double quotes (with
+    \\n-style escapes) and trailing ` # comments` on unquoted values.
+    Multi-line quoted values are not supported.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("export "):
+        line = line[len("export "):].lstrip()
+
+    key, sep, value = line.partition("=")
+    key = key.strip()
+    if not sep or not _KEY.match(key):
+        raise ValidationError(f"Line {number}: expected KEY=value")
+
+    value = value.strip()
+    if value[:1] in ("'", '"'):
+        quote = value[0]
+        end = value.rfind(quote)
+        if end == 0:
+            raise ValidationError(f"Line {number}: unterminated quote")
+        value = value[1:end]
+        if quote == '"':
+            value = re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(0)), value)
+    else:
+        value = value.split(" #", 1)[0].rstrip()
+    return key, value
+
+
+def parse_ndjson_line(line: str, number: int) -> Optional[dict]:
+    """
+    Parse one JSON-lines record with at least a string `key`; None for blank lines.
+
+    Fields are checked against AppInfoBase without coercion, so a wrong
+    type or an overlong value fails on its line instead of in the batch
+    INSERT it would have joined.
+    """
+    if not line.strip():
+        return None
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise ValidationError(f"Line {number}: invalid JSON") from exc
+    if not isinstance(record, dict) or not isinstance(record.get("key"), str):
+        raise ValidationError(f"Line {number}: expected an object with a string key")
+    try:
+        AppInfoBase.model_validate(record, strict=True)
+    except pydantic.ValidationError as exc:
+        error = exc.errors()[0]
+        field = ".".join(str(part) for part in error["loc"])
+        raise ValidationError(f"Line {number}: {field}: {error['msg']}") from exc
+    return record
+
+
+def format_env_line(key: str, value: Optional[str]) -> str:
+    """Render one KEY=value line, double-quoting values that need it."""
+    value = value or ""
+    if value and re.fullmatch(r"[A-Za-z0-9_./:@+,\-]*", value):
+        return f"{key}={value}\n"
+    escaped = (
+        value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+    )
+    return f'{key}="{escaped}"\n'
+
+
+def _decode(line: bytes, number: int) -> str:
+    try:
+        return line.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError as exc:
+        raise ValidationError(f"Line {number}: not valid UTF-8") from exc
+
+
+def _checked(line: bytes, number: int) -> bytes:
+    if len(line) > MAX_LINE_BYTES:
+        raise ValidationError(f"Line {number} is too long")
+    return line
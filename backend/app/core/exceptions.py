@@ -39,3 +39,34 @@ class ValidationError(HTTPException):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=message,
         )
+
+
+class GoneError(HTTPException):
+    """Raised when a resource or token is no longer available."""
+
+    def __init__(self, message: str):
+        super().__init__(
+            status_code=status.HTTP_410_GONE,
+            detail=message,
+        )
+
+
+class RateLimitedError(HTTPException):
+    """Raised when an upstream API's rate limit leaves no budget for the request."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=message,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class UpstreamError(HTTPException):
+    """Raised when an upstream API is unreachable or answers with an error."""
+
+    def __init__(self, message: str):
+        super().__init__(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=message,
+        )
@@ -0,0 +1,253 @@
+import asyncio
+import hashlib
+import re
+import time
+from dataclasses import dataclass
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.exceptions import NotFoundError, RateLimitedError, UpstreamError, ValidationError
+
+# GitHub's largest page size
+PER_PAGE = 100
+
+# Pages fetched per listing at most (10,000 repositories)
+MAX_PAGES = 100
+
+LAST_PAGE = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28",
+    "User-Agent": "forum-backend",
+}
+
+
+@dataclass
+class Page:
+    """A parsed response body, kept with its validators for conditional requests."""
+
+    payload: Any
+    etag: Optional[str] = None
+    link: Optional[str] = None
+
+
+@dataclass
+class RateLimit:
+    """Primary rate limit of one token, as last reported by GitHub."""
+
+    remaining: int
+    reset_at: float  # epoch seconds
+
+    def retry_after(self) -> int:
+        return max(int(self.reset_at - time.time()) + 1, 1)
+
+
+def fingerprint(token: str) -> str:
+    """Cache key for a token, so raw tokens are never kept in memory."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[int]:
+    """Seconds to wait from a Retry-After header (delay or HTTP-date); None if unusable."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        # HTTP-dates are always GMT
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(int(retry_at.timestamp() - time.time()) + 1, 1)
+
+
+def last_page(link: Optional[str]) -> int:
+    """Number of the last page from a Link header; 1 when there is only one page."""
+    match = LAST_PAGE.search(link or "")
+    return int(match.group(1)) if match else 1
+
+
+class GitHubClient:
+    """
+    GitHub REST client on one pooled HTTP connection pool per worker.
+
+    Responses are cached with their ETag and revalidated with If-None-Match;
+    a 304 costs nothing against the rate limit, so re-listing unchanged
+    repositories is free. The remaining budget of each token is tracked
+    from the X-RateLimit-* headers and requests that would run it below
+    `github_rate_limit_reserve` are refused with 429 until the reset.
+
+    `transport` is for tests, e.g. an httpx.MockTransport; pointing
+    GITHUB_API_URL at a local stub server works too.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._pages: TTLCache[Page] = TTLCache(
+            max_size=settings.github_etag_cache_size,
+            ttl_seconds=settings.github_etag_cache_ttl_seconds,
+        )
+        self._limits: TTLCache[RateLimit] = TTLCache(max_size=1024, ttl_seconds=3600.0)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client, created on first use so it binds to the running loop."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=settings.github_api_url,
+                headers=HEADERS,
+                timeout=settings.github_timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=settings.github_max_connections,
+                    max_keepalive_connections=settings.github_max_connections,
+                ),
+                transport=self.transport,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def rate_limit(self, token: str) -> Optional[RateLimit]:
+        """The token's last known budget, or None before its first request."""
+        limit = self._limits.get(fingerprint(token))
+        if limit is not None and limit.reset_at <= time.time():
+            return None
+        return limit
+
+    def reserve(self, token: str, requests: int) -> None:
+        """Raise RateLimitedError unless the token can afford `requests` more calls."""
+        limit = self.rate_limit(token)
+        if limit is not None and limit.remaining - requests < settings.github_rate_limit_reserve:
+            raise RateLimitedError("GitHub rate limit reached", limit.retry_after())
+
+    async def get(
+        self,
+        token: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        parse: Optional[Callable[[Any], Any]] = None,
+    ) -> Page:
+        """
+        GET a resource, revalidating a cached copy when there is one.
+
+        `parse` turns the JSON body into what is cached and returned, so
+        large responses can be cut down to the fields that are used.
+        """
+        key = (fingerprint(token), path, tuple(sorted((params or {}).items())))
+        cached = self._pages.get(key)
+        page = await self.fetch(token, path, params, cached.etag if cached else None, parse)
+        if page is None:
+            page = cached
+        if page.etag:
+            self._pages.set(key, page)
+        return page
+
+    async def fetch(
+        self,
+        token: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        etag: Optional[str] = None,
+        parse: Optional[Callable[[Any], Any]] = None,
+    ) -> Optional[Page]:
+        """GET a resource, conditional on `etag` if given; None when it still matches (304)."""
+        headers = {"Authorization": f"Bearer {token}"}
+        if etag:
+            headers["If-None-Match"] = etag
+
+        try:
+            response = await self.client.get(path, params=params, headers=headers)
+        except httpx.HTTPError as exc:
+            raise UpstreamError("GitHub is unreachable") from exc
+        self._track(token, response)
+
+        if response.status_code == 304:
+            if etag:
+                return None
+            # Nothing cached to fall back on; e.g. a proxy revalidating on its own
+            raise UpstreamError("GitHub returned 304 to an unconditional request")
+        if response.status_code == 401:
+            raise ValidationError("GitHub rejected the token")
+        if response.status_code in (403, 429) and self._is_rate_limited(response):
+            retry_after = retry_after_seconds(response.headers.get("retry-after"))
+            if retry_after is None:
+                limit = self.rate_limit(token)
+                retry_after = limit.retry_after() if limit else 60
+            raise RateLimitedError("GitHub rate limit reached", retry_after)
+        if response.status_code == 404:
+            raise NotFoundError("GitHub resource")
+        if response.status_code >= 400:
+            raise UpstreamError(f"GitHub returned {response.status_code}")
+
+        body = response.json()
+        return Page(
+            payload=parse(body) if parse else body,
+            etag=response.headers.get("etag"),
+            link=response.headers.get("link"),
+        )
+
+    async def get_all(
+        self,
+        token: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        parse: Optional[Callable[[Any], List[Any]]] = None,
+    ) -> List[Any]:
+        """
+        Every item of a paginated listing.
+
+        The first page gives the page count (Link: rel="last"); the rest
+        are fetched concurrently, `github_max_concurrency` at a time, once
+        the budget for all of them has been reserved.
+        """
+        params = {**(params or {}), "per_page": PER_PAGE}
+        first = await self.get(token, path, {**params, "page": 1}, parse)
+        pages = min(last_page(first.link), MAX_PAGES)
+        if pages == 1:
+            return list(first.payload)
+
+        self.reserve(token, pages - 1)
+        semaphore = asyncio.Semaphore(settings.github_max_concurrency)
+
+        async def fetch(number: int) -> Page:
+            async with semaphore:
+                return await self.get(token, path, {**params, "page": number}, parse)
+
+        rest = await asyncio.gather(*(fetch(number) for number in range(2, pages + 1)))
+        return [item for page in (first, *rest) for item in page.payload]
+
+    def _track(self, token: str, response: httpx.Response) -> None:
+        remaining = response.headers.get("x-ratelimit-remaining")
+        reset = response.headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            limit = RateLimit(remaining=int(remaining), reset_at=float(reset))
+        except ValueError:
+            return
+        self._limits.set(fingerprint(token), limit)
+
+    @staticmethod
+    def _is_rate_limited(response: httpx.Response) -> bool:
+        # A 403 is only a rate limit with an exhausted budget or a Retry-After (secondary limit)
+        return (
+            response.status_code == 429
+            or response.headers.get("x-ratelimit-remaining") == "0"
+            or "retry-after" in response.headers
+        )
+
+
+github_client = GitHubClient()
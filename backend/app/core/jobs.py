@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+# Tasks started by `start_once`, referenced until they finish
+_running: Set["asyncio.Task[None]"] = set()
+
+
+async def run_once(job: Callable[..., Awaitable[Any]], *args: Any) -> None:
+    """
+    Run `job(session, *args)` in a fresh session, e.g. as a FastAPI background task.
+
+    The request session is closed by then. Failures are logged; periodic
+    sweepers pick up whatever was left unfinished.
+    """
+    try:
+        async with async_session_maker() as session:
+            await job(session, *args)
+            await session.commit()
+    except Exception:
+        logger.exception("Background job %s failed", job.__qualname__)
+
+
+def start_once(job: Callable[..., Awaitable[Any]], *args: Any) -> None:
+    """
+    Start `run_once(job, *args)` as a task on the running loop, without waiting for it.
+
+    Meant for after_commit callbacks, which run inside the commit and
+    cannot await.
+    """
+    task = asyncio.get_running_loop().create_task(run_once(job, *args))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+
+
+async def run_periodically(
+    job: Callable[[AsyncSession], Awaitable[Any]],
+    interval_seconds: float,
+) -> None:
+    """
+    Background loop for the app lifespan: run `job` in a fresh session every interval.
+
+    Every worker runs its own loop, so jobs must be safe to run concurrently.
+    Failures are logged and retried on the next tick.
+    """
+    while True:
+        try:
+            async with async_session_maker() as session:
+                await job(session)
+                await session.commit()
+        except Exception:
+            logger.exception("Background job %s failed", job.__qualname__)
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,79 @@
+import hashlib
+import time
+import uuid as uuid_pkg
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """A verified token: its decoded claims and the matching user row."""
+
+    claims: dict
+    user: User
+
+
+class PrincipalCache:
+    """
+    Cache of verified principals keyed by a hash of the bearer token.
+
+    Lets get_current_user skip both the JWT decode and the users lookup for
+    tokens seen recently. Entries never outlive the token's own `exp` claim.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._cache: TTLCache[Principal] = TTLCache(
+            max_size=max_size, ttl_seconds=ttl_seconds, on_evict=self._forget
+        )
+        self._keys_by_user: Dict[uuid_pkg.UUID, Set[str]] = {}
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Principal]:
+        """Return the cached principal for a token, if still valid."""
+        return self._cache.get(self._key(token))
+
+    def set(self, token: str, principal: Principal) -> None:
+        """Cache a principal until the cache TTL or the token expiry, whichever is first."""
+        ttl = None
+        exp = principal.claims.get("exp")
+        if exp is not None:
+            ttl = float(exp) - time.time()
+        key = self._key(token)
+        self._cache.set(key, principal, ttl_seconds=ttl)
+        if key in self._cache:
+            self._keys_by_user.setdefault(principal.user.id, set()).add(key)
+
+    def invalidate_user(self, user_id: uuid_pkg.UUID) -> None:
+        """Forget every cached token belonging to a user."""
+        for key in self._keys_by_user.pop(user_id, set()):
+            self._cache.delete(key)
+
+    def clear(self) -> None:
+        """Forget everything."""
+        self._cache.clear()
+        self._keys_by_user.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring."""
+        return {**self._cache.stats(), "users": len(self._keys_by_user)}
+
+    def _forget(self, key: str, principal: Principal) -> None:
+        # Keeps the per-user index as bounded as the cache it points into
+        keys = self._keys_by_user.get(principal.user.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[principal.user.id]
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.auth_cache_max_size,
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+)
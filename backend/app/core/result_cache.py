@@ -0,0 +1,285 @@
+import hashlib
+import logging
+import math
+import pickle
+import secrets
+import uuid as uuid_pkg
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Iterable, List, Optional, Sequence, Type, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
+
+from app.config import settings
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Session.info key for tags waiting on the session's commit
+PENDING_TAGS = "result_cache_tags"
+
+KEY_PREFIX = "forum:rc:"
+
+ResultType = TypeVar("ResultType")
+
+
+def _new_token() -> str:
+    return secrets.token_hex(8)
+
+
+class CacheBackend(ABC):
+    """
+    Storage behind ResultCache: opaque byte entries plus tag version tokens.
+
+    A tag's token is random and never reused, so an entry keyed by an old
+    token can never be served again, even if the tag itself was evicted.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return an entry, or None on miss."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """Store an entry for at most `ttl_seconds`."""
+
+    @abstractmethod
+    async def versions(self, tags: Sequence[str]) -> List[str]:
+        """Current token of each tag, creating a fresh one for tags without a token."""
+
+    @abstractmethod
+    async def bump(self, tags: Iterable[str]) -> None:
+        """Give each tag a new token, orphaning every entry built on the old one."""
+
+    async def close(self) -> None:  # noqa: B027 - optional; in-process backends hold nothing
+        """Release connections; called on shutdown."""
+
+
+class MemoryBackend(CacheBackend):
+    """
+    In-process LRU + TTL backend.
+
+    Not shared across workers, but each worker's writes invalidate its own
+    entries. Also the stand-in for the Redis backend in tests.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._entries: TTLCache[bytes] = TTLCache(max_size=max_entries, ttl_seconds=ttl_seconds)
+        self._tags: TTLCache[str] = TTLCache(max_size=max_entries, ttl_seconds=2 * ttl_seconds)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._entries.set(key, value, ttl_seconds=ttl_seconds)
+
+    async def versions(self, tags: Sequence[str]) -> List[str]:
+        tokens = []
+        for tag in tags:
+            token = self._tags.get(tag)
+            if token is None:
+                token = _new_token()
+                self._tags.set(tag, token)
+            tokens.append(token)
+        return tokens
+
+    async def bump(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._tags.set(tag, _new_token())
+
+
+class RedisBackend(CacheBackend):
+    """
+    Backend for any server speaking the Redis protocol (Redis, Valkey, ...).
+
+    Shared by every worker. Requires the optional `redis` package. Entries
+    are pickled, so the server must be private to the application.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, ttl_seconds: float):
+        try:
+            from redis import asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "RESULT_CACHE_BACKEND=redis needs the redis package: pip install forum-backend[cache]"
+            ) from exc
+        self._client = redis.from_url(url)
+        # Tokens outlive the entries built on them; expiry only costs a miss
+        self._tag_ttl = math.ceil(2 * ttl_seconds)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self._client.set(key, value, px=max(1, int(ttl_seconds * 1000)))
+
+    async def versions(self, tags: Sequence[str]) -> List[str]:
+        tokens = await self._client.mget(tags)
+        missing = [index for index, token in enumerate(tokens) if token is None]
+        if missing:
+            # SET NX so concurrent readers of a new tag agree on one token
+            async with self._client.pipeline(transaction=False) as pipe:
+                for index in missing:
+                    pipe.set(tags[index], _new_token(), nx=True, ex=self._tag_ttl)
+                await pipe.execute()
+            created = await self._client.mget([tags[index] for index in missing])
+            for index, token in zip(missing, created, strict=True):
+                tokens[index] = token
+        return [
+            token.decode() if isinstance(token, bytes) else token or _new_token()
+            for token in tokens
+        ]
+
+    async def bump(self, tags: Iterable[str]) -> None:
+        async with self._client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.set(tag, _new_token(), ex=self._tag_ttl)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class ResultCache:
+    """
+    Read-through cache for per-user domain reads, invalidated by tag.
+
+    Entries are keyed by user, operation and arguments, plus the current
+    token of every tag the read depends on (one tag per user and table).
+    Writes queue their tags on the session; `flush` bumps them once the
+    transaction has committed (get_db does this before the response goes
+    out), so entries built on the old tokens are never served again.
+
+    Only read-only sessions fill the cache, so uncommitted or rolled-back
+    rows never reach it. A read that overlaps a commit stores its result
+    under the tokens it saw before the bump, where nobody will look. Reads
+    from a replica keep the replica router's read-your-writes guarantee.
+
+    Backend failures are logged and counted; reads then go to the database.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.configure(backend)
+
+    def configure(self, backend: Optional[CacheBackend]) -> None:
+        """Swap the backend (None disables caching) and reset the counters."""
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.errors = 0
+        self.invalidations = 0
+
+    async def get_or_load(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        operation: str,
+        arguments: dict,
+        models: Sequence[Type[SQLModel]],
+        load: Callable[[], Awaitable[ResultType]],
+    ) -> ResultType:
+        """Return the cached result of `operation`, calling `load` on a miss."""
+        if self.backend is None or not db.info.get("read_only"):
+            self.bypassed += 1
+            return await load()
+
+        try:
+            versions = await self.backend.versions([_tag(user_id, model) for model in models])
+            key = _key(user_id, operation, arguments, versions)
+            cached = await self.backend.get(key)
+        except Exception:
+            logger.warning("Result cache read failed", exc_info=True)
+            self.errors += 1
+            return await load()
+
+        if cached is not None:
+            self.hits += 1
+            return pickle.loads(cached)
+
+        self.misses += 1
+        result = await load()
+        try:
+            await self.backend.set(key, pickle.dumps(result), self.ttl_seconds)
+        except Exception:
+            logger.warning("Result cache write failed", exc_info=True)
+            self.errors += 1
+        return result
+
+    def invalidate(self, db: AsyncSession, user_id: uuid_pkg.UUID, *models: Type[SQLModel]) -> None:
+        """Queue a user's tags for these tables, to be bumped when `db` commits."""
+        db.info.setdefault(PENDING_TAGS, set()).update(_tag(user_id, model) for model in models)
+
+    async def flush(self, db: AsyncSession) -> None:
+        """Bump the tags queued on a session; call after it has committed."""
+        tags = db.info.pop(PENDING_TAGS, None)
+        if not tags or self.backend is None:
+            return
+        try:
+            await self.backend.bump(sorted(tags))
+        except Exception:
+            # The write is already committed; stale entries expire with the TTL
+            logger.error("Result cache invalidation failed", exc_info=True)
+            self.errors += 1
+            return
+        self.invalidations += len(tags)
+
+    def discard(self, db: AsyncSession) -> None:
+        """Drop the tags queued on a session that rolled back."""
+        db.info.pop(PENDING_TAGS, None)
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "errors": self.errors,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _tag(user_id: uuid_pkg.UUID, model: Type[SQLModel]) -> str:
+    return f"{KEY_PREFIX}tag:{user_id}:{model.__tablename__}"
+
+
+def _key(user_id: uuid_pkg.UUID, operation: str, arguments: dict, versions: List[str]) -> str:
+    raw = f"{sorted(arguments.items())!r}|{'|'.join(versions)}"
+    return f"{KEY_PREFIX}{user_id}:{operation}:{hashlib.sha256(raw.encode()).hexdigest()[:32]}"
+
+
+def make_backend(name: str) -> Optional[CacheBackend]:
+    """Backend named by RESULT_CACHE_BACKEND: memory, redis or none."""
+    if name == "memory":
+        return MemoryBackend(
+            max_entries=settings.result_cache_max_entries,
+            ttl_seconds=settings.result_cache_ttl_seconds,
+        )
+    if name == "redis":
+        return RedisBackend(
+            url=settings.result_cache_redis_url,
+            ttl_seconds=settings.result_cache_ttl_seconds,
+        )
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown result cache backend: {name}")
+
+
+result_cache = ResultCache(
+    backend=make_backend(settings.result_cache_backend),
+    ttl_seconds=settings.result_cache_ttl_seconds,
+)
@@ -3,6 +3,12 @@ from app.domain.repository_operations import repository_ops
 from app.domain.work_item_operations import work_item_ops
 from app.domain.document_operations import document_ops
 from app.domain.app_info_operations import app_info_ops
+from app.domain.counter_operations import counter_ops
+from app.domain.search_operations import search_ops
+from app.domain.quickfind_operations import quickfind_ops
+from app.domain.sync_operations import sync_ops
+from app.domain.revision_operations import revision_ops
+from app.domain.github_operations import github_ops
 
 __all__ = [
     "product_ops",
@@ -10,4 +16,10 @@ __all__ = [
     "work_item_ops",
     "document_ops",
     "app_info_ops",
+    "counter_ops",
+    "search_ops",
+    "quickfind_ops",
+    "sync_ops",
+    "revision_ops",
+    "github_ops",
 ]
@@ -1,45 +1,53 @@
 import uuid as uuid_pkg
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import Row, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.base_operations import BaseOperations
-from app.models.app_info import AppInfo
+from app.core.result_cache import result_cache
+from app.domain.base_operations import BaseOperations, cached
+from app.domain.counter_operations import counter_ops
+from app.domain.product_operations import product_ops
+from app.models.app_info import AppInfo, AppInfoImportResult
+
+UNIQUE_KEY = "uq_app_info_product_key"
+
+# Entries written per upsert statement during an import
+IMPORT_BATCH_SIZE = 500
 
 
 class AppInfoOperations(BaseOperations[AppInfo]):
     """CRUD operations for AppInfo model."""
 
+    # is_secret is needed to mask value whenever value is selected
+    required_fields = ("id", "created_at", "updated_at", "is_secret")
+
     def __init__(self):
         super().__init__(AppInfo)
 
+    @cached()
     async def get_by_product(
         self,
         db: AsyncSession,
         user_id: uuid_pkg.UUID,
         product_id: uuid_pkg.UUID,
         category: Optional[str] = None,
+        cursor: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[AppInfo]:
+        fields: Optional[Sequence[str]] = None,
+        include: Sequence[str] = (),
+    ) -> List[Row]:
         """Get app info entries for a product."""
-        statement = select(AppInfo).where(
-            AppInfo.user_id == user_id,
-            AppInfo.product_id == product_id,
+        statement = select(*self._list_columns(fields, include)).where(
+            *self.product_criteria(user_id, product_id, category=category)
         )
 
-        if category:
-            statement = statement.where(AppInfo.category == category)
-
-        statement = (
-            statement.order_by(AppInfo.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-        )
+        statement = self._paginate(statement, cursor=cursor, skip=skip, limit=limit)
 
         result = await db.execute(statement)
-        return list(result.scalars().all())
+        return list(result.all())
 
     async def get_by_key(
         self,
@@ -57,5 +65,146 @@ class AppInfoOperations(BaseOperations[AppInfo]):
         result = await db.execute(statement)
         return result.scalar_one_or_none()
 
+    async def create_unique(
+        self,
+        db: AsyncSession,
+        obj_in: dict,
+        user_id: uuid_pkg.UUID,
+    ) -> Optional[AppInfo]:
+        """Insert an entry unless the product already has its key; None on conflict."""
+        statement = (
+            insert(AppInfo)
+            .values(**obj_in, user_id=user_id)
+            .on_conflict_do_nothing(constraint=UNIQUE_KEY)
+            .returning(AppInfo)
+        )
+        result = await db.scalars(statement)
+        entry = result.one_or_none()
+        if entry is not None:
+            result_cache.invalidate(db, user_id, AppInfo)
+            await counter_ops.apply(db, user_id, counter_ops.deltas(AppInfo, entry, 1))
+        return entry
+
+    async def upsert_many(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        product_id: uuid_pkg.UUID,
+        entries: List[dict],
+    ) -> Tuple[int, int]:
+        """
+        Insert or update entries by key in one INSERT ... ON CONFLICT statement.
+
+        Null values, categories and descriptions keep what is stored, and an
+        import can mark an entry secret but never unmark it. Returns
+        (created, updated).
+        """
+        # The same key twice in one statement is an error in Postgres; last one wins
+        by_key = {entry["key"]: entry for entry in entries}
+        if not by_key:
+            return 0, 0
+
+        statement = insert(AppInfo).values(
+            [
+                {
+                    "user_id": user_id,
+                    "product_id": product_id,
+                    "key": key,
+                    "value": entry.get("value"),
+                    "category": entry.get("category"),
+                    "is_secret": bool(entry.get("is_secret")),
+                    "description": entry.get("description"),
+                }
+                for key, entry in by_key.items()
+            ]
+        )
+        excluded = statement.excluded
+        statement = statement.on_conflict_do_update(
+            constraint=UNIQUE_KEY,
+            set_={
+                "value": func.coalesce(excluded.value, AppInfo.value),
+                "category": func.coalesce(excluded.category, AppInfo.category),
+                "description": func.coalesce(excluded.description, AppInfo.description),
+                "is_secret": or_(func.coalesce(AppInfo.is_secret, False), excluded.is_secret),
+                "updated_at": func.now(),
+            },
+            where=AppInfo.user_id == user_id,
+        ).returning(literal_column("xmax = 0").label("inserted"))
+
+        result = await db.execute(statement)
+        inserted = [row.inserted for row in result.all()]
+        if inserted:
+            result_cache.invalidate(db, user_id, AppInfo)
+        created = sum(inserted)
+        if created:
+            # One total delta per inserted row
+            await counter_ops.apply(
+                db, user_id, counter_ops.deltas(AppInfo, {"product_id": product_id}, created)
+            )
+        return created, len(inserted) - created
+
+    async def import_entries(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        product_id: uuid_pkg.UUID,
+        entries: AsyncIterator[dict],
+    ) -> AppInfoImportResult:
+        """Upsert a stream of entries in batches of IMPORT_BATCH_SIZE, within the caller's transaction."""
+        await product_ops.require_owned(db, user_id, [product_id])
+        result = AppInfoImportResult()
+        batch: List[dict] = []
+
+        async def flush() -> None:
+            created, updated = await self.upsert_many(db, user_id, product_id, batch)
+            result.created += created
+            result.updated += updated
+            batch.clear()
+
+        async for entry in entries:
+            batch.append(entry)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await flush()
+        if batch:
+            await flush()
+        return result
+
+    async def iter_by_product(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        product_id: uuid_pkg.UUID,
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ) -> AsyncIterator[List[Row]]:
+        """Yield a product's keyed entries in key order, one batch per query."""
+        last_key: Optional[str] = None
+        while True:
+            statement = (
+                select(
+                    AppInfo.key,
+                    AppInfo.value,
+                    AppInfo.category,
+                    AppInfo.is_secret,
+                    AppInfo.description,
+                )
+                .where(
+                    AppInfo.user_id == user_id,
+                    AppInfo.product_id == product_id,
+                    AppInfo.key.is_not(None),
+                )
+                .order_by(AppInfo.key)
+                .limit(batch_size)
+            )
+            if last_key is not None:
+                statement = statement.where(AppInfo.key > last_key)
+
+            result = await db.execute(statement)
+            rows = list(result.all())
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                return
+            last_key = rows[-1].key
+
 
 app_info_ops = AppInfoOperations()
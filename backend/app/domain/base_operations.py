@@ -1,25 +1,199 @@
+import functools
+import inspect
 import uuid as uuid_pkg
-from typing import Generic, List, Optional, Type, TypeVar
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, any_, bindparam, delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import Uuid
 from sqlmodel import SQLModel
 
+from app.core.exceptions import NotFoundError, ValidationError
+from app.core.result_cache import result_cache
+from app.domain.counter_operations import counter_ops, merge
+from app.domain.pagination import decode_cursor
+from app.domain.quickfind_operations import quickfind_ops
+
+
+class Fingerprint(NamedTuple):
+    """Cheap summary of a result set, for ETag/Last-Modified validators."""
+
+    count: int
+    last_modified: Optional[datetime]
+
+
 ModelType = TypeVar("ModelType", bound=SQLModel)
 
 
+def cached(*also: Type[SQLModel]) -> Callable:
+    """
+    Serve a read method of an operations class through the result cache.
+
+    The method takes (db, user_id, ...). Results are keyed by the remaining
+    arguments and dropped when the user writes to the class's model or to
+    any of `also`.
+    """
+
+    def decorate(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self: "BaseOperations", *args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            del arguments["self"]
+            db = arguments.pop("db")
+            return await result_cache.get_or_load(
+                db,
+                arguments["user_id"],
+                f"{self.model.__tablename__}.{method.__name__}",
+                arguments,
+                (self.model, *also),
+                lambda: method(self, *args, **kwargs),
+            )
+
+        return wrapper
+
+    return decorate
+
+
 class BaseOperations(Generic[ModelType]):
     """Base CRUD operations for all models."""
 
+    # Large columns left out of list queries unless explicitly included
+    deferred_fields: Tuple[str, ...] = ()
+    # Columns that can never be requested through `fields`
+    hidden_fields: Tuple[str, ...] = ("user_id", "search_vector", "change_xid")
+    # Always selected: required by the read schemas and the keyset cursor
+    required_fields: Tuple[str, ...] = ("id", "created_at", "updated_at")
+    # Timestamp column marking soft-deleted rows, which reads and writes then skip
+    soft_delete_field: Optional[str] = None
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
+    def _list_columns(
+        self,
+        fields: Optional[Sequence[str]] = None,
+        include: Sequence[str] = (),
+    ) -> List[Any]:
+        """
+        Columns for a list query's SELECT.
+
+        `fields` picks an explicit subset; otherwise every column except the
+        deferred ones is returned. `include` adds deferred columns back.
+        """
+        available = [
+            column.key
+            for column in self.model.__table__.columns
+            if column.key not in self.hidden_fields
+        ]
+        if fields:
+            requested = list(fields)
+        else:
+            requested = [name for name in available if name not in self.deferred_fields]
+        requested.extend(include)
+
+        unknown = sorted(set(requested) - set(available))
+        if unknown:
+            raise ValidationError(f"Unknown fields: {', '.join(unknown)}")
+
+        names = dict.fromkeys([*self.required_fields, *requested])
+        return [getattr(self.model, name) for name in names]
+
+    def _paginate(
+        self,
+        statement: Select,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Select:
+        """
+        Order newest first and apply keyset pagination on (created_at, id).
+
+        `skip` is the deprecated offset fallback and is ignored when a cursor
+        is given.
+        """
+        statement = statement.order_by(self.model.created_at.desc(), self.model.id.desc())
+        if cursor:
+            created_at, id = decode_cursor(cursor)
+            statement = statement.where(
+                tuple_(self.model.created_at, self.model.id) < tuple_(created_at, id)
+            )
+        elif skip:
+            statement = statement.offset(skip)
+        return statement.limit(limit)
+
+    def owned_criteria(self, user_id: uuid_pkg.UUID) -> List[Any]:
+        """WHERE criteria for a user's rows, leaving out soft-deleted ones."""
+        criteria = [self.model.user_id == user_id]
+        if self.soft_delete_field:
+            criteria.append(getattr(self.model, self.soft_delete_field).is_(None))
+        return criteria
+
+    def product_criteria(
+        self,
+        user_id: uuid_pkg.UUID,
+        product_id: uuid_pkg.UUID,
+        **filters: Optional[str],
+    ) -> List[Any]:
+        """WHERE criteria for a user's rows in one product, plus any non-empty equality filters."""
+        criteria = [self.model.user_id == user_id, self.model.product_id == product_id]
+        criteria += [getattr(self.model, name) == value for name, value in filters.items() if value]
+        return criteria
+
+    async def fingerprint(self, db: AsyncSession, *criteria: Any) -> Fingerprint:
+        """Row count and latest updated_at of the rows matching `criteria`, without loading them."""
+        statement = select(func.count(), func.max(self.model.updated_at)).where(*criteria)
+        result = await db.execute(statement)
+        count, last_modified = result.one()
+        return Fingerprint(count, last_modified)
+
+    async def fingerprint_one(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        id: uuid_pkg.UUID,
+    ) -> Fingerprint:
+        """Fingerprint of a single record (count 0 if it does not exist)."""
+        return await self.fingerprint(db, self.model.id == id, *self.owned_criteria(user_id))
+
+    async def fingerprint_by_user(self, db: AsyncSession, user_id: uuid_pkg.UUID) -> Fingerprint:
+        """Fingerprint of all of a user's records."""
+        return await self.fingerprint(db, *self.owned_criteria(user_id))
+
+    async def fingerprint_by_product(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        product_id: uuid_pkg.UUID,
+        **filters: Optional[str],
+    ) -> Fingerprint:
+        """Fingerprint of the rows a filtered get_by_product list is paged from."""
+        return await self.fingerprint(db, *self.product_criteria(user_id, product_id, **filters))
+
     async def get(self, db: AsyncSession, id: uuid_pkg.UUID) -> Optional[ModelType]:
         """Get a single record by ID."""
         statement = select(self.model).where(self.model.id == id)
         result = await db.execute(statement)
         return result.scalar_one_or_none()
 
+    @cached()
     async def get_by_user(
         self,
         db: AsyncSession,
@@ -27,30 +201,28 @@ class BaseOperations(Generic[ModelType]):
         id: uuid_pkg.UUID,
     ) -> Optional[ModelType]:
         """Get a record by ID, scoped to user."""
-        statement = select(self.model).where(
-            self.model.id == id,
-            self.model.user_id == user_id,
-        )
+        statement = select(self.model).where(self.model.id == id, *self.owned_criteria(user_id))
         result = await db.execute(statement)
         return result.scalar_one_or_none()
 
+    @cached()
     async def get_multi_by_user(
         self,
         db: AsyncSession,
         user_id: uuid_pkg.UUID,
+        cursor: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[ModelType]:
-        """Get multiple records for a user with pagination."""
-        statement = (
-            select(self.model)
-            .where(self.model.user_id == user_id)
-            .offset(skip)
-            .limit(limit)
-            .order_by(self.model.created_at.desc())
+        fields: Optional[Sequence[str]] = None,
+        include: Sequence[str] = (),
+    ) -> List[Row]:
+        """Get multiple records for a user with pagination, selecting only the requested columns."""
+        statement = select(*self._list_columns(fields, include)).where(
+            *self.owned_criteria(user_id)
         )
+        statement = self._paginate(statement, cursor=cursor, skip=skip, limit=limit)
         result = await db.execute(statement)
-        return list(result.scalars().all())
+        return list(result.all())
 
     async def create(
         self,
@@ -58,26 +230,72 @@ class BaseOperations(Generic[ModelType]):
         obj_in: dict,
         user_id: uuid_pkg.UUID,
     ) -> ModelType:
-        """Create a new record."""
-        db_obj = self.model(**obj_in, user_id=user_id)
-        db.add(db_obj)
-        await db.flush()
-        await db.refresh(db_obj)
+        """Create a new record in one INSERT ... RETURNING, server defaults included."""
+        statement = insert(self.model).values(**obj_in, user_id=user_id).returning(self.model)
+        result = await db.scalars(statement)
+        db_obj = result.one()
+        result_cache.invalidate(db, user_id, self.model)
+        if counter_ops.is_counted(self.model):
+            await counter_ops.apply(db, user_id, counter_ops.deltas(self.model, db_obj, 1))
+        if quickfind_ops.is_indexed(self.model):
+            quickfind_ops.invalidate(db, user_id)
         return db_obj
 
     async def update(
         self,
         db: AsyncSession,
-        db_obj: ModelType,
+        id: uuid_pkg.UUID,
+        user_id: uuid_pkg.UUID,
         obj_in: dict,
-    ) -> ModelType:
-        """Update an existing record."""
-        for field, value in obj_in.items():
-            if value is not None:
-                setattr(db_obj, field, value)
-        db.add(db_obj)
-        await db.flush()
-        await db.refresh(db_obj)
+    ) -> Optional[ModelType]:
+        """
+        Update a record (scoped to user) in one UPDATE ... RETURNING; None if not found.
+
+        None values are skipped. For counted models the table is joined to its
+        own pre-update row so the old counted values come back in the same
+        statement.
+        """
+        changes = {field: value for field, value in obj_in.items() if value is not None}
+        if not changes:
+            return await self.get_by_user(db, user_id=user_id, id=id)
+
+        statement = update(self.model).where(
+            self.model.id == id,
+            *self.owned_criteria(user_id),
+        ).values(**changes, updated_at=func.now())
+
+        counted = counter_ops.is_counted(self.model)
+        if counted:
+            old = self.model.__table__.alias("old")
+            statement = statement.where(old.c.id == self.model.id).returning(
+                self.model, *(old.c[name] for name in counter_ops.counted_columns(self.model))
+            )
+        else:
+            statement = statement.returning(self.model)
+
+        result = await db.execute(
+            statement.execution_options(synchronize_session=False, populate_existing=True)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        db_obj = row[0]
+        result_cache.invalidate(db, user_id, self.model)
+        if counted:
+            before = dict(zip(counter_ops.counted_columns(self.model), row[1:], strict=True))
+            await counter_ops.apply(
+                db,
+                user_id,
+                merge(
+                    [
+                        counter_ops.deltas(self.model, before, -1),
+                        counter_ops.deltas(self.model, db_obj, 1),
+                    ]
+                ),
+            )
+        if quickfind_ops.is_indexed(self.model):
+            quickfind_ops.invalidate(db, user_id)
         return db_obj
 
     async def delete(
@@ -86,10 +304,42 @@ class BaseOperations(Generic[ModelType]):
         id: uuid_pkg.UUID,
         user_id: uuid_pkg.UUID,
     ) -> bool:
-        """Delete a record (scoped to user)."""
-        db_obj = await self.get_by_user(db, user_id=user_id, id=id)
-        if db_obj:
-            await db.delete(db_obj)
-            await db.flush()
-            return True
-        return False
+        """Delete a record (scoped to user) in one DELETE ... RETURNING."""
+        columns = [self.model.id]
+        if counter_ops.is_counted(self.model):
+            columns += [getattr(self.model, name) for name in counter_ops.counted_columns(self.model)]
+        statement = (
+            delete(self.model)
+            .where(self.model.id == id, *self.owned_criteria(user_id))
+            .returning(*columns)
+        )
+        result = await db.execute(statement)
+        row = result.one_or_none()
+        if row is None:
+            return False
+
+        result_cache.invalidate(db, user_id, self.model)
+        if counter_ops.is_counted(self.model):
+            await counter_ops.apply(db, user_id, counter_ops.deltas(self.model, row, -1))
+        if quickfind_ops.is_indexed(self.model):
+            quickfind_ops.invalidate(db, user_id)
+        return True
+
+    async def require_owned(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        ids: Iterable[uuid_pkg.UUID],
+    ) -> None:
+        """Raise NotFoundError unless every id is one of the user's rows, as `owned_criteria`."""
+        wanted = set(ids)
+        if not wanted:
+            return
+        statement = select(self.model.id).where(
+            self.model.id == any_(bindparam("ids", list(wanted), type_=ARRAY(Uuid()))),
+            *self.owned_criteria(user_id),
+        )
+        result = await db.execute(statement)
+        missing = wanted - set(result.scalars().all())
+        if missing:
+            raise NotFoundError(f"{self.model.__name__} {', '.join(sorted(map(str, missing)))}")
@@ -0,0 +1,185 @@
+import uuid as uuid_pkg
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple, Type
+
+from sqlalchemy import delete, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
+
+from app.models.app_info import AppInfo
+from app.models.document import Document
+from app.models.product import Product
+from app.models.product_counter import ProductCounter
+from app.models.repository import Repository
+from app.models.work_item import WorkItem
+
+# Counted child tables and the columns each is broken down by
+COUNTED: Dict[Type[SQLModel], Tuple[str, ...]] = {
+    Repository: (),
+    WorkItem: ("status", "type"),
+    Document: ("type",),
+    AppInfo: (),
+}
+
+
+class CounterOperations:
+    """Maintenance and reads for the product_counters table."""
+
+    def is_counted(self, model: Type[SQLModel]) -> bool:
+        return model in COUNTED
+
+    def counted_columns(self, model: Type[SQLModel]) -> Tuple[str, ...]:
+        """Columns whose values determine a row's counter keys."""
+        return ("product_id", *COUNTED[model])
+
+    def deltas(self, model: Type[SQLModel], values: Any, sign: int) -> Counter:
+        """
+        Counter deltas for adding (sign=1) or removing (sign=-1) one row.
+
+        Keys are (product_id, entity, dimension, bucket); rows without a
+        product are not counted.
+        """
+        deltas: Counter = Counter()
+        product_id = _value(values, "product_id")
+        if model not in COUNTED or product_id is None:
+            return deltas
+
+        entity = model.__tablename__
+        deltas[(product_id, entity, "total", "")] += sign
+        for dimension in COUNTED[model]:
+            bucket = _value(values, dimension) or ""
+            deltas[(product_id, entity, dimension, bucket)] += sign
+        return deltas
+
+    async def apply(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        deltas: Counter,
+    ) -> None:
+        """Add deltas to the counters in one upsert, within the caller's transaction."""
+        rows = [
+            {
+                "product_id": product_id,
+                "entity": entity,
+                "dimension": dimension,
+                "bucket": bucket,
+                "user_id": user_id,
+                "count": delta,
+            }
+            # Stable order so concurrent upserts lock counter rows in the same sequence
+            for (product_id, entity, dimension, bucket), delta in sorted(
+                deltas.items(), key=lambda item: tuple(map(str, item[0]))
+            )
+            if delta
+        ]
+        if not rows:
+            return
+
+        statement = insert(ProductCounter).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=["product_id", "entity", "dimension", "bucket"],
+            set_={"count": ProductCounter.count + statement.excluded.count},
+        )
+        await db.execute(statement)
+
+    async def get_summary(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+    ) -> Dict[uuid_pkg.UUID, Dict[str, Dict[str, Any]]]:
+        """
+        Counters of every product of a user, nested as product -> entity -> breakdown.
+
+        Driven from the products, newest first, so a product without
+        counter rows yet is still listed, with every total at 0.
+        """
+        statement = (
+            select(
+                Product.id,
+                ProductCounter.entity,
+                ProductCounter.dimension,
+                ProductCounter.bucket,
+                func.coalesce(ProductCounter.count, 0),
+            )
+            .outerjoin(ProductCounter, ProductCounter.product_id == Product.id)
+            .where(Product.user_id == user_id, Product.deleted_at.is_(None))
+            .order_by(Product.created_at.desc(), Product.id.desc())
+        )
+        result = await db.execute(statement)
+
+        summary: Dict[uuid_pkg.UUID, Dict[str, Dict[str, Any]]] = {}
+        for product_id, entity_name, dimension, bucket, count in result.all():
+            if product_id not in summary:
+                summary[product_id] = {model.__tablename__: {"total": 0} for model in COUNTED}
+            if entity_name is None:
+                continue
+            entity = summary[product_id].setdefault(entity_name, {"total": 0})
+            if dimension == "total":
+                entity["total"] = count
+            else:
+                entity.setdefault(dimension, {})[bucket] = count
+        return summary
+
+    async def rebuild(
+        self,
+        db: AsyncSession,
+        user_id: Optional[uuid_pkg.UUID] = None,
+    ) -> None:
+        """Recompute counters from the child tables, for one user or everyone."""
+        clear = delete(ProductCounter)
+        if user_id is not None:
+            clear = clear.where(ProductCounter.user_id == user_id)
+        await db.execute(clear)
+
+        for model, dimensions in COUNTED.items():
+            for dimension in ("total", *dimensions):
+                group_by = [model.product_id, model.user_id]
+                empty = literal_column("''")
+                if dimension == "total":
+                    bucket = empty
+                else:
+                    bucket = func.coalesce(getattr(model, dimension), empty)
+                    group_by.append(bucket)
+                source = (
+                    select(
+                        model.product_id,
+                        literal(model.__tablename__),
+                        literal(dimension),
+                        bucket,
+                        model.user_id,
+                        func.count(),
+                    )
+                    .where(model.product_id.is_not(None))
+                    .group_by(*group_by)
+                )
+                if user_id is not None:
+                    source = source.where(model.user_id == user_id)
+
+                statement = insert(ProductCounter).from_select(
+                    ["product_id", "entity", "dimension", "bucket", "user_id", "count"],
+                    source,
+                )
+                statement = statement.on_conflict_do_update(
+                    index_elements=["product_id", "entity", "dimension", "bucket"],
+                    set_={"count": statement.excluded.count},
+                )
+                await db.execute(statement)
+
+
+def _value(values: Any, field: str) -> Any:
+    if isinstance(values, dict):
+        return values.get(field)
+    return getattr(values, field, None)
+
+
+def merge(deltas: Iterable[Counter]) -> Counter:
+    """Sum several delta counters into one."""
+    total: Counter = Counter()
+    for delta in deltas:
+        total.update(delta)
+    return total
+
+
+counter_ops = CounterOperations()
@@ -1,45 +1,143 @@
+import gzip
 import uuid as uuid_pkg
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import Row, case, exists, func, null, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.base_operations import BaseOperations
+from app.config import settings
+from app.domain.base_operations import BaseOperations, cached
+from app.domain.revision_operations import revision_ops
 from app.models.document import Document
+from app.models.product import Product
+
+# Fields whose changes are kept as document revisions
+VERSIONED_FIELDS = ("title", "content")
+
+
+def compress_content(content: Optional[str]) -> Any:
+    """Value for content_gzip: the gzipped body when large enough, else NULL."""
+    if content is None:
+        return null()
+    encoded = content.encode()
+    if len(encoded) < settings.document_gzip_min_bytes:
+        return null()
+    # mtime=0 keeps the bytes stable for the same content
+    return gzip.compress(encoded, compresslevel=6, mtime=0)
 
 
 class DocumentOperations(BaseOperations[Document]):
     """CRUD operations for Document model."""
 
+    deferred_fields = ("content",)
+    hidden_fields = (*BaseOperations.hidden_fields, "content_gzip")
+
     def __init__(self):
         super().__init__(Document)
 
+    def owned_criteria(self, user_id: uuid_pkg.UUID) -> List[Any]:
+        """WHERE criteria for a user's documents, leaving out those of soft-deleted products."""
+        deleted = exists().where(Product.id == Document.product_id, Product.deleted_at.is_not(None))
+        return [*super().owned_criteria(user_id), ~deleted]
+
+    @cached()
     async def get_by_product(
         self,
         db: AsyncSession,
         user_id: uuid_pkg.UUID,
         product_id: uuid_pkg.UUID,
         type: Optional[str] = None,
+        cursor: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[Document]:
+        fields: Optional[Sequence[str]] = None,
+        include: Sequence[str] = (),
+    ) -> List[Row]:
         """Get documents for a product with optional type filter."""
-        statement = select(Document).where(
-            Document.user_id == user_id,
-            Document.product_id == product_id,
+        statement = select(*self._list_columns(fields, include)).where(
+            *self.product_criteria(user_id, product_id, type=type)
         )
 
-        if type:
-            statement = statement.where(Document.type == type)
+        statement = self._paginate(statement, cursor=cursor, skip=skip, limit=limit)
+
+        result = await db.execute(statement)
+        return list(result.all())
+
+    async def create(
+        self,
+        db: AsyncSession,
+        obj_in: dict,
+        user_id: uuid_pkg.UUID,
+    ) -> Document:
+        """Create a document and its first revision."""
+        if obj_in.get("content") is not None:
+            obj_in = {**obj_in, "content_gzip": compress_content(obj_in["content"])}
+        db_obj = await super().create(db, obj_in=obj_in, user_id=user_id)
+        await revision_ops.record(db, db_obj)
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        id: uuid_pkg.UUID,
+        user_id: uuid_pkg.UUID,
+        obj_in: dict,
+    ) -> Optional[Document]:
+        """
+        Update a document, recording a revision when its title or content changes.
+
+        The row is locked first, so concurrent saves are revisioned in order
+        against the text each one replaced.
+        """
+        if all(obj_in.get(field) is None for field in VERSIONED_FIELDS):
+            return await super().update(db, id=id, user_id=user_id, obj_in=obj_in)
 
         statement = (
-            statement.order_by(Document.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+            select(Document.title, Document.content, Document.updated_at)
+            .where(Document.id == id, *self.owned_criteria(user_id))
+            .with_for_update()
         )
+        previous = (await db.execute(statement)).one_or_none()
+        if previous is None:
+            return None
 
-        result = await db.execute(statement)
-        return list(result.scalars().all())
+        if obj_in.get("content") is not None:
+            obj_in = {**obj_in, "content_gzip": compress_content(obj_in["content"])}
+        db_obj = await super().update(db, id=id, user_id=user_id, obj_in=obj_in)
+        if (db_obj.title, db_obj.content) != (previous.title, previous.content):
+            await revision_ops.record(db, db_obj, previous)
+        return db_obj
+
+    async def get_content(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        id: uuid_pkg.UUID,
+        accept_gzip: bool = False,
+    ) -> Optional[Tuple[bytes, Optional[str]]]:
+        """
+        A document's body as (bytes, content encoding); None if not found.
+
+        The body comes back as UTF-8 bytes from Postgres, never as a Python
+        string. With `accept_gzip`, the stored gzip copy is returned when
+        there is one and the plain body is not read at all.
+        """
+        table = Document.__table__
+        plain = func.convert_to(Document.content, "UTF8")
+        if accept_gzip:
+            columns = [
+                table.c.content_gzip,
+                case((table.c.content_gzip.is_(None), plain), else_=None),
+            ]
+        else:
+            columns = [null(), plain]
+        statement = select(*columns).where(Document.id == id, *self.owned_criteria(user_id))
+        row = (await db.execute(statement)).one_or_none()
+        if row is None:
+            return None
+        if row[0] is not None:
+            return row[0], "gzip"
+        return row[1] or b"", None
 
 
 document_ops = DocumentOperations()
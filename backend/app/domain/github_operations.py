@@ -0,0 +1,299 @@
+import asyncio
+import logging
+import time
+import uuid as uuid_pkg
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Row, column, func, or_, select, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import String, Uuid
+
+from app.config import settings
+from app.core.exceptions import NotFoundError, RateLimitedError, UpstreamError, ValidationError
+from app.core.github import github_client
+from app.core.result_cache import result_cache
+from app.domain.product_operations import product_ops
+from app.domain.repository_operations import repository_ops
+from app.models.github import GitHubSyncState
+from app.models.product import Product
+from app.models.repository import Repository
+
+logger = logging.getLogger(__name__)
+
+# Repositories the token owns, collaborates on or sees through an organization
+AFFILIATION = "owner,collaborator,organization_member"
+
+DESCRIPTION_MAX_LENGTH = 2000
+
+# Recently viewed products remembered per worker for the refresher
+VIEWED_MAX_PRODUCTS = 1024
+
+# Why a refresh batch stopped early, for the log line
+RATE_LIMITED = "the rate limit"
+TOKEN_REJECTED = "GitHub rejecting GITHUB_TOKEN"
+
+
+def repository_fields(repo: Dict[str, Any]) -> Dict[str, Any]:
+    """Repository columns from a GitHub repository object."""
+    description = repo.get("description")
+    return {
+        "github_id": repo["id"],
+        "name": repo.get("name"),
+        "full_name": repo.get("full_name"),
+        "description": description[:DESCRIPTION_MAX_LENGTH] if description else description,
+        "url": repo.get("html_url"),
+        "default_branch": repo.get("default_branch"),
+        "is_private": repo.get("private", False),
+        "language": repo.get("language"),
+        "stars_count": repo.get("stargazers_count"),
+        "forks_count": repo.get("forks_count"),
+    }
+
+
+def _parse_page(body: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Cache only the columns that are stored, not GitHub's full objects
+    return [repository_fields(repo) for repo in body]
+
+
+class GitHubOperations:
+    """
+    Listing a user's GitHub repositories, importing them under products,
+    and refreshing the imported metadata in the background.
+    """
+
+    def __init__(self):
+        # product_id -> monotonic time of its last view, oldest first
+        self._viewed: "OrderedDict[uuid_pkg.UUID, float]" = OrderedDict()
+
+    async def list_repos(self, token: str) -> List[Dict[str, Any]]:
+        """Every repository the token can see, as repository columns."""
+        repos = await github_client.get_all(
+            token,
+            "/user/repos",
+            {"affiliation": AFFILIATION, "sort": "full_name"},
+            _parse_page,
+        )
+        # Pages are read at once, so a repository created meanwhile can shift one onto two pages
+        return list({repo["github_id"]: repo for repo in repos}.values())
+
+    async def list_with_imports(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        token: str,
+    ) -> List[Dict[str, Any]]:
+        """The token's repositories, each with the product it was imported to, if any."""
+        repos = await self.list_repos(token)
+        imported = await repository_ops.get_imported_products(
+            db, user_id, [repo["github_id"] for repo in repos]
+        )
+        return [{**repo, "product_id": imported.get(repo["github_id"])} for repo in repos]
+
+    async def import_repos(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        token: str,
+        product_id: uuid_pkg.UUID,
+        github_ids: Sequence[int],
+    ) -> Dict[str, Any]:
+        """
+        Import the selected repositories under a product.
+
+        The listing is re-read rather than trusted from the client; right
+        after GET /github/repos every page revalidates with a free 304. It
+        is fetched before the first query, so no transaction stays open
+        while GitHub answers.
+        """
+        wanted = set(github_ids)
+        selected = [repo for repo in await self.list_repos(token) if repo["github_id"] in wanted]
+
+        if not await product_ops.get_by_user(db, user_id=user_id, id=product_id):
+            raise NotFoundError("Product")
+        rows = await repository_ops.import_from_github(db, user_id, product_id, selected)
+        created = sum(1 for row in rows if row.created)
+        return {
+            "created": created,
+            "updated": len(rows) - created,
+            "missing": sorted(wanted - {repo["github_id"] for repo in selected}),
+            "repositories": rows,
+        }
+
+    def mark_viewed(self, product_id: uuid_pkg.UUID) -> None:
+        """
+        Note a product page view; its repositories are refreshed first for a while.
+
+        Views are kept in this worker's memory only, not in the database,
+        so product reads stay on read-only sessions. Every worker runs the
+        refresher, so each one favours the products viewed on it; views are
+        forgotten on restart, and those products are then only refreshed on
+        the daily schedule until they are viewed again.
+        """
+        self._viewed[product_id] = time.monotonic()
+        self._viewed.move_to_end(product_id)
+        while len(self._viewed) > VIEWED_MAX_PRODUCTS:
+            self._viewed.popitem(last=False)
+
+    def recently_viewed(self) -> List[uuid_pkg.UUID]:
+        """Products viewed on this worker within the viewed window."""
+        horizon = time.monotonic() - settings.github_refresh_viewed_window_seconds
+        while self._viewed and next(iter(self._viewed.values())) < horizon:
+            self._viewed.popitem(last=False)
+        return list(self._viewed)
+
+    def refresh_budget(self, token: str) -> int:
+        """
+        Repositories the refresher may check this tick.
+
+        What is left of the hourly budget above the reserve is spread
+        evenly over the ticks until the reset. 304s are free, so a mostly
+        unchanged catalogue leaves the budget, and the next batches, large.
+        """
+        limit = github_client.rate_limit(token)
+        if limit is None:
+            return settings.github_refresh_batch_size
+        spare = limit.remaining - settings.github_rate_limit_reserve
+        ticks = max((limit.reset_at - time.time()) / settings.github_refresh_interval_seconds, 1.0)
+        return max(0, min(settings.github_refresh_batch_size, int(spare / ticks)))
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """
+        Check a batch of imported repositories against GitHub; the lifespan refresher.
+
+        Repositories of recently viewed products are due sooner, the rest
+        once a day, never-checked ones first. Each is requested with the
+        ETag of its last check, so unchanged ones cost nothing. Returns
+        the number of repositories whose metadata changed.
+        """
+        token = settings.github_token
+        budget = self.refresh_budget(token)
+        if budget <= 0:
+            return 0
+
+        claimed: List[Row] = []
+        viewed = self.recently_viewed()
+        if viewed:
+            claimed = await self._claim(
+                db, budget, settings.github_refresh_viewed_max_age_seconds, viewed
+            )
+        if len(claimed) < budget:
+            claimed += await self._claim(
+                db,
+                budget - len(claimed),
+                settings.github_refresh_max_age_seconds,
+                exclude=[row.id for row in claimed],
+            )
+        # Other workers skip claimed repositories from here on; no transaction waits on GitHub
+        await db.commit()
+        if not claimed:
+            return 0
+
+        semaphore = asyncio.Semaphore(settings.github_max_concurrency)
+        stopped: Optional[str] = None
+        changes: List[Dict[str, Any]] = []
+        etags: Dict[uuid_pkg.UUID, Optional[str]] = {}
+
+        async def check(row: Row) -> None:
+            nonlocal stopped
+            async with semaphore:
+                if stopped:
+                    return
+                try:
+                    page = await github_client.fetch(
+                        token, f"/repositories/{row.github_id}", etag=row.etag
+                    )
+                except NotFoundError:
+                    # Deleted, or no longer visible to the token: keep the last metadata
+                    etags[row.id] = None
+                    return
+                except RateLimitedError:
+                    stopped = RATE_LIMITED
+                    return
+                except ValidationError:
+                    # 401: every other check in the batch would fail the same way
+                    stopped = TOKEN_REJECTED
+                    return
+                except UpstreamError:
+                    return
+                if page is not None:
+                    changes.append({**repository_fields(page.payload), "id": row.id})
+                    etags[row.id] = page.etag
+
+        await asyncio.gather(*(check(row) for row in claimed))
+
+        changed = await repository_ops.refresh_from_github(db, changes)
+        await self._save_etags(db, etags)
+        await db.commit()
+        await result_cache.flush(db)
+        if stopped:
+            logger.warning("GitHub refresh stopped early by %s", stopped)
+        return changed
+
+    async def _claim(
+        self,
+        db: AsyncSession,
+        limit: int,
+        max_age_seconds: float,
+        product_ids: Optional[Sequence[uuid_pkg.UUID]] = None,
+        exclude: Sequence[uuid_pkg.UUID] = (),
+    ) -> List[Row]:
+        """Take up to `limit` due repositories, stamping them checked now."""
+        statement = (
+            select(Repository.id, Repository.github_id, GitHubSyncState.etag)
+            .join(Product, Product.id == Repository.product_id)
+            .outerjoin(GitHubSyncState, GitHubSyncState.repository_id == Repository.id)
+            .where(
+                Repository.github_id.is_not(None),
+                Product.deleted_at.is_(None),
+                or_(
+                    GitHubSyncState.checked_at.is_(None),
+                    GitHubSyncState.checked_at < func.now() - timedelta(seconds=max_age_seconds),
+                ),
+            )
+            .order_by(GitHubSyncState.checked_at.asc().nulls_first())
+            .limit(limit)
+            # Two workers claiming at once take different repositories
+            .with_for_update(of=Repository, skip_locked=True)
+        )
+        if product_ids:
+            statement = statement.where(Repository.product_id.in_(product_ids))
+        if exclude:
+            statement = statement.where(Repository.id.not_in(exclude))
+        rows = list((await db.execute(statement)).all())
+        if not rows:
+            return rows
+
+        stamp = insert(GitHubSyncState).values(
+            [{"repository_id": row.id, "checked_at": func.now()} for row in rows]
+        )
+        await db.execute(
+            stamp.on_conflict_do_update(
+                index_elements=[GitHubSyncState.repository_id],
+                set_={"checked_at": stamp.excluded.checked_at},
+            )
+        )
+        return rows
+
+    async def _save_etags(
+        self,
+        db: AsyncSession,
+        etags: Dict[uuid_pkg.UUID, Optional[str]],
+    ) -> None:
+        """Store the ETags of the responses that were not 304, in one UPDATE."""
+        if not etags:
+            return
+        fresh = values(
+            column("repository_id", Uuid()), column("etag", String()), name="fresh"
+        ).data(list(etags.items()))
+        await db.execute(
+            update(GitHubSyncState)
+            .where(GitHubSyncState.repository_id == fresh.c.repository_id)
+            .values(etag=fresh.c.etag)
+            .execution_options(synchronize_session=False)
+        )
+
+
+github_ops = GitHubOperations()
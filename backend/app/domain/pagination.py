@@ -0,0 +1,31 @@
+import base64
+import binascii
+import uuid as uuid_pkg
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from app.core.exceptions import ValidationError
+
+
+def encode_cursor(created_at: datetime, id: uuid_pkg.UUID) -> str:
+    """Opaque keyset cursor for the (created_at, id) position of a row."""
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid_pkg.UUID]:
+    """Inverse of encode_cursor; raises ValidationError on malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), uuid_pkg.UUID(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValidationError("Invalid cursor") from exc
+
+
+def next_cursor(rows: Sequence[Any], limit: int) -> Optional[str]:
+    """Cursor for the page after `rows`, or None when this was the last page."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
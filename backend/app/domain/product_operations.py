@@ -1,36 +1,232 @@
 import uuid as uuid_pkg
-from typing import List, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple, Type
 
-from sqlalchemy import select
+from sqlalchemy import (
+    DateTime,
+    Text,
+    case,
+    delete,
+    func,
+    literal_column,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlmodel import SQLModel
 
-from app.domain.base_operations import BaseOperations
-from app.models.product import Product
+from app.core.result_cache import result_cache
+from app.domain.base_operations import BaseOperations, Fingerprint, cached
+from app.domain.quickfind_operations import quickfind_ops
+from app.models.app_info import AppInfo, AppInfoKey
+from app.models.document import Document, DocumentTitle
+from app.models.product import Product, ProductRead
+from app.models.repository import Repository, RepositoryRead
+from app.models.work_item import WorkItem, WorkItemRead
+
+# Child tables counted on the product detail view, keyed by response field
+CHILD_COUNTS = {
+    "repositories_count": Repository,
+    "work_items_count": WorkItem,
+    "documents_count": Document,
+    "app_info_count": AppInfo,
+}
+
+
+# Children purged in batches before the product row; repositories go last
+# because work items and documents reference them
+PURGE_ORDER = (WorkItem, Document, AppInfo, Repository)
+
+PURGE_BATCH_SIZE = 1000
+
+# Timestamps as pydantic renders the naive UTC columns elsewhere in the API:
+# no zone, and no fraction when the microseconds are zero
+ISO_FORMAT = literal_column("""'YYYY-MM-DD"T"HH24:MI:SS'""")
+ISO_FORMAT_US = literal_column("""'YYYY-MM-DD"T"HH24:MI:SS.US'""")
+
+
+def iso_timestamp(value: Any) -> Any:
+    """to_char of a timestamp column, matching its JSON form in the Read schemas."""
+    return case(
+        (func.date_trunc("second", value) == value, func.to_char(value, ISO_FORMAT)),
+        else_=func.to_char(value, ISO_FORMAT_US),
+    )
+
+
+def json_row(model: Type[SQLModel], fields: Iterable[str]) -> Any:
+    """json_build_object over the named columns of `model`, keyed by field name."""
+    arguments = []
+    for name in fields:
+        value = getattr(model, name)
+        if isinstance(getattr(value.type, "impl", value.type), DateTime):
+            value = iso_timestamp(value)
+        # Literal keys: asyncpg cannot infer a type for bind parameters here
+        arguments.extend([literal_column(f"'{name}'"), value])
+    return func.json_build_object(*arguments)
+
+
+def json_list(row: Any, *order_by: Any) -> Any:
+    """json_agg of `row` in the given order, '[]' instead of NULL when there are no rows."""
+    return func.coalesce(
+        func.json_agg(aggregate_order_by(row, *order_by)), literal_column("'[]'::json")
+    )
 
 
 class ProductOperations(BaseOperations[Product]):
     """CRUD operations for Product model."""
 
+    hidden_fields = (*BaseOperations.hidden_fields, "deleted_at")
+    soft_delete_field = "deleted_at"
+
     def __init__(self):
         super().__init__(Product)
 
-    async def get_with_relations(
+    @cached(*CHILD_COUNTS.values())
+    async def get_with_counts(
         self,
         db: AsyncSession,
         user_id: uuid_pkg.UUID,
         id: uuid_pkg.UUID,
-    ) -> Optional[Product]:
-        """Get product with all related entities."""
-        statement = (
-            select(Product)
-            .where(Product.id == id, Product.user_id == user_id)
-            .options(
-                selectinload(Product.repositories),
-                selectinload(Product.work_items),
-                selectinload(Product.documents),
-                selectinload(Product.app_info_entries),
+    ) -> Optional[Tuple[Product, Dict[str, int]]]:
+        """Get product with child row counts, computed in one query via correlated subqueries."""
+        counts = [
+            select(func.count())
+            .select_from(model)
+            .where(model.product_id == Product.id)
+            .correlate(Product)
+            .scalar_subquery()
+            .label(name)
+            for name, model in CHILD_COUNTS.items()
+        ]
+        statement = select(Product, *counts).where(Product.id == id, *self.owned_criteria(user_id))
+        result = await db.execute(statement)
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return row[0], {name: row._mapping[name] for name in CHILD_COUNTS}
+
+    async def fingerprint_detail(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        id: uuid_pkg.UUID,
+    ) -> Optional[Fingerprint]:
+        """
+        Fingerprint of a product together with all its children; None if not found.
+
+        Covers everything the detail view can show: the product row, the
+        child counts and any embedded child page.
+        """
+        children = []
+        for model in CHILD_COUNTS.values():
+            children.append(
+                select(func.count())
+                .select_from(model)
+                .where(model.product_id == Product.id)
+                .correlate(Product)
+                .scalar_subquery()
             )
+            children.append(
+                select(func.max(model.updated_at))
+                .where(model.product_id == Product.id)
+                .correlate(Product)
+                .scalar_subquery()
+            )
+        statement = select(Product.updated_at, *children).where(
+            Product.id == id, *self.owned_criteria(user_id)
+        )
+        result = await db.execute(statement)
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        updated_at, *stats = row
+        counts, maxima = stats[0::2], stats[1::2]
+        last_modified = max([updated_at, *(value for value in maxima if value is not None)])
+        return Fingerprint(1 + sum(counts), last_modified)
+
+    @cached(*CHILD_COUNTS.values())
+    async def get_workspace(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        id: uuid_pkg.UUID,
+    ) -> Optional[str]:
+        """
+        The product page as a JSON document (see ProductWorkspace); None if not found.
+
+        Postgres assembles it with json_build_object/json_agg in one
+        statement, so a page view is one round trip and the rows are never
+        turned into Python objects. Open work items come from the
+        ix_work_items_open partial index, grouped by status with "" for
+        items without one; work item descriptions, document bodies and app
+        info values are left out.
+        """
+        # Imported here because work_item_operations checks products through product_ops
+        from app.domain.work_item_operations import work_item_ops
+
+        work_item_fields = [
+            name for name in WorkItemRead.model_fields if name not in work_item_ops.deferred_fields
+        ]
+        # json_object_agg rejects a NULL key; "" is also the counters' bucket for no status
+        bucket = func.coalesce(WorkItem.status, literal_column("''"))
+        open_items = (
+            select(
+                bucket.label("bucket"),
+                json_list(
+                    json_row(WorkItem, work_item_fields),
+                    WorkItem.created_at.desc(),
+                    WorkItem.id.desc(),
+                ).label("items"),
+            )
+            .where(
+                WorkItem.user_id == user_id,
+                WorkItem.product_id == id,
+                # Matches the ix_work_items_open predicate, so the planner can use it
+                or_(WorkItem.status.is_(None), WorkItem.status != "done"),
+            )
+            .group_by(bucket)
+            .subquery()
+        )
+        sections = {
+            "product": json_row(Product, ProductRead.model_fields),
+            "repositories": select(
+                json_list(
+                    json_row(Repository, RepositoryRead.model_fields),
+                    Repository.created_at.desc(),
+                    Repository.id.desc(),
+                )
+            )
+            .where(Repository.user_id == user_id, Repository.product_id == id)
+            .scalar_subquery(),
+            "open_work_items": select(
+                func.coalesce(
+                    func.json_object_agg(open_items.c.bucket, open_items.c["items"]),
+                    literal_column("'{}'::json"),
+                )
+            ).scalar_subquery(),
+            "pinned_documents": select(
+                json_list(
+                    json_row(Document, DocumentTitle.model_fields),
+                    Document.updated_at.desc(),
+                    Document.id.desc(),
+                )
+            )
+            .where(Document.user_id == user_id, Document.product_id == id, Document.is_pinned)
+            .scalar_subquery(),
+            "app_info_keys": select(
+                json_list(json_row(AppInfo, AppInfoKey.model_fields), AppInfo.key, AppInfo.id)
+            )
+            .where(AppInfo.user_id == user_id, AppInfo.product_id == id)
+            .scalar_subquery(),
+        }
+        arguments = []
+        for name, value in sections.items():
+            arguments.extend([literal_column(f"'{name}'"), value])
+        # As text: asyncpg would otherwise decode the json, only for it to be encoded again
+        statement = select(func.json_build_object(*arguments).cast(Text)).where(
+            Product.id == id, *self.owned_criteria(user_id)
         )
         result = await db.execute(statement)
         return result.scalar_one_or_none()
@@ -42,12 +238,77 @@ class ProductOperations(BaseOperations[Product]):
         name: str,
     ) -> Optional[Product]:
         """Find a product by name for a user."""
-        statement = select(Product).where(
-            Product.user_id == user_id,
-            Product.name == name,
-        )
+        statement = select(Product).where(*self.owned_criteria(user_id), Product.name == name)
         result = await db.execute(statement)
         return result.scalar_one_or_none()
 
+    async def delete(
+        self,
+        db: AsyncSession,
+        id: uuid_pkg.UUID,
+        user_id: uuid_pkg.UUID,
+    ) -> bool:
+        """
+        Soft-delete a product; `purge` removes it and its children later.
+
+        The product disappears from every product read at once. Its children
+        stay until the purge, which runs after the response.
+        """
+        statement = (
+            update(Product)
+            .where(Product.id == id, *self.owned_criteria(user_id))
+            .values(deleted_at=func.now())
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(statement)
+        if result.one_or_none() is None:
+            return False
+        result_cache.invalidate(db, user_id, Product, *CHILD_COUNTS.values())
+        quickfind_ops.invalidate(db, user_id)
+        return True
+
+    async def purge(self, db: AsyncSession, id: uuid_pkg.UUID) -> None:
+        """
+        Remove a soft-deleted product's children in bounded batches, then the product.
+
+        Commits after every batch so no statement holds locks or a connection
+        for long; an interrupted purge is finished by `purge_deleted`. Rows
+        already claimed by a concurrent purge are skipped, and whatever
+        remains goes with the product through ON DELETE CASCADE.
+        """
+        product = await db.scalar(
+            select(Product).where(Product.id == id, Product.deleted_at.is_not(None))
+        )
+        if product is None:
+            return
+
+        for model in PURGE_ORDER:
+            while True:
+                batch = (
+                    select(model.id)
+                    .where(model.product_id == id)
+                    .limit(PURGE_BATCH_SIZE)
+                    .with_for_update(skip_locked=True)
+                )
+                result = await db.execute(delete(model).where(model.id.in_(batch)))
+                await db.commit()
+                if result.rowcount < PURGE_BATCH_SIZE:
+                    break
+
+        await db.execute(delete(Product).where(Product.id == id))
+        result_cache.invalidate(db, product.user_id, Product, *CHILD_COUNTS.values())
+        quickfind_ops.invalidate(db, product.user_id)
+        await db.commit()
+        await result_cache.flush(db)
+
+    async def purge_deleted(self, db: AsyncSession) -> None:
+        """Purge every soft-deleted product, oldest first; the lifespan sweeper."""
+        result = await db.execute(
+            select(Product.id).where(Product.deleted_at.is_not(None)).order_by(Product.deleted_at)
+        )
+        for id in result.scalars().all():
+            await self.purge(db, id)
+
 
 product_ops = ProductOperations()
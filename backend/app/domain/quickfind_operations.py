@@ -0,0 +1,157 @@
+import uuid as uuid_pkg
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import Row, case, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.database import after_commit
+from app.models.document import Document
+from app.models.product import Product
+from app.models.repository import Repository
+from app.models.work_item import WorkItem
+
+# Entities matched by quick-find, keyed by result kind, with their label column
+QUICKFIND: Dict[str, Tuple[Type[SQLModel], str]] = {
+    "products": (Product, "name"),
+    "repositories": (Repository, "full_name"),
+    "work_items": (WorkItem, "title"),
+    "documents": (Document, "title"),
+}
+
+# Rows fetched per query; a result shorter than this is the complete match set
+FETCH_LIMIT = 50
+
+# Recent queries remembered per user
+QUERIES_PER_USER = 256
+
+
+class QuickFindOperations:
+    """
+    Type-ahead lookup across product, repository, work item and document names.
+
+    A label matches when it contains the query (case-insensitive), which the
+    pg_trgm GIN indexes serve. Matches are ranked: prefix matches first, then
+    by how early the query appears, then shorter labels.
+
+    Results are cached per user. Because every match for "abc" also matches
+    "ab", a complete cached result for a prefix is narrowed in process
+    instead of going back to the database as the user keeps typing.
+    """
+
+    def __init__(self, max_users: int, ttl_seconds: float):
+        self._cache: TTLCache[TTLCache[Tuple[List[Row], bool]]] = TTLCache(
+            max_size=max_users, ttl_seconds=ttl_seconds
+        )
+
+    def is_indexed(self, model: Type[SQLModel]) -> bool:
+        return any(model is indexed for indexed, _ in QUICKFIND.values())
+
+    def invalidate(self, db: AsyncSession, user_id: uuid_pkg.UUID) -> None:
+        """
+        Forget a user's cached lookups once `db` commits a change to a matched entity.
+
+        Clearing before the commit would let a lookup in between cache the
+        old rows again.
+        """
+        after_commit(db, lambda: self._cache.delete(user_id))
+
+    async def find(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        q: str,
+        limit: int = 10,
+    ) -> List[Row]:
+        """Best `limit` matches for `q` across all entity types."""
+        needle = q.strip().lower()
+        if not needle:
+            return []
+
+        queries = self._cache.get(user_id)
+        if queries is None:
+            queries = TTLCache(max_size=QUERIES_PER_USER, ttl_seconds=self._cache.ttl_seconds)
+            self._cache.set(user_id, queries)
+
+        cached = self._from_cache(queries, needle)
+        if cached is None:
+            rows = await self._query(db, user_id, needle)
+            cached = (rows, len(rows) < FETCH_LIMIT)
+            queries.set(needle, cached)
+        return cached[0][:limit]
+
+    def _from_cache(
+        self,
+        queries: TTLCache[Tuple[List[Row], bool]],
+        needle: str,
+    ) -> Optional[Tuple[List[Row], bool]]:
+        exact = queries.get(needle)
+        if exact is not None:
+            return exact
+
+        # Longest cached prefix whose result holds every match
+        for end in range(len(needle) - 1, 0, -1):
+            entry = queries.get(needle[:end])
+            if entry is None or not entry[1]:
+                continue
+            rows = sorted(
+                (row for row in entry[0] if needle in row.label.lower()),
+                key=lambda row: _rank(row.label, needle),
+            )
+            narrowed = (rows, True)
+            queries.set(needle, narrowed)
+            return narrowed
+        return None
+
+    async def _query(self, db: AsyncSession, user_id: uuid_pkg.UUID, needle: str) -> List[Row]:
+        pattern = needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+        branches = []
+        for kind, (model, column) in QUICKFIND.items():
+            label = getattr(model, column)
+            product_id = model.id if model is Product else model.product_id
+            criteria = [model.user_id == user_id, label.ilike(f"%{pattern}%", escape="\\")]
+            if model is Product:
+                criteria.append(Product.deleted_at.is_(None))
+            branches.append(
+                select(
+                    literal(kind).label("kind"),
+                    model.id,
+                    product_id.label("product_id"),
+                    label.label("label"),
+                )
+                .where(*criteria)
+                .order_by(*_rank_columns(label, needle, pattern))
+                .limit(FETCH_LIMIT)
+            )
+
+        matches = union_all(*branches).subquery("matches")
+        statement = (
+            select(matches)
+            .order_by(*_rank_columns(matches.c.label, needle, pattern), matches.c.id)
+            .limit(FETCH_LIMIT)
+        )
+        result = await db.execute(statement)
+        return list(result.all())
+
+
+def _rank_columns(label: Any, needle: str, pattern: str) -> List[Any]:
+    """SQL counterpart of _rank, so cached results narrow to the same order."""
+    return [
+        case((label.ilike(f"{pattern}%", escape="\\"), 0), else_=1),
+        func.strpos(func.lower(label), needle),
+        func.length(label),
+    ]
+
+
+def _rank(label: str, needle: str) -> Tuple[int, int, int]:
+    position = label.lower().find(needle)
+    return (0 if position == 0 else 1, position + 1, len(label))
+
+
+quickfind_ops = QuickFindOperations(
+    max_users=settings.quickfind_cache_max_users,
+    ttl_seconds=settings.quickfind_cache_ttl_seconds,
+)
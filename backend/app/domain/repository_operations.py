@@ -1,11 +1,51 @@
 import uuid as uuid_pkg
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Boolean,
+    Integer,
+    Row,
+    any_,
+    bindparam,
+    column,
+    func,
+    literal_column,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import Uuid
 
-from app.domain.base_operations import BaseOperations
-from app.models.repository import Repository
+from app.core.result_cache import result_cache
+from app.domain.base_operations import BaseOperations, cached
+from app.domain.counter_operations import counter_ops, merge
+from app.domain.quickfind_operations import quickfind_ops
+from app.models.repository import Repository, RepositoryRead
+
+# Columns an import takes from GitHub
+GITHUB_FIELDS = (
+    "name",
+    "full_name",
+    "description",
+    "url",
+    "default_branch",
+    "is_private",
+    "language",
+    "stars_count",
+    "forks_count",
+)
+
+# Rows per upsert statement; at 15 values a row this stays under asyncpg's 32,767 parameters
+IMPORT_BATCH_SIZE = 2000
+
+
+def _github_id_in(github_ids: Sequence[int]):
+    return Repository.github_id == any_(
+        bindparam("github_ids", list(github_ids), type_=ARRAY(Integer()))
+    )
 
 
 class RepositoryOperations(BaseOperations[Repository]):
@@ -14,27 +54,25 @@ class RepositoryOperations(BaseOperations[Repository]):
     def __init__(self):
         super().__init__(Repository)
 
+    @cached()
     async def get_by_product(
         self,
         db: AsyncSession,
         user_id: uuid_pkg.UUID,
         product_id: uuid_pkg.UUID,
+        cursor: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[Repository]:
+        fields: Optional[Sequence[str]] = None,
+        include: Sequence[str] = (),
+    ) -> List[Row]:
         """Get repositories for a specific product."""
-        statement = (
-            select(Repository)
-            .where(
-                Repository.user_id == user_id,
-                Repository.product_id == product_id,
-            )
-            .offset(skip)
-            .limit(limit)
-            .order_by(Repository.created_at.desc())
+        statement = select(*self._list_columns(fields, include)).where(
+            *self.product_criteria(user_id, product_id)
         )
+        statement = self._paginate(statement, cursor=cursor, skip=skip, limit=limit)
         result = await db.execute(statement)
-        return list(result.scalars().all())
+        return list(result.all())
 
     async def get_by_github_id(
         self,
@@ -50,5 +88,139 @@ class RepositoryOperations(BaseOperations[Repository]):
         result = await db.execute(statement)
         return result.scalar_one_or_none()
 
+    async def get_imported_products(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        github_ids: Sequence[int],
+    ) -> Dict[int, Optional[uuid_pkg.UUID]]:
+        """Product of each GitHub repository the user has already imported."""
+        if not github_ids:
+            return {}
+        statement = select(Repository.github_id, Repository.product_id).where(
+            Repository.user_id == user_id,
+            _github_id_in(github_ids),
+        )
+        result = await db.execute(statement)
+        return dict(result.tuples().all())
+
+    async def import_from_github(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        product_id: uuid_pkg.UUID,
+        repos: Sequence[Dict[str, Any]],
+    ) -> List[Row]:
+        """
+        Insert or refresh GitHub repositories under a product.
+
+        One INSERT ... ON CONFLICT (user_id, github_id) DO UPDATE per
+        IMPORT_BATCH_SIZE repositories. Rows come back with `created` and
+        the `previous_product_id` they were moved from, read in the same
+        statement, so product counters are adjusted without another query.
+        """
+        rows: List[Row] = []
+        for start in range(0, len(repos), IMPORT_BATCH_SIZE):
+            batch = repos[start : start + IMPORT_BATCH_SIZE]
+            rows.extend(await self._upsert(db, user_id, product_id, batch))
+
+        deltas = []
+        for row in rows:
+            if row.created:
+                deltas.append(counter_ops.deltas(Repository, {"product_id": product_id}, 1))
+            elif row.previous_product_id != product_id:
+                moved_from = {"product_id": row.previous_product_id}
+                deltas.append(counter_ops.deltas(Repository, moved_from, -1))
+                deltas.append(counter_ops.deltas(Repository, {"product_id": product_id}, 1))
+        await counter_ops.apply(db, user_id, merge(deltas))
+        result_cache.invalidate(db, user_id, Repository)
+        quickfind_ops.invalidate(db, user_id)
+        return rows
+
+    async def _upsert(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        product_id: uuid_pkg.UUID,
+        repos: Sequence[Dict[str, Any]],
+    ) -> List[Row]:
+        # The statement runs on one snapshot, so `previous` sees the rows as they were
+        previous = (
+            select(Repository.github_id, Repository.product_id)
+            .where(
+                Repository.user_id == user_id,
+                _github_id_in([repo["github_id"] for repo in repos]),
+            )
+            .cte("previous")
+        )
+        statement = insert(Repository).values(
+            [
+                {
+                    **{name: repo.get(name) for name in GITHUB_FIELDS},
+                    "github_id": repo["github_id"],
+                    "user_id": user_id,
+                    "product_id": product_id,
+                }
+                for repo in repos
+            ]
+        )
+        upserted = (
+            statement.on_conflict_do_update(
+                index_elements=[Repository.user_id, Repository.github_id],
+                set_={
+                    **{name: statement.excluded[name] for name in (*GITHUB_FIELDS, "product_id")},
+                    "updated_at": func.now(),
+                },
+            )
+            .returning(
+                *(getattr(Repository, name) for name in RepositoryRead.model_fields),
+                # xmax is 0 only on rows this statement inserted
+                literal_column("xmax = 0", Boolean).label("created"),
+            )
+            .cte("upserted")
+        )
+        query = select(upserted, previous.c.product_id.label("previous_product_id")).outerjoin(
+            previous, previous.c.github_id == upserted.c.github_id
+        )
+        result = await db.execute(query)
+        return list(result.all())
+
+    async def refresh_from_github(
+        self,
+        db: AsyncSession,
+        changes: Sequence[Dict[str, Any]],
+    ) -> int:
+        """
+        Write fresh GitHub metadata in one UPDATE ... FROM (VALUES ...); returns rows changed.
+
+        Each entry is an `id` plus GITHUB_FIELDS. Rows whose metadata is
+        already current are left alone, so they raise no change events and
+        keep their ETags and sync position.
+        """
+        if not changes:
+            return 0
+        table = Repository.__table__
+        fresh = values(
+            column("id", Uuid()),
+            *(column(name, table.c[name].type) for name in GITHUB_FIELDS),
+            name="fresh",
+        ).data([(entry["id"], *(entry.get(name) for name in GITHUB_FIELDS)) for entry in changes])
+        changed = or_(
+            *(getattr(Repository, name).is_distinct_from(fresh.c[name]) for name in GITHUB_FIELDS)
+        )
+        statement = (
+            update(Repository)
+            .where(Repository.id == fresh.c.id, changed)
+            .values(updated_at=func.now(), **{name: fresh.c[name] for name in GITHUB_FIELDS})
+            .returning(Repository.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(statement)
+        user_ids = list(result.scalars().all())
+        for user_id in set(user_ids):
+            result_cache.invalidate(db, user_id, Repository)
+            quickfind_ops.invalidate(db, user_id)
+        return len(user_ids)
+
 
 repository_ops = RepositoryOperations()
@@ -0,0 +1,266 @@
+import difflib
+import json
+import uuid as uuid_pkg
+import zlib
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy import Row, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.document import Document
+from app.models.document_revision import DocumentRevision
+
+# zlib level for snapshots and diffs; 6 is zlib's default speed/size balance
+COMPRESSION_LEVEL = 6
+
+# Revisions deleted per statement by the compaction job
+COMPACT_BATCH_SIZE = 5000
+
+# A diff op: [start, end] copies those lines of the previous text, a string is inserted
+Op = Union[List[int], str]
+
+
+def _owned(user_id: uuid_pkg.UUID) -> List[Any]:
+    """WHERE criteria for the user's visible documents, as document_ops defines them."""
+    # Imported here because document_operations records revisions through revision_ops
+    from app.domain.document_operations import document_ops
+
+    return document_ops.owned_criteria(user_id)
+
+
+def diff(old: str, new: str) -> bytes:
+    """Compressed line diff that turns `old` into `new`."""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    ops: List[Op] = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append("".join(new_lines[j1:j2]))
+    encoded = json.dumps(ops, separators=(",", ":"), ensure_ascii=False).encode()
+    return zlib.compress(encoded, COMPRESSION_LEVEL)
+
+
+def patch(old: str, payload: bytes) -> str:
+    """Apply a diff produced by `diff` to `old`."""
+    old_lines = old.splitlines(keepends=True)
+    ops: List[Op] = json.loads(zlib.decompress(payload))
+    return "".join("".join(old_lines[op[0] : op[1]]) if isinstance(op, list) else op for op in ops)
+
+
+def snapshot(content: str) -> bytes:
+    """Compressed full text."""
+    return zlib.compress(content.encode(), COMPRESSION_LEVEL)
+
+
+class RevisionOperations:
+    """
+    History of document saves as periodic snapshots plus diffs.
+
+    document_ops writes a revision in the same transaction as every save,
+    with the document row locked, so numbers have no gaps and each diff is
+    taken against the revision right before it.
+    """
+
+    async def record(
+        self,
+        db: AsyncSession,
+        document: Document,
+        previous: Optional[Row] = None,
+    ) -> None:
+        """
+        Append the document's current title and content as a new revision.
+
+        `previous` is the (title, content, updated_at) the save replaced.
+        Documents written before revisions existed have no history yet, so
+        that state is stored first as revision 1.
+        """
+        statement = (
+            select(DocumentRevision.number, DocumentRevision.snapshot_number)
+            .where(DocumentRevision.document_id == document.id)
+            .order_by(DocumentRevision.number.desc())
+            .limit(1)
+        )
+        latest = (await db.execute(statement)).one_or_none()
+        if latest is None and previous is not None:
+            await self._insert(
+                db,
+                document,
+                number=1,
+                snapshot_number=1,
+                title=previous.title,
+                content=previous.content,
+                payload=snapshot(previous.content or ""),
+                created_at=previous.updated_at,
+            )
+            latest = (1, 1)
+
+        full = snapshot(document.content or "")
+        if latest is None:
+            number, snapshot_number, payload = 1, 1, full
+        else:
+            number, snapshot_number = latest[0] + 1, latest[1]
+            payload = diff(previous.content or "", document.content or "") if previous else full
+            # Bound the chain to rebuild, and keep a rewrite as a snapshot when that is smaller
+            if number - snapshot_number >= settings.document_revision_snapshot_interval or len(
+                full
+            ) <= len(payload):
+                snapshot_number, payload = number, full
+
+        await self._insert(
+            db,
+            document,
+            number=number,
+            snapshot_number=snapshot_number,
+            title=document.title,
+            content=document.content,
+            payload=payload,
+            created_at=document.updated_at,
+        )
+
+    async def _insert(
+        self,
+        db: AsyncSession,
+        document: Document,
+        content: Optional[str],
+        **values: Any,
+    ) -> None:
+        await db.execute(
+            insert(DocumentRevision).values(
+                document_id=document.id,
+                user_id=document.user_id,
+                size=len(content) if content is not None else None,
+                **values,
+            )
+        )
+
+    async def get_by_document(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        document_id: uuid_pkg.UUID,
+        before: Optional[int] = None,
+        limit: int = 50,
+    ) -> Optional[List[Row]]:
+        """
+        Revision metadata, newest first; None if the document is not visible.
+
+        History follows the same visibility rules as the document itself.
+        """
+        owned = await db.scalar(
+            select(Document.id).where(Document.id == document_id, *_owned(user_id))
+        )
+        if owned is None:
+            return None
+
+        statement = select(
+            DocumentRevision.number,
+            (DocumentRevision.number == DocumentRevision.snapshot_number).label("is_snapshot"),
+            DocumentRevision.title,
+            DocumentRevision.size,
+            func.length(DocumentRevision.payload).label("stored_bytes"),
+            DocumentRevision.created_at,
+        ).where(
+            DocumentRevision.document_id == document_id,
+            DocumentRevision.user_id == user_id,
+        )
+        if before is not None:
+            statement = statement.where(DocumentRevision.number < before)
+        statement = statement.order_by(DocumentRevision.number.desc()).limit(limit)
+
+        result = await db.execute(statement)
+        return list(result.all())
+
+    async def get_version(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        document_id: uuid_pkg.UUID,
+        number: int,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild the document as of revision `number`; None if there is no such revision.
+
+        Reads the revision's snapshot and the diffs after it in one query.
+        Visibility is checked as in get_by_document.
+        """
+        target = (
+            select(DocumentRevision.snapshot_number)
+            .join(Document, Document.id == DocumentRevision.document_id)
+            .where(
+                DocumentRevision.document_id == document_id,
+                DocumentRevision.user_id == user_id,
+                DocumentRevision.number == number,
+                *_owned(user_id),
+            )
+            .scalar_subquery()
+        )
+        statement = (
+            select(DocumentRevision)
+            .where(
+                DocumentRevision.document_id == document_id,
+                DocumentRevision.number.between(target, number),
+            )
+            .order_by(DocumentRevision.number)
+        )
+        chain = list((await db.scalars(statement)).all())
+        if not chain:
+            return None
+
+        content = zlib.decompress(chain[0].payload).decode()
+        for revision in chain[1:]:
+            content = patch(content, revision.payload)
+        revision = chain[-1]
+        return {
+            "document_id": document_id,
+            "number": revision.number,
+            "title": revision.title,
+            "content": content if revision.size is not None else None,
+            "created_at": revision.created_at,
+        }
+
+    async def compact(self, db: AsyncSession) -> int:
+        """
+        Drop history older than the retention period in batches; returns the count.
+
+        Per document, everything before its newest snapshot that is past
+        retention goes. That snapshot and later revisions stay, so every
+        version saved within the period and the one current at its start
+        can still be rebuilt.
+        """
+        cutoff = func.now() - timedelta(days=settings.document_revision_retention_days)
+        horizons = (
+            select(
+                DocumentRevision.document_id,
+                func.max(DocumentRevision.number).label("keep_from"),
+            )
+            .where(
+                DocumentRevision.number == DocumentRevision.snapshot_number,
+                DocumentRevision.created_at < cutoff,
+            )
+            .group_by(DocumentRevision.document_id)
+            .subquery()
+        )
+        compacted = 0
+        while True:
+            expired = (
+                select(DocumentRevision.id)
+                .join(horizons, horizons.c.document_id == DocumentRevision.document_id)
+                .where(DocumentRevision.number < horizons.c.keep_from)
+                .limit(COMPACT_BATCH_SIZE)
+            )
+            result = await db.execute(
+                delete(DocumentRevision).where(DocumentRevision.id.in_(expired))
+            )
+            # Commit per batch so locks and WAL stay small
+            await db.commit()
+            compacted += result.rowcount
+            if result.rowcount < COMPACT_BATCH_SIZE:
+                return compacted
+
+
+revision_ops = RevisionOperations()
@@ -0,0 +1,104 @@
+import uuid as uuid_pkg
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import Row, and_, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
+
+from app.core.exceptions import ValidationError
+from app.models.base import SEARCH_CONFIG
+from app.models.document import Document
+from app.models.product import Product
+from app.models.work_item import WorkItem
+
+# Searchable tables, keyed by result kind, with the column each snippet is cut from
+SEARCHABLE: Dict[str, Tuple[Type[SQLModel], str]] = {
+    "documents": (Document, "content"),
+    "work_items": (WorkItem, "description"),
+}
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+class SearchOperations:
+    """Full-text search over the generated search_vector columns."""
+
+    async def search(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        q: str,
+        product_id: Optional[uuid_pkg.UUID] = None,
+        kinds: Sequence[str] = (),
+        limit: int = 20,
+    ) -> List[Row]:
+        """
+        Rank matches for a web-style query (quoted phrases, OR, -exclusion).
+
+        Matching and ranking use only the GIN-indexed vectors; the top `limit`
+        hits are picked first, and only those are joined back for the title
+        and the highlighted snippet, so ts_headline never runs over the full
+        match set.
+        """
+        kinds = list(kinds) or list(SEARCHABLE)
+        unknown = sorted(set(kinds) - set(SEARCHABLE))
+        if unknown:
+            raise ValidationError(f"Cannot search: {', '.join(unknown)}")
+
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        matches = []
+        for kind in kinds:
+            model, _ = SEARCHABLE[kind]
+            vector = model.__table__.c.search_vector
+            rank = func.ts_rank(vector, query)
+            statement = (
+                select(
+                    literal(kind).label("kind"),
+                    model.id,
+                    model.product_id,
+                    rank.label("rank"),
+                )
+                # Children of a soft-deleted product wait for its purge; rows without one stay
+                .outerjoin(Product, Product.id == model.product_id)
+                .where(
+                    model.user_id == user_id,
+                    vector.bool_op("@@")(query),
+                    Product.deleted_at.is_(None),
+                )
+            )
+            if product_id is not None:
+                statement = statement.where(model.product_id == product_id)
+            matches.append(statement.order_by(rank.desc()).limit(limit))
+
+        ranked = union_all(*matches).subquery("ranked")
+        top = (
+            select(ranked)
+            .order_by(ranked.c.rank.desc(), ranked.c.id)
+            .limit(limit)
+            .subquery("top")
+        )
+
+        titles = []
+        bodies = []
+        statement = select(top.c.kind, top.c.id, top.c.product_id, top.c.rank)
+        for kind in kinds:
+            model, body = SEARCHABLE[kind]
+            joined = model.__table__.alias(kind)
+            statement = statement.outerjoin(
+                joined, and_(top.c.kind == kind, joined.c.id == top.c.id)
+            )
+            titles.append(joined.c.title)
+            bodies.append(joined.c[body])
+
+        title = func.coalesce(*titles) if len(titles) > 1 else titles[0]
+        body = func.coalesce(*bodies) if len(bodies) > 1 else bodies[0]
+        statement = statement.add_columns(
+            title.label("title"),
+            func.ts_headline(SEARCH_CONFIG, body, query, HEADLINE_OPTIONS).label("snippet"),
+        ).order_by(top.c.rank.desc(), top.c.id)
+
+        result = await db.execute(statement)
+        return list(result.all())
+
+
+search_ops = SearchOperations()
@@ -0,0 +1,214 @@
+import base64
+import binascii
+import json
+import uuid as uuid_pkg
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import exists, func, literal_column, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
+
+from app.config import settings
+from app.core.exceptions import GoneError, ValidationError
+from app.models.app_info import AppInfo
+from app.models.document import Document
+from app.models.product import Product
+from app.models.repository import Repository
+from app.models.sync import Tombstone
+from app.models.work_item import WorkItem
+
+# Synced tables, keyed by their field in SyncPage
+SYNCED: Dict[str, Type[SQLModel]] = {
+    "products": Product,
+    "repositories": Repository,
+    "work_items": WorkItem,
+    "documents": Document,
+    "app_info": AppInfo,
+}
+
+# Tombstones deleted per statement by the purge job
+PURGE_BATCH_SIZE = 5000
+
+# Oldest transaction still running; everything below it has committed or aborted
+SNAPSHOT_XMIN = literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+
+@dataclass
+class SyncToken:
+    """
+    Decoded sync position.
+
+    `since` is a transaction-id watermark: every transaction below it had
+    finished when it was taken at `taken_at` (None for a full download). While a sync is paged,
+    `next_since`/`next_taken_at` hold the watermark for the following round
+    and `cursors` the last (change_xid, id) returned per table.
+    """
+
+    since: int = 0
+    taken_at: Optional[datetime] = None
+    next_since: Optional[int] = None
+    next_taken_at: Optional[datetime] = None
+    cursors: Dict[str, Tuple[int, str]] = field(default_factory=dict)
+
+
+def encode_token(token: SyncToken) -> str:
+    """Opaque, URL-safe form of a sync position."""
+    taken_at = token.taken_at.timestamp() if token.taken_at else None
+    raw: Dict[str, Any] = {"x": token.since, "t": taken_at}
+    if token.next_since is not None:
+        raw.update(nx=token.next_since, nt=token.next_taken_at.timestamp(), c=token.cursors)
+    encoded = json.dumps(raw, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(encoded).decode().rstrip("=")
+
+
+def decode_token(value: str) -> SyncToken:
+    """Inverse of encode_token; raises ValidationError on malformed input."""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+        token = SyncToken(since=int(raw["x"]))
+        if raw["t"] is not None:
+            token.taken_at = datetime.fromtimestamp(raw["t"], tz=timezone.utc)
+        if "nx" in raw:
+            token.next_since = int(raw["nx"])
+            token.next_taken_at = datetime.fromtimestamp(raw["nt"], tz=timezone.utc)
+            token.cursors = {
+                name: (int(xid), str(uuid_pkg.UUID(id))) for name, (xid, id) in raw["c"].items()
+            }
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as exc:
+        raise ValidationError("Invalid sync token") from exc
+    return token
+
+
+class SyncOperations:
+    """
+    Delta sync of everything a user owns, with deletions as tombstones.
+
+    Rows carry the 64-bit id of the transaction that last wrote them
+    (change_xid). A token holds the snapshot xmin taken when the previous
+    round started, and a round returns every row and tombstone written by a
+    transaction at or above it. Transactions that were still running then
+    are therefore picked up once they commit. The price is that a row can
+    be sent twice, so clients apply changes as upserts.
+
+    A soft-deleted product gets its tombstone from a trigger as soon as
+    `deleted_at` is set, and neither it nor its children are sent as live
+    rows again; the children's tombstones follow when the purge removes them.
+    """
+
+    async def changes(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        since: Optional[str] = None,
+        limit: int = 500,
+    ) -> Dict[str, Any]:
+        """
+        One page of changes since `since` (everything when None).
+
+        Each table contributes at most `limit` rows. `has_more` means the
+        round is not finished and the returned token continues it.
+        """
+        token = decode_token(since) if since else SyncToken()
+        if token.taken_at is not None:
+            horizon = datetime.now(timezone.utc) - timedelta(
+                days=settings.sync_tombstone_retention_days
+            )
+            if token.taken_at < horizon:
+                raise GoneError("Sync token expired; sync again without `since`")
+
+        if token.next_since is None:
+            # Taken before reading any rows, so nothing written later is skipped
+            watermark = await db.scalar(select(SNAPSHOT_XMIN))
+            token.next_since = int(watermark)
+            token.next_taken_at = datetime.now(timezone.utc)
+
+        page: Dict[str, Any] = {}
+        has_more = False
+        for name, model in SYNCED.items():
+            rows = await self._changed(db, token, name, model, model.id, user_id, limit)
+            page[name] = rows
+            has_more |= len(rows) == limit
+
+        tombstones = await self._changed(
+            db, token, "deleted", Tombstone, Tombstone.entity_id, user_id, limit
+        )
+        page["deleted"] = [
+            {
+                "entity": tombstone.entity,
+                "id": tombstone.entity_id,
+                "product_id": tombstone.product_id,
+                "deleted_at": tombstone.deleted_at,
+            }
+            for tombstone in tombstones
+        ]
+        has_more |= len(tombstones) == limit
+
+        if has_more:
+            next_token = token
+        else:
+            next_token = SyncToken(since=token.next_since, taken_at=token.next_taken_at)
+        return {"token": encode_token(next_token), "has_more": has_more, **page}
+
+    async def _changed(
+        self,
+        db: AsyncSession,
+        token: SyncToken,
+        name: str,
+        model: Type[SQLModel],
+        id: Any,
+        user_id: uuid_pkg.UUID,
+        limit: int,
+    ) -> List[Any]:
+        """Next `limit` rows of one table in (change_xid, id) order; advances its cursor."""
+        xid = model.__table__.c.change_xid
+        cursor = token.cursors.get(name)
+        if cursor:
+            position = tuple_(xid, id) > tuple_(cursor[0], uuid_pkg.UUID(cursor[1]))
+        else:
+            position = xid >= token.since
+        statement = (
+            select(model, xid, id.label("cursor_id"))
+            .where(model.user_id == user_id, position, *_live(model))
+            .order_by(xid, id)
+            .limit(limit)
+        )
+        result = await db.execute(statement)
+        rows = result.all()
+        if rows:
+            token.cursors[name] = (rows[-1].change_xid, str(rows[-1].cursor_id))
+        return [row[0] for row in rows]
+
+    async def purge_tombstones(self, db: AsyncSession) -> int:
+        """Delete tombstones past the retention period in batches; returns the count."""
+        cutoff = func.now() - timedelta(days=settings.sync_tombstone_retention_days)
+        purged = 0
+        while True:
+            expired = (
+                select(Tombstone.entity, Tombstone.entity_id)
+                .where(Tombstone.deleted_at < cutoff)
+                .limit(PURGE_BATCH_SIZE)
+            )
+            statement = Tombstone.__table__.delete().where(
+                tuple_(Tombstone.entity, Tombstone.entity_id).in_(expired)
+            )
+            result = await db.execute(statement)
+            # Commit per batch so locks and WAL stay small
+            await db.commit()
+            purged += result.rowcount
+            if result.rowcount < PURGE_BATCH_SIZE:
+                return purged
+
+
+def _live(model: Type[SQLModel]) -> List[Any]:
+    """Criteria leaving out soft-deleted products and their children, already tombstoned."""
+    if model is Product:
+        return [Product.deleted_at.is_(None)]
+    if model is Tombstone:
+        return []
+    deleted = exists().where(Product.id == model.product_id, Product.deleted_at.is_not(None))
+    return [~deleted]
+
+
+sync_ops = SyncOperations()
@@ -1,19 +1,46 @@
 import uuid as uuid_pkg
-from typing import List, Optional
+from collections import Counter
+from typing import List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Row,
+    any_,
+    bindparam,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import Uuid
 
-from app.domain.base_operations import BaseOperations
+from app.core.exceptions import NotFoundError, ValidationError
+from app.core.result_cache import result_cache
+from app.domain.base_operations import BaseOperations, cached
+from app.domain.counter_operations import counter_ops, merge
+from app.domain.product_operations import product_ops
+from app.domain.quickfind_operations import quickfind_ops
+from app.domain.repository_operations import repository_ops
 from app.models.work_item import WorkItem
 
+# Columns a bulk update may change
+UPDATABLE = ("title", "description", "type", "status", "priority")
+
 
 class WorkItemOperations(BaseOperations[WorkItem]):
     """CRUD operations for WorkItem model."""
 
+    deferred_fields = ("description",)
+
     def __init__(self):
         super().__init__(WorkItem)
 
+    @cached()
     async def get_by_product(
         self,
         db: AsyncSession,
@@ -21,28 +48,189 @@ class WorkItemOperations(BaseOperations[WorkItem]):
         product_id: uuid_pkg.UUID,
         status: Optional[str] = None,
         type: Optional[str] = None,
+        cursor: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[WorkItem]:
+        fields: Optional[Sequence[str]] = None,
+        include: Sequence[str] = (),
+    ) -> List[Row]:
         """Get work items for a product with optional filtering."""
-        statement = select(WorkItem).where(
-            WorkItem.user_id == user_id,
-            WorkItem.product_id == product_id,
+        statement = select(*self._list_columns(fields, include)).where(
+            *self.product_criteria(user_id, product_id, status=status, type=type)
         )
 
-        if status:
-            statement = statement.where(WorkItem.status == status)
-        if type:
-            statement = statement.where(WorkItem.type == type)
+        statement = self._paginate(statement, cursor=cursor, skip=skip, limit=limit)
+
+        result = await db.execute(statement)
+        return list(result.all())
+
+    async def bulk_create(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        items: List[dict],
+    ) -> List[WorkItem]:
+        """
+        Create many work items in one multi-row INSERT ... RETURNING.
+
+        Every referenced product and repository must belong to the user;
+        otherwise nothing is inserted.
+        """
+        if not items:
+            return []
+        await product_ops.require_owned(db, user_id, (item["product_id"] for item in items))
+        await repository_ops.require_owned(
+            db, user_id, (item["repository_id"] for item in items if item.get("repository_id"))
+        )
+
+        columns = ("product_id", "repository_id", *UPDATABLE)
+        rows = [
+            {"user_id": user_id, **{name: item.get(name) for name in columns}}
+            for item in items
+        ]
+        result = await db.scalars(insert(WorkItem).values(rows).returning(WorkItem))
+        created = list(result.all())
+
+        await counter_ops.apply(
+            db, user_id, merge(counter_ops.deltas(WorkItem, item, 1) for item in created)
+        )
+        result_cache.invalidate(db, user_id, WorkItem)
+        quickfind_ops.invalidate(db, user_id)
+        return created
+
+    async def bulk_update(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        updates: List[dict],
+    ) -> List[WorkItem]:
+        """
+        Apply per-row changes in one UPDATE ... FROM (VALUES ...) RETURNING.
+
+        Null fields leave the column unchanged, as in `update`. The table is
+        joined to itself so the pre-update status and type come back with the
+        new row for counter maintenance. Raises NotFoundError, changing
+        nothing, if any id is missing or owned by someone else.
+        """
+        if not updates:
+            return []
+        ids = [entry["id"] for entry in updates]
+        if len(set(ids)) != len(ids):
+            raise ValidationError("Duplicate work item ids in bulk update")
+
+        table = WorkItem.__table__
+        changes = values(
+            column("id", Uuid()),
+            *(column(name, table.c[name].type) for name in UPDATABLE),
+            name="changes",
+        ).data([(entry["id"], *(entry.get(name) for name in UPDATABLE)) for entry in updates])
+        old = table.alias("old")
 
         statement = (
-            statement.order_by(WorkItem.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+            update(WorkItem)
+            .where(
+                WorkItem.id == changes.c.id,
+                WorkItem.user_id == user_id,
+                old.c.id == WorkItem.id,
+            )
+            .values(
+                updated_at=func.now(),
+                # A column that is NULL on every row comes out of VALUES as text
+                **{
+                    name: func.coalesce(
+                        cast(changes.c[name], table.c[name].type), getattr(WorkItem, name)
+                    )
+                    for name in UPDATABLE
+                },
+            )
+            .returning(WorkItem, old.c.status.label("old_status"), old.c.type.label("old_type"))
+            .execution_options(synchronize_session=False)
         )
+        result = await db.execute(statement)
+        rows = result.all()
+
+        missing = set(ids) - {row[0].id for row in rows}
+        if missing:
+            raise NotFoundError(f"Work item {', '.join(sorted(map(str, missing)))}")
 
+        deltas = []
+        for item, old_status, old_type in rows:
+            before = {"product_id": item.product_id, "status": old_status, "type": old_type}
+            deltas.append(counter_ops.deltas(WorkItem, before, -1))
+            deltas.append(counter_ops.deltas(WorkItem, item, 1))
+        await counter_ops.apply(db, user_id, merge(deltas))
+        result_cache.invalidate(db, user_id, WorkItem)
+        quickfind_ops.invalidate(db, user_id)
+        return [row[0] for row in rows]
+
+    async def bulk_delete(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        ids: List[uuid_pkg.UUID],
+    ) -> int:
+        """
+        Delete many work items in one DELETE ... WHERE id = ANY(:ids).
+
+        Raises NotFoundError, deleting nothing, if any id is missing or owned
+        by someone else.
+        """
+        if not ids:
+            return 0
+        wanted = set(ids)
+        statement = (
+            delete(WorkItem)
+            .where(
+                WorkItem.id == any_(bindparam("ids", list(wanted), type_=ARRAY(Uuid()))),
+                WorkItem.user_id == user_id,
+            )
+            .returning(WorkItem.id, WorkItem.product_id, WorkItem.status, WorkItem.type)
+        )
         result = await db.execute(statement)
-        return list(result.scalars().all())
+        rows = result.all()
+
+        missing = wanted - {row.id for row in rows}
+        if missing:
+            raise NotFoundError(f"Work item {', '.join(sorted(map(str, missing)))}")
+
+        await counter_ops.apply(
+            db, user_id, merge(counter_ops.deltas(WorkItem, row, -1) for row in rows)
+        )
+        result_cache.invalidate(db, user_id, WorkItem)
+        quickfind_ops.invalidate(db, user_id)
+        return len(rows)
+
+    async def move_status(
+        self,
+        db: AsyncSession,
+        user_id: uuid_pkg.UUID,
+        product_id: uuid_pkg.UUID,
+        from_status: str,
+        to_status: str,
+    ) -> int:
+        """
+        Move every work item in a product from one status to another; returns the count.
+
+        Raises NotFoundError if the product is not the user's or is deleted.
+        """
+        await product_ops.require_owned(db, user_id, [product_id])
+        if from_status == to_status:
+            return 0
+        statement = update(WorkItem).where(
+            WorkItem.user_id == user_id,
+            WorkItem.product_id == product_id,
+            WorkItem.status == from_status,
+        ).values(status=to_status, updated_at=func.now())
+        result = await db.execute(statement.execution_options(synchronize_session=False))
+        moved = result.rowcount
+        if moved:
+            result_cache.invalidate(db, user_id, WorkItem)
+
+        deltas: Counter = Counter()
+        deltas[(product_id, WorkItem.__tablename__, "status", from_status)] -= moved
+        deltas[(product_id, WorkItem.__tablename__, "status", to_status)] += moved
+        await counter_ops.apply(db, user_id, deltas)
+        return moved
 
 
 work_item_ops = WorkItemOperations()
@@ -1,11 +1,19 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.api.router import api_router
 from app.config import settings
-from app.core.database import init_db
+from app.core.change_feed import change_feed
+from app.core.database import engine, init_db, replica_router
+from app.core.github import github_client
+from app.core.jobs import run_periodically
+from app.core.principal_cache import principal_cache
+from app.core.result_cache import result_cache
+from app.domain import github_ops, product_ops, revision_ops, sync_ops
 
 
 @asynccontextmanager
@@ -14,8 +22,45 @@ async def lifespan(app: FastAPI):
     # Startup
     if settings.debug:
         await init_db()
+
+    health_task = None
+    if replica_router.replicas:
+        await replica_router.check_health()
+        health_task = asyncio.create_task(
+            replica_router.run_health_checks(settings.replica_health_check_interval)
+        )
+
+    feed_task = asyncio.create_task(change_feed.run())
+    purge_task = asyncio.create_task(
+        run_periodically(sync_ops.purge_tombstones, settings.sync_purge_interval_seconds)
+    )
+    sweep_task = asyncio.create_task(
+        run_periodically(product_ops.purge_deleted, settings.product_purge_interval_seconds)
+    )
+    compact_task = asyncio.create_task(
+        run_periodically(revision_ops.compact, settings.document_revision_compact_interval_seconds)
+    )
+    refresh_task = None
+    if settings.github_token:
+        refresh_task = asyncio.create_task(
+            run_periodically(github_ops.refresh, settings.github_refresh_interval_seconds)
+        )
+
     yield
-    # Shutdown (cleanup if needed)
+
+    # Shutdown
+    feed_task.cancel()
+    purge_task.cancel()
+    sweep_task.cancel()
+    compact_task.cancel()
+    if health_task:
+        health_task.cancel()
+    if refresh_task:
+        refresh_task.cancel()
+    await result_cache.close()
+    await github_client.close()
+    await replica_router.dispose()
+    await engine.dispose()
 
 
 app = FastAPI(
@@ -32,6 +77,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include API routes
@@ -42,3 +88,9 @@ app.include_router(api_router)
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/health/cache")
+async def cache_stats():
+    """Result and principal cache hit rates and counters for this worker."""
+    return {"results": result_cache.stats(), "principals": principal_cache.stats()}
@@ -3,7 +3,11 @@ from app.models.product import Product
 from app.models.repository import Repository
 from app.models.work_item import WorkItem
 from app.models.document import Document
+from app.models.document_revision import DocumentRevision
 from app.models.app_info import AppInfo
+from app.models.product_counter import ProductCounter
+from app.models.sync import Tombstone
+from app.models.github import GitHubSyncState
 
 __all__ = [
     "User",
@@ -11,5 +15,9 @@ __all__ = [
     "Repository",
     "WorkItem",
     "Document",
+    "DocumentRevision",
     "AppInfo",
+    "ProductCounter",
+    "Tombstone",
+    "GitHubSyncState",
 ]
@@ -1,9 +1,14 @@
 import uuid as uuid_pkg
+from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
+from pydantic import field_serializer
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
-from app.models.base import TimestampMixin, UUIDMixin, UserOwnedMixin
+from app.models.base import TimestampMixin, UserOwnedMixin, UUIDMixin, add_change_tracking
+
+SECRET_MASK = "********"
 
 if TYPE_CHECKING:
     from app.models.product import Product
@@ -12,7 +17,7 @@ if TYPE_CHECKING:
 class AppInfoBase(SQLModel):
     """Base fields for AppInfo key-value store."""
 
-    key: Optional[str] = Field(default=None, max_length=255, index=True)
+    key: Optional[str] = Field(default=None, max_length=255)
     value: Optional[str] = Field(default=None)
     category: Optional[str] = Field(default=None, max_length=50)  # e.g. env_var, url, credential, note
     is_secret: Optional[bool] = Field(default=False)
@@ -23,12 +28,54 @@ class AppInfo(AppInfoBase, UUIDMixin, TimestampMixin, UserOwnedMixin, table=True
     """Key-value store for project context (env vars, URLs, notes)."""
 
     __tablename__ = "app_info"
+    __table_args__ = (
+        Index("ix_app_info_user_product_created", "user_id", "product_id", "created_at", "id"),
+        Index(
+            "ix_app_info_user_product_category_created",
+            "user_id", "product_id", "category", "created_at", "id",
+        ),
+        # One value per key within a product; also serves get_by_key and upserts
+        UniqueConstraint("product_id", "key", name="uq_app_info_product_key"),
+    )
 
     product_id: Optional[uuid_pkg.UUID] = Field(
         default=None,
         foreign_key="products.id",
+        ondelete="CASCADE",
         index=True,
     )
 
     # Relationships
     product: Optional["Product"] = Relationship(back_populates="app_info_entries")
+
+
+add_change_tracking(AppInfo)
+
+
+class AppInfoRead(AppInfoBase):
+    """App info entry as returned by the API; secret values are masked."""
+
+    id: uuid_pkg.UUID
+    product_id: Optional[uuid_pkg.UUID] = None
+    created_at: datetime
+    updated_at: datetime
+
+    @field_serializer("value")
+    def mask_secret(self, value: Optional[str]) -> Optional[str]:
+        return SECRET_MASK if self.is_secret else value
+
+
+class AppInfoKey(SQLModel):
+    """An app info entry without its value, as listed on the product workspace."""
+
+    id: uuid_pkg.UUID
+    key: Optional[str] = None
+    category: Optional[str] = None
+    is_secret: Optional[bool] = False
+
+
+class AppInfoImportResult(SQLModel):
+    """Outcome of a streamed app info import."""
+
+    created: int = 0
+    updated: int = 0
@@ -1,9 +1,18 @@
 import uuid as uuid_pkg
 from datetime import datetime
+from typing import Dict, Type
 
-from sqlalchemy import text
+from sqlalchemy import BigInteger, Column, Computed, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import Field, SQLModel
 
+# Text search configuration baked into the generated search_vector columns
+SEARCH_CONFIG = "english"
+
+# Characters of each column indexed for search; keeps a tsvector under its 1 MB
+# limit, and tsvector positions stop at 16,383 words anyway
+SEARCH_MAX_CHARS = 100_000
+
 
 class UUIDMixin(SQLModel):
     """Mixin providing UUID primary key."""
@@ -11,7 +20,6 @@ class UUIDMixin(SQLModel):
     id: uuid_pkg.UUID = Field(
         default_factory=uuid_pkg.uuid4,
         primary_key=True,
-        index=True,
         nullable=False,
         sa_column_kwargs={"server_default": text("gen_random_uuid()")},
     )
@@ -33,10 +41,55 @@ class TimestampMixin(SQLModel):
 
 
 class UserOwnedMixin(SQLModel):
-    """Mixin for entities owned by a user (RLS preparation)."""
+    """
+    Mixin for entities owned by a user (RLS preparation).
+
+    user_id is deliberately not indexed on its own: every owned table declares
+    composite indexes that lead with it.
+    """
 
     user_id: uuid_pkg.UUID = Field(
         foreign_key="users.id",
         nullable=False,
-        index=True,
     )
+
+
+def search_vector_expression(weights: Dict[str, str]) -> str:
+    """SQL for a weighted tsvector over the first SEARCH_MAX_CHARS of each {column: weight}."""
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+        f"left(coalesce({column}, ''), {SEARCH_MAX_CHARS})), '{weight}')"
+        for column, weight in weights.items()
+    )
+
+
+def add_search_vector(model: Type[SQLModel], weights: Dict[str, str]) -> None:
+    """
+    Attach a generated `search_vector` tsvector column and its GIN index.
+
+    The column lives on the table only, not on the ORM class, so it is never
+    loaded with the row or written by an INSERT/UPDATE; Postgres keeps it in
+    sync with the source columns. Query it through `model.__table__.c`.
+    """
+    table = model.__table__
+    column = Column(
+        "search_vector",
+        TSVECTOR,
+        Computed(search_vector_expression(weights), persisted=True),
+    )
+    table.append_column(column)
+    Index(f"ix_{table.name}_search_vector", column, postgresql_using="gin")
+
+
+def add_change_tracking(model: Type[SQLModel]) -> None:
+    """
+    Attach a `change_xid` column, indexed per user, for delta sync.
+
+    A trigger stamps it with the 64-bit id of the transaction that last
+    inserted or updated the row (see the delta_sync migration). Like
+    search_vector it is table-only and never written by the application.
+    """
+    table = model.__table__
+    column = Column("change_xid", BigInteger, nullable=False, server_default=text("0"))
+    table.append_column(column)
+    Index(f"ix_{table.name}_user_change", table.c.user_id, column, table.c.id)
@@ -0,0 +1,36 @@
+from typing import Any, Dict, List, Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class BatchItem(SQLModel):
+    """One API call inside a batch."""
+
+    id: Optional[str] = None  # echoed back to match results to calls
+    method: str = "GET"
+    url: str  # path under /api, with any query string
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None  # sent as JSON
+
+
+class BatchRequest(SQLModel):
+    """Calls to run in one round trip."""
+
+    requests: List[BatchItem] = Field(min_length=1)
+    atomic: bool = False  # writes all commit together or not at all
+
+
+class BatchItemResult(SQLModel):
+    """Outcome of one call, as the route would have answered it."""
+
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None  # parsed JSON, or text for other content types
+
+
+class BatchResponse(SQLModel):
+    """Results in request order."""
+
+    committed: bool  # False when an atomic batch was rolled back
+    responses: List[BatchItemResult]
@@ -1,9 +1,17 @@
 import uuid as uuid_pkg
+from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Column, Index, LargeBinary, text
 from sqlmodel import Field, Relationship, SQLModel
 
-from app.models.base import TimestampMixin, UUIDMixin, UserOwnedMixin
+from app.models.base import (
+    TimestampMixin,
+    UUIDMixin,
+    UserOwnedMixin,
+    add_change_tracking,
+    add_search_vector,
+)
 
 if TYPE_CHECKING:
     from app.models.product import Product
@@ -12,7 +20,7 @@ if TYPE_CHECKING:
 class DocumentBase(SQLModel):
     """Base fields for Document."""
 
-    title: Optional[str] = Field(default=None, max_length=500, index=True)
+    title: Optional[str] = Field(default=None, max_length=500)
     content: Optional[str] = Field(default=None)
     type: Optional[str] = Field(default=None, max_length=50)  # e.g. blueprint, architecture, note, plan
     is_pinned: Optional[bool] = Field(default=False)
@@ -22,10 +30,30 @@ class Document(DocumentBase, UUIDMixin, TimestampMixin, UserOwnedMixin, table=Tr
     """Documentation entry within a Product."""
 
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_user_product_created", "user_id", "product_id", "created_at", "id"),
+        Index(
+            "ix_documents_user_product_type_created",
+            "user_id", "product_id", "type", "created_at", "id",
+        ),
+        # Pinned documents for the product workspace
+        Index(
+            "ix_documents_pinned",
+            "user_id", "product_id", "updated_at", "id",
+            postgresql_where=text("is_pinned"),
+        ),
+        Index(
+            "ix_documents_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     product_id: Optional[uuid_pkg.UUID] = Field(
         default=None,
         foreign_key="products.id",
+        ondelete="CASCADE",
         index=True,
     )
 
@@ -37,3 +65,31 @@ class Document(DocumentBase, UUIDMixin, TimestampMixin, UserOwnedMixin, table=Tr
 
     # Relationships
     product: Optional["Product"] = Relationship(back_populates="documents")
+
+
+# Full-text search: title matches outrank body matches
+add_search_vector(Document, {"title": "A", "content": "B"})
+add_change_tracking(Document)
+
+# Gzip copy of large bodies, streamed as-is to clients that accept gzip.
+# Table-only like search_vector; written by document_ops with the content.
+Document.__table__.append_column(Column("content_gzip", LargeBinary, nullable=True))
+
+
+class DocumentRead(DocumentBase):
+    """Document as returned by the API."""
+
+    id: uuid_pkg.UUID
+    product_id: Optional[uuid_pkg.UUID] = None
+    repository_id: Optional[uuid_pkg.UUID] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class DocumentTitle(SQLModel):
+    """A document without its body, as listed on the product workspace."""
+
+    id: uuid_pkg.UUID
+    title: Optional[str] = None
+    type: Optional[str] = None
+    updated_at: datetime
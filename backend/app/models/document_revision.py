@@ -0,0 +1,68 @@
+import uuid as uuid_pkg
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, Index, LargeBinary, text
+from sqlmodel import Field, SQLModel
+
+from app.models.base import UserOwnedMixin, UUIDMixin
+
+
+class DocumentRevision(UUIDMixin, UserOwnedMixin, table=True):
+    """
+    One saved version of a document's title and content.
+
+    Every `snapshot_interval`-th revision stores the full text (zlib);
+    the ones in between store a compressed line diff against the revision
+    before them. Rebuilding any version therefore reads one snapshot and
+    at most `snapshot_interval - 1` diffs.
+    """
+
+    __tablename__ = "document_revisions"
+    __table_args__ = (
+        Index("uq_document_revisions_document_number", "document_id", "number", unique=True),
+        # Snapshots are where the compaction job may cut history
+        Index(
+            "ix_document_revisions_snapshots",
+            "document_id",
+            "created_at",
+            postgresql_where=text("number = snapshot_number"),
+        ),
+    )
+
+    document_id: uuid_pkg.UUID = Field(
+        foreign_key="documents.id",
+        ondelete="CASCADE",
+        nullable=False,
+    )
+    number: int = Field(nullable=False)  # 1, 2, ... per document
+    snapshot_number: int = Field(nullable=False)  # revision holding the full text to start from
+    title: Optional[str] = Field(default=None, max_length=500)
+    size: Optional[int] = Field(default=None)  # characters of content; None when it had none
+    payload: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        nullable=False,
+        sa_column_kwargs={"server_default": text("now()")},
+    )
+
+
+class DocumentRevisionRead(SQLModel):
+    """Revision metadata as listed by the API."""
+
+    number: int
+    is_snapshot: bool
+    title: Optional[str] = None
+    size: Optional[int] = None
+    stored_bytes: int  # compressed bytes kept for this revision
+    created_at: datetime
+
+
+class DocumentVersion(SQLModel):
+    """A document as it was at one revision."""
+
+    document_id: uuid_pkg.UUID
+    number: int
+    title: Optional[str] = None
+    content: Optional[str] = None
+    created_at: datetime
@@ -0,0 +1,50 @@
+import uuid as uuid_pkg
+from datetime import datetime
+from typing import List, Optional
+
+from sqlmodel import Field, SQLModel
+
+from app.models.repository import RepositoryBase, RepositoryRead
+
+
+class GitHubRepository(RepositoryBase):
+    """A repository the GitHub token can see."""
+
+    github_id: int
+    product_id: Optional[uuid_pkg.UUID] = None  # set once imported
+
+
+class GitHubImportRequest(SQLModel):
+    """GitHub repositories to import under a product."""
+
+    product_id: uuid_pkg.UUID
+    github_ids: List[int] = Field(min_length=1)
+
+
+class GitHubImportResult(SQLModel):
+    """Repositories as stored after the import."""
+
+    created: int
+    updated: int  # already imported; metadata refreshed, moved to the product
+    missing: List[int]  # ids the token cannot see
+    repositories: List[RepositoryRead]
+
+
+class GitHubSyncState(SQLModel, table=True):
+    """
+    When the refresher last checked an imported repository against GitHub.
+
+    Kept out of `repositories` on purpose: every UPDATE there stamps
+    change_xid and publishes a change event, and most checks change nothing.
+    No row yet means never checked.
+    """
+
+    __tablename__ = "github_sync_state"
+
+    repository_id: uuid_pkg.UUID = Field(
+        foreign_key="repositories.id",
+        ondelete="CASCADE",
+        primary_key=True,
+    )
+    etag: Optional[str] = Field(default=None, max_length=200)  # of GET /repositories/{id}
+    checked_at: datetime = Field(nullable=False, index=True)
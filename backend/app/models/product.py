@@ -1,8 +1,16 @@
-from typing import TYPE_CHECKING, List, Optional
+import uuid as uuid_pkg
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
-from app.models.base import TimestampMixin, UUIDMixin, UserOwnedMixin
+from app.models.base import TimestampMixin, UUIDMixin, UserOwnedMixin, add_change_tracking
+
+from app.models.app_info import AppInfoKey, AppInfoRead
+from app.models.document import DocumentRead, DocumentTitle
+from app.models.repository import RepositoryRead
+from app.models.work_item import WorkItemRead
 
 if TYPE_CHECKING:
     from app.models.app_info import AppInfo
@@ -15,7 +23,7 @@ if TYPE_CHECKING:
 class ProductBase(SQLModel):
     """Base fields shared across Product schemas."""
 
-    name: Optional[str] = Field(default=None, max_length=255, index=True)
+    name: Optional[str] = Field(default=None, max_length=255)
     description: Optional[str] = Field(default=None, max_length=2000)
     icon: Optional[str] = Field(default=None, max_length=100)
     color: Optional[str] = Field(default=None, max_length=50)
@@ -25,22 +33,82 @@ class Product(ProductBase, UUIDMixin, TimestampMixin, UserOwnedMixin, table=True
     """Product/App container - main organizing entity."""
 
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_user_created", "user_id", "created_at", "id"),
+        Index("ix_products_user_name", "user_id", "name"),
+        # Products waiting for the purge sweeper
+        Index("ix_products_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+        Index(
+            "ix_products_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
+    # Set by a delete; the purge job removes the row and its children later
+    deleted_at: Optional[datetime] = Field(default=None)
 
-    # Relationships
+    # Relationships: children go with the product through ON DELETE CASCADE
     user: Optional["User"] = Relationship(back_populates="products")
     repositories: List["Repository"] = Relationship(
         back_populates="product",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan"},
+        sa_relationship_kwargs={"cascade": "all, delete-orphan", "passive_deletes": True},
     )
     work_items: List["WorkItem"] = Relationship(
         back_populates="product",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan"},
+        sa_relationship_kwargs={"cascade": "all, delete-orphan", "passive_deletes": True},
     )
     documents: List["Document"] = Relationship(
         back_populates="product",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan"},
+        sa_relationship_kwargs={"cascade": "all, delete-orphan", "passive_deletes": True},
     )
     app_info_entries: List["AppInfo"] = Relationship(
         back_populates="product",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan"},
+        sa_relationship_kwargs={"cascade": "all, delete-orphan", "passive_deletes": True},
     )
+
+
+add_change_tracking(Product)
+
+
+class ProductRead(ProductBase):
+    """Product as returned by the API."""
+
+    id: uuid_pkg.UUID
+    created_at: datetime
+    updated_at: datetime
+
+
+class ProductDetail(ProductRead):
+    """Product detail with child counts and optionally embedded children."""
+
+    repositories_count: int = 0
+    work_items_count: int = 0
+    documents_count: int = 0
+    app_info_count: int = 0
+
+    repositories: Optional[List[RepositoryRead]] = None
+    work_items: Optional[List[WorkItemRead]] = None
+    documents: Optional[List[DocumentRead]] = None
+    app_info: Optional[List[AppInfoRead]] = None
+
+
+class ProductWorkspace(SQLModel):
+    """Everything the product page shows, built by the database in one statement."""
+
+    product: ProductRead
+    repositories: List[RepositoryRead]
+    open_work_items: Dict[str, List[WorkItemRead]]  # by status, "" for none; no descriptions
+    pinned_documents: List[DocumentTitle]
+    app_info_keys: List[AppInfoKey]
+
+
+class ProductSummary(SQLModel):
+    """Per-product counter breakdown, e.g. work_items -> {"total": 3, "status": {...}}."""
+
+    product_id: uuid_pkg.UUID
+    repositories: Dict[str, Any]
+    work_items: Dict[str, Any]
+    documents: Dict[str, Any]
+    app_info: Dict[str, Any]
@@ -0,0 +1,27 @@
+import uuid as uuid_pkg
+
+from sqlmodel import Field, SQLModel
+
+
+class ProductCounter(SQLModel, table=True):
+    """
+    Denormalized row counts per product, broken down by dimension.
+
+    One row per (product, entity, dimension, bucket), e.g.
+    (p, "work_items", "status", "done"). Totals use dimension "total" and an
+    empty bucket. Maintained by the domain write paths; rebuilt from scratch
+    by counter_ops.rebuild if it ever drifts.
+    """
+
+    __tablename__ = "product_counters"
+
+    product_id: uuid_pkg.UUID = Field(
+        foreign_key="products.id",
+        ondelete="CASCADE",
+        primary_key=True,
+    )
+    entity: str = Field(max_length=50, primary_key=True)  # child table name
+    dimension: str = Field(max_length=50, primary_key=True)  # "total", "status", "type"
+    bucket: str = Field(default="", max_length=100, primary_key=True)
+    user_id: uuid_pkg.UUID = Field(foreign_key="users.id", nullable=False, index=True)
+    count: int = Field(default=0, nullable=False)
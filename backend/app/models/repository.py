@@ -1,9 +1,11 @@
 import uuid as uuid_pkg
+from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
-from app.models.base import TimestampMixin, UUIDMixin, UserOwnedMixin
+from app.models.base import TimestampMixin, UUIDMixin, UserOwnedMixin, add_change_tracking
 
 if TYPE_CHECKING:
     from app.models.product import Product
@@ -12,7 +14,7 @@ if TYPE_CHECKING:
 class RepositoryBase(SQLModel):
     """Base fields for Repository."""
 
-    name: Optional[str] = Field(default=None, max_length=255, index=True)
+    name: Optional[str] = Field(default=None, max_length=255)
     full_name: Optional[str] = Field(default=None, max_length=500)
     description: Optional[str] = Field(default=None, max_length=2000)
     url: Optional[str] = Field(default=None, max_length=500)
@@ -21,7 +23,7 @@ class RepositoryBase(SQLModel):
     language: Optional[str] = Field(default=None, max_length=50)
 
     # GitHub metadata (stored at import time)
-    github_id: Optional[int] = Field(default=None, index=True)
+    github_id: Optional[int] = Field(default=None)
     stars_count: Optional[int] = Field(default=None)
     forks_count: Optional[int] = Field(default=None)
 
@@ -30,12 +32,36 @@ class Repository(RepositoryBase, UUIDMixin, TimestampMixin, UserOwnedMixin, tabl
     """Repository linked to a Product."""
 
     __tablename__ = "repositories"
+    __table_args__ = (
+        Index("ix_repositories_user_product_created", "user_id", "product_id", "created_at", "id"),
+        # Import upserts conflict on it: a GitHub repository is imported once per user
+        Index("uq_repositories_user_github_id", "user_id", "github_id", unique=True),
+        Index(
+            "ix_repositories_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+    )
 
     product_id: Optional[uuid_pkg.UUID] = Field(
         default=None,
         foreign_key="products.id",
+        ondelete="CASCADE",
         index=True,
     )
 
     # Relationships
     product: Optional["Product"] = Relationship(back_populates="repositories")
+
+
+add_change_tracking(Repository)
+
+
+class RepositoryRead(RepositoryBase):
+    """Repository as returned by the API."""
+
+    id: uuid_pkg.UUID
+    product_id: Optional[uuid_pkg.UUID] = None
+    created_at: datetime
+    updated_at: datetime
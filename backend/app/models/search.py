@@ -0,0 +1,24 @@
+import uuid as uuid_pkg
+from typing import Optional
+
+from sqlmodel import SQLModel
+
+
+class SearchHit(SQLModel):
+    """One full-text search result."""
+
+    kind: str  # "documents" or "work_items"
+    id: uuid_pkg.UUID
+    product_id: Optional[uuid_pkg.UUID] = None
+    title: Optional[str] = None
+    snippet: Optional[str] = None  # body excerpt with matches wrapped in <mark>
+    rank: float
+
+
+class QuickFindHit(SQLModel):
+    """One type-ahead match for the command bar."""
+
+    kind: str  # "products", "repositories", "work_items" or "documents"
+    id: uuid_pkg.UUID
+    product_id: Optional[uuid_pkg.UUID] = None
+    label: str
@@ -0,0 +1,128 @@
+import uuid as uuid_pkg
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import BigInteger, Column, Index, text
+from sqlmodel import Field, SQLModel
+
+from app.models.app_info import AppInfoRead
+from app.models.document import DocumentRead
+from app.models.product import ProductRead
+from app.models.repository import RepositoryRead
+from app.models.work_item import WorkItemRead
+
+# Tables mirrored by delta sync; products are their own product_id
+SYNCED_TABLES = ("products", "repositories", "work_items", "documents", "app_info")
+
+# Kept in sync with the delta_sync and soft_delete_tombstones migrations; used
+# by init_db in development
+SYNC_TRIGGER_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION forum_stamp_change() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.change_xid := pg_current_xact_id()::text::bigint;
+        RETURN NEW;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION forum_record_tombstones() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_TABLE_NAME = 'products' THEN
+            INSERT INTO tombstones (entity, entity_id, user_id, product_id, change_xid)
+            SELECT TG_TABLE_NAME, id, user_id, id, pg_current_xact_id()::text::bigint
+            FROM deleted_rows
+            ON CONFLICT (entity, entity_id) DO UPDATE
+                SET change_xid = EXCLUDED.change_xid, deleted_at = now();
+        ELSE
+            INSERT INTO tombstones (entity, entity_id, user_id, product_id, change_xid)
+            SELECT TG_TABLE_NAME, id, user_id, product_id, pg_current_xact_id()::text::bigint
+            FROM deleted_rows
+            ON CONFLICT (entity, entity_id) DO UPDATE
+                SET change_xid = EXCLUDED.change_xid, deleted_at = now();
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    *(
+        f"CREATE OR REPLACE TRIGGER {table}_stamp_change "
+        f"BEFORE INSERT OR UPDATE ON {table} "
+        "FOR EACH ROW EXECUTE FUNCTION forum_stamp_change()"
+        for table in SYNCED_TABLES
+    ),
+    """
+    CREATE OR REPLACE FUNCTION forum_tombstone_soft_delete() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO tombstones (entity, entity_id, user_id, product_id, change_xid)
+        VALUES (TG_TABLE_NAME, NEW.id, NEW.user_id, NEW.id, pg_current_xact_id()::text::bigint)
+        ON CONFLICT (entity, entity_id) DO UPDATE
+            SET change_xid = EXCLUDED.change_xid, deleted_at = now();
+        RETURN NULL;
+    END
+    $$
+    """,
+    # A soft-deleted product is gone for clients long before the purge deletes it
+    "CREATE OR REPLACE TRIGGER products_tombstone_soft_delete "
+    "AFTER UPDATE OF deleted_at ON products FOR EACH ROW "
+    "WHEN (OLD.deleted_at IS NULL AND NEW.deleted_at IS NOT NULL) "
+    "EXECUTE FUNCTION forum_tombstone_soft_delete()",
+    *(
+        f"CREATE OR REPLACE TRIGGER {table}_record_tombstones "
+        f"AFTER DELETE ON {table} REFERENCING OLD TABLE AS deleted_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION forum_record_tombstones()"
+        for table in SYNCED_TABLES
+    ),
+]
+
+
+class Tombstone(SQLModel, table=True):
+    """
+    Record of a deleted row, kept for delta sync.
+
+    Written by a trigger on every synced table (see the delta_sync
+    migration), and for products already when they are soft-deleted.
+    Purged once older than the configured retention.
+    """
+
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_user_change", "user_id", "change_xid", "entity_id"),
+        Index("ix_tombstones_deleted_at", "deleted_at"),
+    )
+
+    entity: str = Field(max_length=50, primary_key=True)  # table name
+    entity_id: uuid_pkg.UUID = Field(primary_key=True)
+    user_id: uuid_pkg.UUID = Field(nullable=False)
+    product_id: Optional[uuid_pkg.UUID] = Field(default=None)
+    change_xid: int = Field(sa_column=Column(BigInteger, nullable=False))
+    deleted_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        nullable=False,
+        sa_column_kwargs={"server_default": text("now()")},
+    )
+
+
+class TombstoneRead(SQLModel):
+    """A deletion reported by delta sync."""
+
+    entity: str
+    id: uuid_pkg.UUID
+    product_id: Optional[uuid_pkg.UUID] = None
+    deleted_at: datetime
+
+
+class SyncPage(SQLModel):
+    """Rows changed since a sync token, and the token to pass next time."""
+
+    token: str
+    has_more: bool  # call again with `token` before treating the mirror as current
+    products: List[ProductRead] = []
+    repositories: List[RepositoryRead] = []
+    work_items: List[WorkItemRead] = []
+    documents: List[DocumentRead] = []
+    app_info: List[AppInfoRead] = []
+    deleted: List[TombstoneRead] = []
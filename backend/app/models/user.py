@@ -21,13 +21,14 @@ class User(SQLModel, table=True):
 
     id: uuid_pkg.UUID = Field(
         primary_key=True,
-        index=True,
         nullable=False,
         description="UUID from Supabase auth.users",
     )
     email: Optional[str] = Field(default=None, max_length=255)
     github_username: Optional[str] = Field(default=None, max_length=255, index=True)
     avatar_url: Optional[str] = Field(default=None, max_length=500)
+    # iat of the token the profile columns above were last taken from
+    profile_issued_at: Optional[datetime] = Field(default=None)
     created_at: datetime = Field(
         default_factory=datetime.utcnow,
         nullable=False,
@@ -1,9 +1,17 @@
 import uuid as uuid_pkg
+from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
-from app.models.base import TimestampMixin, UUIDMixin, UserOwnedMixin
+from app.models.base import (
+    TimestampMixin,
+    UUIDMixin,
+    UserOwnedMixin,
+    add_change_tracking,
+    add_search_vector,
+)
 
 if TYPE_CHECKING:
     from app.models.product import Product
@@ -12,10 +20,10 @@ if TYPE_CHECKING:
 class WorkItemBase(SQLModel):
     """Base fields for WorkItem."""
 
-    title: Optional[str] = Field(default=None, max_length=500, index=True)
+    title: Optional[str] = Field(default=None, max_length=500)
     description: Optional[str] = Field(default=None)
     type: Optional[str] = Field(default=None, max_length=50)  # e.g. feature, fix, refactor, investigation
-    status: Optional[str] = Field(default=None, max_length=50, index=True)  # e.g. todo, in_progress, done
+    status: Optional[str] = Field(default=None, max_length=50)  # e.g. todo, in_progress, done
     priority: Optional[int] = Field(default=None)
 
 
@@ -23,10 +31,34 @@ class WorkItem(WorkItemBase, UUIDMixin, TimestampMixin, UserOwnedMixin, table=Tr
     """Work item (task, feature, fix, investigation) within a Product."""
 
     __tablename__ = "work_items"
+    __table_args__ = (
+        Index("ix_work_items_user_product_created", "user_id", "product_id", "created_at", "id"),
+        Index(
+            "ix_work_items_user_product_status_created",
+            "user_id", "product_id", "status", "created_at", "id",
+        ),
+        Index(
+            "ix_work_items_user_product_type_created",
+            "user_id", "product_id", "type", "created_at", "id",
+        ),
+        # Open items only; most of a long-lived product's work items are done
+        Index(
+            "ix_work_items_open",
+            "user_id", "product_id", "created_at", "id",
+            postgresql_where=text("status IS NULL OR status <> 'done'"),
+        ),
+        Index(
+            "ix_work_items_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     product_id: Optional[uuid_pkg.UUID] = Field(
         default=None,
         foreign_key="products.id",
+        ondelete="CASCADE",
         index=True,
     )
 
@@ -38,3 +70,45 @@ class WorkItem(WorkItemBase, UUIDMixin, TimestampMixin, UserOwnedMixin, table=Tr
 
     # Relationships
     product: Optional["Product"] = Relationship(back_populates="work_items")
+
+
+# Full-text search: title matches outrank body matches
+add_search_vector(WorkItem, {"title": "A", "description": "B"})
+add_change_tracking(WorkItem)
+
+
+class WorkItemRead(WorkItemBase):
+    """Work item as returned by the API."""
+
+    id: uuid_pkg.UUID
+    product_id: Optional[uuid_pkg.UUID] = None
+    repository_id: Optional[uuid_pkg.UUID] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class WorkItemCreate(WorkItemBase):
+    """One work item in a bulk create request."""
+
+    product_id: uuid_pkg.UUID
+    repository_id: Optional[uuid_pkg.UUID] = None
+
+
+class WorkItemUpdate(WorkItemBase):
+    """One work item in a bulk update request; omitted or null fields are left unchanged."""
+
+    id: uuid_pkg.UUID
+
+
+class WorkItemStatusMove(SQLModel):
+    """Move every work item in a product from one status to another."""
+
+    product_id: uuid_pkg.UUID
+    from_status: str = Field(max_length=50)
+    to_status: str = Field(max_length=50)
+
+
+class BulkResult(SQLModel):
+    """Number of rows touched by a bulk write."""
+
+    count: int
@@ -0,0 +1,89 @@
+"""
+Document revision micro-benchmark: storage per edit and rebuild latency.
+
+Simulates a large architecture document (about 2,000 lines) saved
+`EDITS` times with a few lines changed per save. Compares the bytes kept
+per save by a full copy, a zlib-compressed copy, and the snapshot + diff
+scheme used by revision_ops, then times rebuilding the worst-placed
+revision (a full chain of diffs after its snapshot) as the endpoint does.
+
+Usage: python -m benchmarks.document_revisions  (from backend/)
+"""
+import random
+import timeit
+import zlib
+from typing import List, Tuple
+
+from app.config import settings
+from app.domain.revision_operations import diff, patch, snapshot
+
+LINES = 2_000
+EDITS = 200
+RUNS = 20
+
+
+def make_versions() -> List[str]:
+    rng = random.Random(42)
+    lines = [f"{i:04d} The API talks to the queue over gRPC with retries.\n" for i in range(LINES)]
+    versions = ["".join(lines)]
+    for edit in range(EDITS):
+        for _ in range(rng.randint(1, 5)):
+            lines[rng.randrange(len(lines))] = f"Edited in revision {edit}: {rng.random()}\n"
+        if rng.random() < 0.3:
+            lines.insert(rng.randrange(len(lines)), f"Added in revision {edit}.\n")
+        versions.append("".join(lines))
+    return versions
+
+
+def store(versions: List[str], interval: int) -> List[Tuple[bool, bytes]]:
+    """(is_snapshot, payload) per version, following revision_ops.record."""
+    stored: List[Tuple[bool, bytes]] = []
+    snapshot_number = 0
+    for number, text in enumerate(versions):
+        full = snapshot(text)
+        if number == 0:
+            stored.append((True, full))
+            continue
+        payload = diff(versions[number - 1], text)
+        if number - snapshot_number >= interval or len(full) <= len(payload):
+            snapshot_number = number
+            stored.append((True, full))
+        else:
+            stored.append((False, payload))
+    return stored
+
+
+def rebuild(stored: List[Tuple[bool, bytes]], number: int) -> str:
+    start = max(i for i in range(number + 1) if stored[i][0])
+    text = zlib.decompress(stored[start][1]).decode()
+    for _, payload in stored[start + 1 : number + 1]:
+        text = patch(text, payload)
+    return text
+
+
+def main() -> None:
+    versions = make_versions()
+    interval = settings.document_revision_snapshot_interval
+    raw = sum(len(text.encode()) for text in versions) / len(versions)
+    compressed = sum(len(snapshot(text)) for text in versions) / len(versions)
+
+    started = timeit.default_timer()
+    stored = store(versions, interval)
+    record_ms = (timeit.default_timer() - started) * 1000 / len(versions)
+    revisioned = sum(len(payload) for _, payload in stored) / len(stored)
+
+    print(f"{'full copy':<22} {raw:10,.0f} bytes/save")
+    print(f"{'zlib copy':<22} {compressed:10,.0f} bytes/save")
+    label = f"snapshot every {interval}"
+    print(f"{label:<22} {revisioned:10,.0f} bytes/save  ({record_ms:.2f} ms to record)")
+
+    # Last revision before a snapshot: the longest chain of diffs to apply
+    worst = max(i for i, (is_snapshot, _) in enumerate(stored) if not is_snapshot)
+    assert rebuild(stored, worst) == versions[worst]
+    best = min(timeit.repeat(lambda: rebuild(stored, worst), number=1, repeat=RUNS))
+    chain = worst - max(i for i in range(worst + 1) if stored[i][0])
+    print(f"{'rebuild':<22} {best * 1000:10.2f} ms  ({chain} diffs after the snapshot)")
+
+
+if __name__ == "__main__":
+    main()
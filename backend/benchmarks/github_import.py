@@ -0,0 +1,94 @@
+"""
+GitHub listing benchmark against an in-process stub of the GitHub API.
+
+Serves `REPOS` repositories 100 per page with `LATENCY` seconds per
+request, then times github_ops.list_repos: a cold listing (first page,
+then the rest concurrently), a warm one (every page revalidated with
+If-None-Match, answered 304) and, for comparison, the same pages fetched
+one after another. Point GITHUB_API_URL at a stub server to try a real
+network round trip instead.
+
+Usage: python -m benchmarks.github_import  (from backend/)
+"""
+import asyncio
+import time
+from typing import Dict
+
+import httpx
+
+from app.core.github import PER_PAGE, github_client
+from app.domain.github_operations import github_ops
+
+REPOS = 2_000
+LATENCY = 0.1
+TOKEN = "benchmark"
+
+
+def stub_github(counts: Dict[int, int]) -> httpx.MockTransport:
+    last = -(-REPOS // PER_PAGE)
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(LATENCY)
+        page = int(request.url.params["page"])
+        etag = f'"page-{page}"'
+        counts[304 if request.headers.get("if-none-match") == etag else 200] += 1
+        headers = {
+            "etag": etag,
+            "link": f'<{request.url.copy_set_param("page", last)}>; rel="last"',
+            "x-ratelimit-remaining": "5000",
+            "x-ratelimit-reset": str(int(time.time()) + 3600),
+        }
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers=headers)
+        first = (page - 1) * PER_PAGE + 1
+        body = [
+            {
+                "id": number,
+                "name": f"repo-{number}",
+                "full_name": f"octo/repo-{number}",
+                "html_url": f"https://github.com/octo/repo-{number}",
+                "private": False,
+                "default_branch": "main",
+                "language": "Python",
+                "stargazers_count": number,
+                "forks_count": 0,
+                "description": "A repository",
+            }
+            for number in range(first, min(first + PER_PAGE, REPOS + 1))
+        ]
+        return httpx.Response(200, json=body, headers=headers)
+
+    return httpx.MockTransport(handle)
+
+
+async def timed(label: str, counts: Dict[int, int], listing) -> None:
+    counts.clear()
+    counts.update({200: 0, 304: 0})
+    started = time.perf_counter()
+    repos = await listing()
+    elapsed = time.perf_counter() - started
+    responses = f"{counts[200]} x 200, {counts[304]} x 304"
+    print(f"{label:<12} {len(repos):6,} repos  {elapsed:6.2f} s  ({responses})")
+
+
+async def main() -> None:
+    counts: Dict[int, int] = {}
+    github_client.transport = stub_github(counts)
+
+    async def sequential():
+        repos = []
+        for page in range(1, -(-REPOS // PER_PAGE) + 1):
+            # An extra parameter keeps these pages apart from the cached ones
+            params = {"per_page": PER_PAGE, "page": page, "sequential": 1}
+            repos.extend((await github_client.get(TOKEN, "/user/repos", params)).payload)
+        return repos
+
+    print(f"{REPOS:,} repositories, {LATENCY * 1000:.0f} ms per request")
+    await timed("sequential", counts, sequential)
+    await timed("cold", counts, lambda: github_ops.list_repos(TOKEN))
+    await timed("warm", counts, lambda: github_ops.list_repos(TOKEN))
+    await github_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+Serialization micro-benchmark for a 1,000-row work item list.
+
+Compares the previous handler shape (hand-built dicts with str()/isoformat()
+per row, then jsonable_encoder + json.dumps as FastAPI did for
+response_model=List[dict]) with the typed path (validate ORM objects into
+List[WorkItemRead] and dump straight to JSON bytes).
+
+Usage: python -m benchmarks.serialization  (from backend/)
+"""
+import functools
+import json
+import timeit
+import uuid as uuid_pkg
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.models.work_item import WorkItem, WorkItemRead
+
+ROWS = 1_000
+RUNS = 50
+
+
+def make_rows() -> List[WorkItem]:
+    now = datetime.now(timezone.utc)
+    product_id = uuid_pkg.uuid4()
+    return [
+        WorkItem(
+            id=uuid_pkg.uuid4(),
+            user_id=uuid_pkg.uuid4(),
+            product_id=product_id,
+            title=f"Work item {i}",
+            description="Lorem ipsum dolor sit amet " * 8,
+            type="feature",
+            status="todo",
+            priority=i % 5,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(ROWS)
+    ]
+
+
+def hand_built(rows: List[WorkItem]) -> bytes:
+    content = [
+        {
+            "id": str(w.id),
+            "title": w.title,
+            "description": w.description,
+            "type": w.type,
+            "status": w.status,
+            "priority": w.priority,
+            "product_id": str(w.product_id) if w.product_id else None,
+            "repository_id": str(w.repository_id) if w.repository_id else None,
+            "created_at": w.created_at.isoformat(),
+            "updated_at": w.updated_at.isoformat(),
+        }
+        for w in rows
+    ]
+    return json.dumps(jsonable_encoder(content)).encode()
+
+
+adapter = TypeAdapter(List[WorkItemRead])
+
+
+def typed(rows: List[WorkItem]) -> bytes:
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def main() -> None:
+    rows = make_rows()
+    for name, fn in (("hand-built dicts", hand_built), ("typed + dump_json", typed)):
+        best = min(timeit.repeat(functools.partial(fn, rows), number=1, repeat=RUNS))
+        print(f"{name:<20} {best * 1000:8.2f} ms  ({len(fn(rows)):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Shared fixtures.
+
+Tests that touch the database run against the PostgreSQL database named
+by TEST_DATABASE_URL (it must have the pg_trgm extension available) and
+are skipped without it. The schema is built once per session by running
+the Alembic migrations, and every table is truncated after each test.
+
+    TEST_DATABASE_URL=postgresql+asyncpg://postgres@localhost:5432/forum_test pytest
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid as uuid_pkg
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    # Read by app.config on import, so it must be set before any app module loads
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+os.environ.setdefault("DEBUG", "false")
+
+import httpx  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from alembic import command  # noqa: E402
+from app.api.deps import get_current_user  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.core import jobs  # noqa: E402
+from app.core.database import async_session_maker, engine  # noqa: E402
+from app.core.github import github_client  # noqa: E402
+from app.domain import github_ops  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="session")
+def database() -> str:
+    """Migrate the test database to head once per session."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    async def reset() -> None:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA public CASCADE"))
+            await conn.execute(text("CREATE SCHEMA public"))
+        await engine.dispose()
+
+    asyncio.run(reset())
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND / "alembic"))
+    command.upgrade(config, "head")
+    return TEST_DATABASE_URL
+
+
+@pytest.fixture
+async def db_clean(database: str) -> AsyncIterator[None]:
+    """
+    Empty every table after the test and drop connections bound to its event loop.
+
+    In-process caches are keyed by user and every test has a new user, so
+    they need no reset.
+    """
+    yield
+    # Background jobs a test started (e.g. a product purge) finish on its loop
+    await asyncio.gather(*jobs._running, return_exceptions=True)
+    async with engine.begin() as conn:
+        tables = await conn.scalars(
+            text(
+                "SELECT tablename FROM pg_tables "
+                "WHERE schemaname = 'public' AND tablename <> 'alembic_version'"
+            )
+        )
+        await conn.execute(text(f"TRUNCATE {', '.join(tables.all())} CASCADE"))
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(db_clean: None) -> AsyncIterator[AsyncSession]:
+    async with async_session_maker() as db:
+        yield db
+
+
+@pytest.fixture
+async def user(db_clean: None) -> User:
+    async with async_session_maker() as db:
+        user = User(id=uuid_pkg.uuid4(), email="dev@example.com")
+        db.add(user)
+        await db.commit()
+    return user
+
+
+@pytest.fixture
+async def client(user: User) -> AsyncIterator[httpx.AsyncClient]:
+    """API client authenticated as `user`. The lifespan (background loops) is not run."""
+    app.dependency_overrides[get_current_user] = lambda: user
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.fixture
+async def product_id(client: httpx.AsyncClient) -> str:
+    response = await client.post("/api/products", params={"name": "Forum"})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+class StubGitHub:
+    """
+    In-process GitHub API behind github_client, through httpx.MockTransport.
+
+    Serves GET /user/repos (paginated) and GET /repositories/{id} from
+    `repos`, with an ETag derived from the payload so unchanged resources
+    answer If-None-Match with 304. `statuses` forces an error response
+    for a repository: 401, 403 (rate limited) or 404.
+    """
+
+    def __init__(self):
+        self.repos: Dict[int, Dict[str, Any]] = {}
+        self.statuses: Dict[int, int] = {}
+        self.requests: List[httpx.Request] = []
+        self.remaining = 5000
+
+    def add(self, github_id: int, **fields: Any) -> Dict[str, Any]:
+        """Create or replace a repository, as GitHub would return it."""
+        self.repos[github_id] = {
+            "id": github_id,
+            "name": f"repo-{github_id}",
+            "full_name": f"octo/repo-{github_id}",
+            "description": None,
+            "html_url": f"https://github.com/octo/repo-{github_id}",
+            "default_branch": "main",
+            "private": False,
+            "language": "Python",
+            "stargazers_count": 0,
+            "forks_count": 0,
+            **fields,
+        }
+        return self.repos[github_id]
+
+    @staticmethod
+    def etag(payload: Any) -> str:
+        digest = hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+        return f'"{digest}"'
+
+    def requested(self, prefix: str = "/repositories/") -> List[str]:
+        paths = [request.url.path for request in self.requests]
+        return [path for path in paths if path.startswith(prefix)]
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {
+            "x-ratelimit-remaining": str(self.remaining),
+            "x-ratelimit-reset": str(int(time.time()) + 3600),
+        }
+        if request.url.path == "/user/repos":
+            per_page = int(request.url.params["per_page"])
+            page = int(request.url.params["page"])
+            listing = [self.repos[github_id] for github_id in sorted(self.repos)]
+            last = max(-(-len(listing) // per_page), 1)
+            headers["link"] = f'<{request.url.copy_set_param("page", last)}>; rel="last"'
+            payload: Any = listing[(page - 1) * per_page : page * per_page]
+        else:
+            github_id = int(request.url.path.rsplit("/", 1)[1])
+            status = self.statuses.get(github_id, 404 if github_id not in self.repos else 200)
+            if status == 403:
+                return httpx.Response(403, headers={**headers, "x-ratelimit-remaining": "0"})
+            if status != 200:
+                return httpx.Response(status, headers=headers)
+            payload = self.repos[github_id]
+
+        etag = self.etag(payload)
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={**headers, "etag": etag})
+        return httpx.Response(200, json=payload, headers={**headers, "etag": etag})
+
+
+@pytest.fixture
+async def github(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[StubGitHub]:
+    """A stub GitHub for github_client, with a new token so nothing cached carries over."""
+    stub = StubGitHub()
+    monkeypatch.setattr(settings, "github_token", f"token-{uuid_pkg.uuid4()}")
+    monkeypatch.setattr(github_client, "transport", httpx.MockTransport(stub.handle))
+    monkeypatch.setattr(github_client, "_client", None)
+    monkeypatch.setattr(github_ops, "_viewed", OrderedDict())
+    yield stub
+    await github_client.close()
@@ -0,0 +1,57 @@
+import json
+
+import httpx
+import pytest
+
+from app.core.envfile import MAX_LINE_BYTES
+
+
+def ndjson(*records: dict) -> str:
+    return "".join(json.dumps(record) + "\n" for record in records)
+
+
+async def test_ndjson_import_upserts(client: httpx.AsyncClient, product_id: str):
+    body = ndjson(
+        {"key": "API_URL", "value": "https://example.com", "category": "url"},
+        {"key": "TOKEN", "value": "secret", "is_secret": True, "description": "CI token"},
+    )
+    response = await client.post(
+        "/api/app-info/import", params={"product_id": product_id, "format": "ndjson"}, content=body
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"created": 2, "updated": 0}
+
+
+@pytest.mark.parametrize(
+    "record, field",
+    [
+        ({"key": "A", "category": "x" * 51}, "category"),
+        ({"key": "A", "description": "x" * 501}, "description"),
+        ({"key": "K" * 256}, "key"),
+        ({"key": "A", "value": 3}, "value"),
+        ({"key": "A", "is_secret": "yes"}, "is_secret"),
+    ],
+)
+async def test_ndjson_import_rejects_invalid_fields_per_line(
+    client: httpx.AsyncClient, product_id: str, record: dict, field: str
+):
+    body = ndjson({"key": "FIRST", "value": "1"}, record)
+    response = await client.post(
+        "/api/app-info/import", params={"product_id": product_id, "format": "ndjson"}, content=body
+    )
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"].startswith(f"Line 2: {field}:")
+
+    # The import is all or nothing
+    response = await client.get("/api/app-info", params={"product_id": product_id})
+    assert response.json() == []
+
+
+async def test_import_rejects_overlong_lines(client: httpx.AsyncClient, product_id: str):
+    # Complete lines are checked too, not only the unfinished tail of a chunk
+    body = ndjson({"key": "A", "value": "x" * MAX_LINE_BYTES}, {"key": "B"})
+    response = await client.post(
+        "/api/app-info/import", params={"product_id": product_id, "format": "ndjson"}, content=body
+    )
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == "Line 1 is too long"
@@ -0,0 +1,51 @@
+import asyncio
+
+import httpx
+
+from app.core.database import async_session_maker
+from app.models.product import Product
+
+
+async def test_atomic_batch_rolls_back_delete(client: httpx.AsyncClient, product_id: str):
+    response = await client.post(
+        "/api/batch",
+        json={
+            "atomic": True,
+            "requests": [
+                {"method": "DELETE", "url": f"/api/products/{product_id}"},
+                {"method": "GET", "url": f"/api/products/{product_id}"},  # deleted above: 404
+                {"method": "POST", "url": "/api/products?name=Other"},
+            ],
+        },
+    )
+    assert response.status_code == 200
+    batch = response.json()
+    assert batch["committed"] is False
+    assert [item["status"] for item in batch["responses"]] == [202, 404, 424]
+
+    # Give a purge that was wrongly scheduled the chance to run
+    await asyncio.sleep(0.1)
+    async with async_session_maker() as db:
+        product = await db.get(Product, product_id)
+    assert product is not None
+    assert product.deleted_at is None
+    assert (await client.get(f"/api/products/{product_id}")).status_code == 200
+
+
+async def test_batch_delete_purges_after_commit(client: httpx.AsyncClient, product_id: str):
+    response = await client.post(
+        "/api/batch",
+        json={
+            "atomic": True,
+            "requests": [{"method": "DELETE", "url": f"/api/products/{product_id}"}],
+        },
+    )
+    assert response.json()["committed"] is True
+
+    for _ in range(50):
+        async with async_session_maker() as db:
+            if await db.get(Product, product_id) is None:
+                break
+        await asyncio.sleep(0.02)
+    else:
+        raise AssertionError("product was not purged")
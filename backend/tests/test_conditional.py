@@ -0,0 +1,59 @@
+import httpx
+
+
+async def create_item(client: httpx.AsyncClient, product_id: str) -> str:
+    response = await client.post("/api/work", params={"product_id": product_id, "title": "Next"})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def test_if_none_match(client: httpx.AsyncClient, product_id: str):
+    path = f"/api/work/{await create_item(client, product_id)}"
+    response = await client.get(path)
+    assert response.status_code == 200, response.text
+    etag = response.headers["ETag"]
+
+    response = await client.get(path, headers={"If-None-Match": f'"other", W/{etag}'})
+    assert response.status_code == 304
+    assert response.content == b"" and response.headers["ETag"] == etag
+
+    response = await client.patch(path, params={"status": "done"})
+    assert response.status_code == 200, response.text
+    response = await client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "done"
+    assert response.headers["ETag"] != etag
+
+
+async def test_if_modified_since(client: httpx.AsyncClient, product_id: str):
+    path = f"/api/work/{await create_item(client, product_id)}"
+    response = await client.get(path)
+    last_modified = response.headers["Last-Modified"]
+
+    response = await client.get(path, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+    long_ago = "Thu, 01 Jan 2015 00:00:00 GMT"
+    response = await client.get(path, headers={"If-Modified-Since": long_ago})
+    assert response.status_code == 200, response.text
+    # If-None-Match wins over If-Modified-Since
+    headers = {"If-None-Match": '"other"', "If-Modified-Since": last_modified}
+    response = await client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+
+
+async def test_serialized_response(client: httpx.AsyncClient, product_id: str):
+    path = f"/api/products/{product_id}/workspace"
+    response = await client.get(path)
+    assert response.status_code == 200, response.text
+    assert response.headers["Content-Type"] == "application/json"
+    etag = response.headers["ETag"]
+
+    response = await client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    await create_item(client, product_id)
+    response = await client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200, response.text
+    assert response.headers["ETag"] != etag
+    assert [item["title"] for item in response.json()["open_work_items"][""]] == ["Next"]
@@ -0,0 +1,82 @@
+import gzip
+
+import httpx
+import pytest
+
+from app.api.streaming import accepts_encoding
+from app.config import settings
+
+CONTENT = "# Spec\n\n" + "All work items are tracked per product.\n" * 20
+
+
+@pytest.fixture
+async def path(
+    client: httpx.AsyncClient, product_id: str, monkeypatch: pytest.MonkeyPatch
+) -> str:
+    """Content URL of a document large enough to be stored gzipped."""
+    monkeypatch.setattr(settings, "document_gzip_min_bytes", 64)
+    params = {"product_id": product_id, "title": "Spec", "content": CONTENT}
+    response = await client.post("/api/docs", params=params)
+    assert response.status_code == 201, response.text
+    return f"/api/docs/{response.json()['id']}/content"
+
+
+@pytest.mark.parametrize(
+    "header, allowed",
+    [
+        ("gzip, deflate", True),
+        ("deflate, gzip;q=0", False),
+        ("*;q=0.5", True),
+        ("gzip;q=0, *", False),
+        ("identity", False),
+        (None, False),
+    ],
+)
+def test_accepts_encoding(header, allowed):
+    assert accepts_encoding(header, "gzip") is allowed
+
+
+async def test_range_requests(client: httpx.AsyncClient, path: str):
+    body = CONTENT.encode()
+    headers = {"Accept-Encoding": "identity"}
+    response = await client.get(path, headers={**headers, "Range": "bytes=0-5"})
+    assert response.status_code == 206, response.text
+    assert response.content == body[:6]
+    assert response.headers["Content-Range"] == f"bytes 0-5/{len(body)}"
+
+    response = await client.get(path, headers={**headers, "Range": "bytes=-4"})
+    assert response.status_code == 206, response.text
+    assert response.content == body[-4:]
+
+    response = await client.get(path, headers={**headers, "Range": f"bytes={len(body)}-"})
+    assert response.status_code == 416, response.text
+    assert response.headers["Content-Range"] == f"bytes */{len(body)}"
+
+    # A range against a stale ETag gets the whole body
+    stale = {**headers, "Range": "bytes=0-5", "If-Range": '"stale"'}
+    response = await client.get(path, headers=stale)
+    assert response.status_code == 200, response.text
+    assert response.content == body
+
+
+async def test_gzip_passthrough(client: httpx.AsyncClient, path: str):
+    headers = {"Accept-Encoding": "gzip"}
+    async with client.stream("GET", path, headers=headers) as response:
+        assert response.status_code == 200
+        raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    # The stored gzip bytes, sent as they are
+    assert gzip.decompress(raw) == CONTENT.encode()
+    gzip_etag = response.headers["ETag"]
+
+    response = await client.get(path, headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.text == CONTENT
+    assert response.headers["ETag"] != gzip_etag
+
+    # Ranges address the uncompressed body, so they are never served gzipped
+    response = await client.get(path, headers={**headers, "Range": "bytes=0-5"})
+    assert response.status_code == 206, response.text
+    assert "Content-Encoding" not in response.headers
+    assert response.content == CONTENT.encode()[:6]
@@ -0,0 +1,33 @@
+import uuid as uuid_pkg
+
+import httpx
+import pytest
+
+from app.core.change_feed import change_feed
+from app.core.database import engine
+
+
+async def test_events_stream_without_holding_a_connection(
+    client: httpx.AsyncClient, product_id: str, monkeypatch: pytest.MonkeyPatch
+):
+    response = await client.get(f"/api/products/{uuid_pkg.uuid4()}/events")
+    assert response.status_code == 404, response.text
+
+    checked_out = []
+    subscribe = change_feed.subscribe
+
+    def subscribe_and_close(*args):
+        checked_out.append(engine.pool.checkedout())
+        subscription, _ = subscribe(*args)
+        # Ends the stream right after the reset event
+        subscription.close()
+        return subscription, None
+
+    # The lifespan does not run, so there is no LISTEN connection behind the feed
+    monkeypatch.setattr(change_feed, "connected", True)
+    monkeypatch.setattr(change_feed, "subscribe", subscribe_and_close)
+    response = await client.get(f"/api/products/{product_id}/events")
+    assert response.status_code == 200, response.text
+    assert response.text == "event: reset\ndata: {}\n\n"
+    assert checked_out == [0]
+    assert change_feed.subscriber_count() == 0
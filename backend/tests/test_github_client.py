@@ -0,0 +1,42 @@
+import time
+from email.utils import formatdate
+from typing import Optional
+
+import httpx
+import pytest
+
+from app.core.exceptions import RateLimitedError
+from app.core.github import GitHubClient, retry_after_seconds
+
+
+def test_retry_after_forms():
+    assert retry_after_seconds("30") == 30
+    assert retry_after_seconds(formatdate(time.time() + 120, usegmt=True)) in (120, 121)
+    # A date in the past still means wait before retrying
+    assert retry_after_seconds(formatdate(time.time() - 60, usegmt=True)) == 1
+    assert retry_after_seconds("soon") is None
+    assert retry_after_seconds(None) is None
+
+
+async def rate_limited_retry_after(retry_after: Optional[str]) -> str:
+    headers = {"x-ratelimit-remaining": "0", "x-ratelimit-reset": str(int(time.time()) + 600)}
+    if retry_after is not None:
+        headers["retry-after"] = retry_after
+    transport = httpx.MockTransport(lambda _: httpx.Response(429, headers=headers))
+    client = GitHubClient(transport=transport)
+    try:
+        with pytest.raises(RateLimitedError) as raised:
+            await client.fetch("token", "/user/repos")
+    finally:
+        await client.close()
+    return raised.value.headers["Retry-After"]
+
+
+async def test_rate_limit_honours_an_http_date():
+    retry_after = await rate_limited_retry_after(formatdate(time.time() + 120, usegmt=True))
+    assert retry_after in ("120", "121")
+
+
+async def test_rate_limit_falls_back_to_the_tracked_reset():
+    for retry_after in ("soon", None):
+        assert await rate_limited_retry_after(retry_after) in ("600", "601")
@@ -0,0 +1,107 @@
+import uuid as uuid_pkg
+from typing import List
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from app.config import settings
+from app.core.database import engine
+from app.core.github import PER_PAGE, github_client
+from tests.conftest import StubGitHub
+
+
+def headers() -> dict:
+    # The github fixture's token is new for every test, so no cached page carries over
+    return {"X-GitHub-Token": settings.github_token}
+
+
+@pytest.fixture
+def repos(github: StubGitHub) -> StubGitHub:
+    for github_id in range(1, 2 * PER_PAGE + 51):
+        github.add(github_id, stargazers_count=github_id)
+    return github
+
+
+async def test_list_repos_revalidates_pages(client: httpx.AsyncClient, repos: StubGitHub):
+    response = await client.get("/api/github/repos", headers=headers())
+    assert response.status_code == 200, response.text
+    listed = response.json()
+    assert len(listed) == 2 * PER_PAGE + 50
+    assert listed[0]["full_name"] == "octo/repo-1"
+    assert all(repo["product_id"] is None for repo in listed)
+
+    repos.requests.clear()
+    response = await client.get("/api/github/repos", headers=headers())
+    assert len(response.json()) == 2 * PER_PAGE + 50
+    # Every page was asked for conditionally, and each was answered 304
+    assert len(repos.requests) == 3
+    assert all(request.headers.get("if-none-match") for request in repos.requests)
+
+
+async def test_import_creates_then_updates(
+    client: httpx.AsyncClient, repos: StubGitHub, product_id: str
+):
+    body = {"product_id": product_id, "github_ids": [1, 2, 100_000]}
+    response = await client.post("/api/github/import", json=body, headers=headers())
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["created"], result["updated"], result["missing"]) == (2, 0, [100_000])
+    assert sorted(repo["github_id"] for repo in result["repositories"]) == [1, 2]
+
+    repos.add(1, stargazers_count=500)
+    other = (await client.post("/api/products", params={"name": "Other"})).json()["id"]
+    body = {"product_id": other, "github_ids": [1, 2]}
+    result = (await client.post("/api/github/import", json=body, headers=headers())).json()
+    assert (result["created"], result["updated"], result["missing"]) == (0, 2, [])
+    moved = {repo["github_id"]: repo for repo in result["repositories"]}
+    assert moved[1]["stars_count"] == 500
+    assert {repo["product_id"] for repo in moved.values()} == {other}
+
+    listed = (await client.get("/api/github/repos", headers=headers())).json()
+    imported = {repo["github_id"]: repo["product_id"] for repo in listed if repo["product_id"]}
+    assert imported == {1: other, 2: other}
+
+
+async def test_import_fetches_before_querying(
+    client: httpx.AsyncClient, repos: StubGitHub, product_id: str
+):
+    order: List[str] = []
+    handle = repos.handle
+
+    def record_request(request: httpx.Request) -> httpx.Response:
+        order.append("github")
+        return handle(request)
+
+    def record_statement(*args):
+        order.append("sql")
+
+    github_client.transport = httpx.MockTransport(record_request)
+    event.listen(engine.sync_engine, "before_cursor_execute", record_statement)
+    try:
+        body = {"product_id": product_id, "github_ids": [1]}
+        response = await client.post("/api/github/import", json=body, headers=headers())
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record_statement)
+    assert response.status_code == 200, response.text
+    assert order.index("sql") > max(i for i, step in enumerate(order) if step == "github")
+
+
+async def test_import_into_unknown_product(client: httpx.AsyncClient, repos: StubGitHub):
+    body = {"product_id": str(uuid_pkg.uuid4()), "github_ids": [1]}
+    response = await client.post("/api/github/import", json=body, headers=headers())
+    assert response.status_code == 404
+
+
+async def test_unconditional_304_is_upstream_error(
+    client: httpx.AsyncClient, github: StubGitHub
+):
+    github_client.transport = httpx.MockTransport(lambda _: httpx.Response(304))
+    response = await client.get("/api/github/repos", headers=headers())
+    assert response.status_code == 502
+
+
+async def test_token_required(client: httpx.AsyncClient, github: StubGitHub):
+    response = await client.get("/api/github/repos")
+    assert response.status_code == 400
+    assert github.requests == []
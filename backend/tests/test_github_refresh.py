@@ -0,0 +1,196 @@
+import logging
+import time
+import uuid as uuid_pkg
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import pytest
+from sqlalchemy import select, text
+
+from app.config import settings
+from app.core.database import async_session_maker
+from app.core.github import RateLimit, fingerprint, github_client
+from app.domain import github_ops
+from app.domain.github_operations import repository_fields
+from app.models.github import GitHubSyncState
+from app.models.product import Product
+from app.models.repository import Repository
+from app.models.user import User
+from tests.conftest import StubGitHub
+
+
+async def add_product(user: User, name: str) -> uuid_pkg.UUID:
+    async with async_session_maker() as db:
+        product = Product(user_id=user.id, name=name)
+        db.add(product)
+        await db.commit()
+        return product.id
+
+
+async def add_repository(
+    user: User,
+    product_id: uuid_pkg.UUID,
+    repo: Dict,
+    checked_ago: Optional[timedelta] = None,
+    etag: Optional[str] = None,
+) -> uuid_pkg.UUID:
+    """Store a repository as imported from `repo`, last checked `checked_ago` (None: never)."""
+    async with async_session_maker() as db:
+        repository = Repository(user_id=user.id, product_id=product_id, **repository_fields(repo))
+        db.add(repository)
+        await db.flush()
+        if checked_ago is not None:
+            db.add(
+                GitHubSyncState(
+                    repository_id=repository.id,
+                    etag=etag,
+                    checked_at=datetime.utcnow() - checked_ago,
+                )
+            )
+        await db.commit()
+        return repository.id
+
+
+async def refresh() -> int:
+    async with async_session_maker() as db:
+        return await github_ops.refresh(db)
+
+
+def requested_ids(github: StubGitHub) -> set:
+    return {int(path.rsplit("/", 1)[1]) for path in github.requested()}
+
+
+def test_refresh_budget(github: StubGitHub, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "github_refresh_batch_size", 100)
+    monkeypatch.setattr(settings, "github_rate_limit_reserve", 50)
+    monkeypatch.setattr(settings, "github_refresh_interval_seconds", 60.0)
+    token = settings.github_token
+
+    def limit(remaining: int, reset_in: float) -> None:
+        github_client._limits.set(
+            fingerprint(token), RateLimit(remaining=remaining, reset_at=time.time() + reset_in)
+        )
+
+    # Unknown budget: a full batch
+    assert github_ops.refresh_budget(token) == 100
+    # 500 spare over ten ticks until the reset
+    limit(550, 599)
+    assert github_ops.refresh_budget(token) == 50
+    # Capped at the batch size
+    limit(5000, 599)
+    assert github_ops.refresh_budget(token) == 100
+    # The last tick before the reset may spend all that is spare
+    limit(80, 10)
+    assert github_ops.refresh_budget(token) == 30
+    # Never below zero, never into the reserve
+    limit(20, 599)
+    assert github_ops.refresh_budget(token) == 0
+    # A past reset means a fresh budget
+    limit(0, -1)
+    assert github_ops.refresh_budget(token) == 100
+
+
+async def test_refresh_claims_viewed_then_oldest(
+    github: StubGitHub, user: User, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "github_refresh_batch_size", 2)
+    other = await add_product(user, "Other")
+    viewed = await add_product(user, "Viewed")
+    await add_repository(user, other, github.add(1), checked_ago=timedelta(days=2))
+    await add_repository(user, other, github.add(2))
+    await add_repository(user, other, github.add(3), checked_ago=timedelta(hours=1))
+    await add_repository(user, viewed, github.add(4), checked_ago=timedelta(minutes=30))
+    await add_repository(user, viewed, github.add(5), checked_ago=timedelta(minutes=5))
+    github_ops.mark_viewed(viewed)
+
+    # The viewed product's repository due on its shorter schedule, then the never-checked one
+    await refresh()
+    assert requested_ids(github) == {4, 2}
+
+    github.requests.clear()
+    await refresh()
+    assert requested_ids(github) == {1}
+
+    # Nothing else is due
+    github.requests.clear()
+    await refresh()
+    assert requested_ids(github) == set()
+
+
+async def test_refresh_skips_deleted_products(github: StubGitHub, user: User):
+    product_id = await add_product(user, "Deleted")
+    await add_repository(user, product_id, github.add(1))
+    async with async_session_maker() as db:
+        product = await db.get(Product, product_id)
+        product.deleted_at = datetime.utcnow()
+        await db.commit()
+
+    assert await refresh() == 0
+    assert github.requested() == []
+
+
+async def test_refresh_writes_only_changes(github: StubGitHub, user: User):
+    product_id = await add_product(user, "Forum")
+    # 200 with new metadata
+    changed = await add_repository(user, product_id, github.add(1, stargazers_count=1))
+    github.add(1, stargazers_count=2)
+    # 200 with the same metadata, e.g. after the stored ETag was lost
+    same = await add_repository(user, product_id, github.add(2), checked_ago=timedelta(days=2))
+    # 304 on the stored ETag
+    cached = await add_repository(
+        user, product_id, github.add(3), timedelta(days=2), StubGitHub.etag(github.repos[3])
+    )
+    # 404: deleted on GitHub
+    gone = await add_repository(user, product_id, github.add(4), timedelta(days=2), '"old"')
+    del github.repos[4]
+
+    async with async_session_maker() as db:
+        before = dict((await db.execute(text("SELECT id, change_xid FROM repositories"))).all())
+
+    assert await refresh() == 1
+
+    async with async_session_maker() as db:
+        after = dict((await db.execute(text("SELECT id, change_xid FROM repositories"))).all())
+        repositories = {
+            repository.id: repository for repository in (await db.scalars(select(Repository)))
+        }
+        etags = dict(
+            (await db.execute(select(GitHubSyncState.repository_id, GitHubSyncState.etag))).all()
+        )
+
+    assert {key for key in before if before[key] != after[key]} == {changed}
+    assert repositories[changed].stars_count == 2
+    assert repositories[gone].full_name == "octo/repo-4"
+    assert etags == {
+        changed: StubGitHub.etag(github.repos[1]),
+        same: StubGitHub.etag(github.repos[2]),
+        cached: StubGitHub.etag(github.repos[3]),
+        gone: None,
+    }
+    conditional = {
+        request.url.path: request.headers.get("if-none-match") for request in github.requests
+    }
+    assert conditional["/repositories/3"] == StubGitHub.etag(github.repos[3])
+    assert conditional["/repositories/1"] is None
+
+
+@pytest.mark.parametrize("status", [401, 403])
+async def test_refresh_stops_batch(
+    github: StubGitHub,
+    user: User,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+    status: int,
+):
+    monkeypatch.setattr(settings, "github_max_concurrency", 1)
+    product_id = await add_product(user, "Forum")
+    for github_id in (1, 2, 3):
+        await add_repository(user, product_id, github.add(github_id, stargazers_count=github_id))
+        github.add(github_id, stargazers_count=github_id + 10)
+        github.statuses[github_id] = status
+
+    with caplog.at_level(logging.WARNING, logger="app.domain.github_operations"):
+        assert await refresh() == 0
+
+    assert len(github.requested()) == 1
+    assert len([record for record in caplog.records if "stopped early" in record.message]) == 1
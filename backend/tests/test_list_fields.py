@@ -0,0 +1,52 @@
+import httpx
+
+from app.models.app_info import SECRET_MASK
+
+ALWAYS = {"id", "created_at", "updated_at"}
+
+
+async def test_fields_limit_the_columns(client: httpx.AsyncClient, product_id: str):
+    items = [{"product_id": product_id, "title": "Next", "description": "Long text"}]
+    response = await client.post("/api/work/bulk", json=items)
+    assert response.status_code == 201, response.text
+
+    response = await client.get("/api/work", params={"product_id": product_id, "fields": "title"})
+    assert response.status_code == 200, response.text
+    (item,) = response.json()
+    assert item.keys() == ALWAYS | {"title"}
+
+    response = await client.get("/api/work", params={"product_id": product_id, "fields": "nope"})
+    assert response.status_code == 400, response.text
+    # Hidden columns cannot be asked for either
+    params = {"product_id": product_id, "fields": "content_gzip"}
+    response = await client.get("/api/docs", params=params)
+    assert response.status_code == 400, response.text
+
+
+async def test_deferred_columns_are_opt_in(client: httpx.AsyncClient, product_id: str):
+    items = [{"product_id": product_id, "title": "Next", "description": "Long text"}]
+    response = await client.post("/api/work/bulk", json=items)
+    assert response.status_code == 201, response.text
+
+    response = await client.get("/api/work", params={"product_id": product_id})
+    (item,) = response.json()
+    assert "description" not in item and item["title"] == "Next"
+
+    params = {"product_id": product_id, "include": "description"}
+    response = await client.get("/api/work", params=params)
+    (item,) = response.json()
+    assert item["description"] == "Long text"
+
+
+async def test_required_fields_are_always_loaded(client: httpx.AsyncClient, product_id: str):
+    params = {"product_id": product_id, "key": "TOKEN", "value": "hunter2", "is_secret": True}
+    response = await client.post("/api/app-info", params=params)
+    assert response.status_code == 201, response.text
+
+    params = {"product_id": product_id, "fields": "value"}
+    response = await client.get("/api/app-info", params=params)
+    assert response.status_code == 200, response.text
+    (entry,) = response.json()
+    # is_secret comes along with value, so the secret is still masked
+    assert entry.keys() == ALWAYS | {"value", "is_secret"}
+    assert entry["value"] == SECRET_MASK
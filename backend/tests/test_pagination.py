@@ -0,0 +1,44 @@
+import uuid as uuid_pkg
+from datetime import datetime
+
+import httpx
+import pytest
+
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.core.exceptions import ValidationError
+from app.domain.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    position = (datetime(2026, 10, 18, 12, 30, 5, 123456), uuid_pkg.uuid4())
+    assert decode_cursor(encode_cursor(*position)) == position
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor!", "bm8tc2VwYXJhdG9y", "eHx5"])
+def test_malformed_cursor(cursor: str):
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor)
+
+
+async def test_cursor_pages_through_a_listing(client: httpx.AsyncClient, product_id: str):
+    # One statement, so every row has the same created_at and the id breaks ties
+    items = [{"product_id": product_id, "title": f"Item {n}"} for n in range(5)]
+    response = await client.post("/api/work/bulk", json=items)
+    assert response.status_code == 201, response.text
+    expected = {item["id"] for item in response.json()}
+
+    seen = []
+    params = {"product_id": product_id, "limit": 2}
+    while True:
+        response = await client.get("/api/work", params=params)
+        assert response.status_code == 200, response.text
+        seen += [item["id"] for item in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+    assert len(seen) == len(expected) and set(seen) == expected
+
+    params["cursor"] = "not a cursor!"
+    response = await client.get("/api/work", params=params)
+    assert response.status_code == 400, response.text
@@ -0,0 +1,102 @@
+import time
+import uuid as uuid_pkg
+from datetime import datetime
+from typing import AsyncIterator
+
+import httpx
+import pytest
+from jose import jwt
+
+from app.api.deps import issued_at
+from app.config import settings
+from app.core.principal_cache import Principal, PrincipalCache, principal_cache
+from app.main import app
+from app.models.user import User
+
+
+def principal(user_id: uuid_pkg.UUID, **claims) -> Principal:
+    return Principal(claims=claims, user=User(id=user_id))
+
+
+def test_eviction_prunes_the_user_index():
+    cache = PrincipalCache(max_size=2, ttl_seconds=60)
+    first, second = uuid_pkg.uuid4(), uuid_pkg.uuid4()
+    cache.set("a", principal(first))
+    cache.set("b", principal(first))
+    cache.set("c", principal(second))
+
+    assert cache.get("a") is None
+    assert cache.stats()["users"] == 2
+    cache.set("d", principal(second))
+    # Both of the first user's tokens are gone, and so is its index entry
+    assert cache.stats() | {"size": 2, "users": 1} == cache.stats()
+
+
+def test_expiry_prunes_the_user_index():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    user_id = uuid_pkg.uuid4()
+    cache.set("a", principal(user_id, exp=time.time() + 0.01))
+    assert cache.stats()["users"] == 1
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["users"] == 0
+
+
+def test_expired_tokens_are_not_indexed():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.set("a", principal(uuid_pkg.uuid4(), exp=time.time() - 1))
+    assert cache.stats()["users"] == 0
+
+
+@pytest.fixture
+async def anonymous(
+    db_clean: None, monkeypatch: pytest.MonkeyPatch
+) -> AsyncIterator[httpx.AsyncClient]:
+    """API client authenticating with real tokens, signed with a test secret."""
+    monkeypatch.setattr(settings, "supabase_jwt_secret", "test-secret")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+
+
+def token(user_id: uuid_pkg.UUID, user_name: str) -> str:
+    claims = {
+        "sub": str(user_id),
+        "aud": "authenticated",
+        "exp": int(time.time()) + 3600,
+        "iat": time.time(),  # tells tokens with the same claims apart
+        "email": "dev@example.com",
+        "user_metadata": {"user_name": user_name},
+    }
+    return jwt.encode(claims, "test-secret", algorithm="HS256")
+
+
+async def test_profile_change_invalidates_cached_tokens(anonymous: httpx.AsyncClient):
+    user_id = uuid_pkg.uuid4()
+    old = {"Authorization": f"Bearer {token(user_id, 'octo')}"}
+
+    # The first request creates the user, the second caches the token
+    for _ in range(2):
+        response = await anonymous.get("/api/products", headers=old)
+        assert response.status_code == 200, response.text
+    assert principal_cache.get(token_of(old)).user.github_username == "octo"
+
+    renamed = {"Authorization": f"Bearer {token(user_id, 'octocat')}"}
+    response = await anonymous.get("/api/products", headers=renamed)
+    assert response.status_code == 200, response.text
+    assert principal_cache.get(token_of(old)) is None
+
+    response = await anonymous.get("/api/products", headers=old)
+    assert response.status_code == 200, response.text
+    # A token issued before the rename does not roll the row back
+    assert principal_cache.get(token_of(old)).user.github_username == "octocat"
+
+
+def token_of(headers: dict) -> str:
+    return headers["Authorization"].removeprefix("Bearer ")
+
+
+def test_issued_at_is_naive_utc():
+    assert issued_at({"iat": 86400.5}) == datetime(1970, 1, 2, 0, 0, 0, 500000)
+    assert issued_at({}) is None
@@ -0,0 +1,56 @@
+import httpx
+
+
+async def test_detail_counts_children(client: httpx.AsyncClient, product_id: str):
+    items = [{"product_id": product_id, "title": f"Item {n}"} for n in range(3)]
+    response = await client.post("/api/work/bulk", json=items)
+    assert response.status_code == 201, response.text
+    item_id = response.json()[0]["id"]
+    response = await client.post("/api/docs", params={"product_id": product_id, "title": "Spec"})
+    assert response.status_code == 201, response.text
+    params = {"product_id": product_id, "key": "PORT", "value": "8000"}
+    response = await client.post("/api/app-info", params=params)
+    assert response.status_code == 201, response.text
+
+    response = await client.get(f"/api/products/{product_id}")
+    assert response.status_code == 200, response.text
+    detail = response.json()
+    assert detail["name"] == "Forum"
+    assert {name: detail[name] for name in detail if name.endswith("_count")} == {
+        "repositories_count": 0,
+        "work_items_count": 3,
+        "documents_count": 1,
+        "app_info_count": 1,
+    }
+    # Nothing embedded unless asked for
+    assert not {"repositories", "work_items", "documents", "app_info"} & detail.keys()
+
+    response = await client.delete(f"/api/work/{item_id}")
+    assert response.status_code == 204, response.text
+    response = await client.get(f"/api/products/{product_id}")
+    assert response.json()["work_items_count"] == 2
+
+
+async def test_detail_embeds_a_page_of_children(client: httpx.AsyncClient, product_id: str):
+    items = [{"product_id": product_id, "title": f"Item {n}"} for n in range(3)]
+    response = await client.post("/api/work/bulk", json=items)
+    assert response.status_code == 201, response.text
+    created = {item["id"] for item in response.json()}
+
+    path = f"/api/products/{product_id}"
+    params = {"embed": "work_items,documents", "embed_limit": 2}
+    response = await client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    detail = response.json()
+    first = [item["id"] for item in detail["work_items"]]
+    assert len(first) == 2 and detail["documents"] == []
+    assert "repositories" not in detail
+
+    response = await client.get(path, params={**params, "embed_skip": 2})
+    rest = [item["id"] for item in response.json()["work_items"]]
+    assert len(rest) == 1 and set(first + rest) == created
+
+    response = await client.get(path, params={"embed": "users"})
+    assert response.status_code == 400, response.text
+    response = await client.get(path, params={"embed": "work_items", "embed_limit": 101})
+    assert response.status_code == 422, response.text
@@ -0,0 +1,138 @@
+"""
+EXPLAIN checks that the hot domain queries are served by the indexes built for them.
+
+The product gets a few hundred work items, mostly done, and the tables
+are analyzed. Sequential scans are disabled for the EXPLAIN, so on these
+small tables the planner picks the index it would use on large ones; the
+assertion is on which index that is.
+"""
+import uuid as uuid_pkg
+from typing import Any, Awaitable, Callable, List, Tuple
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session_maker, engine
+from app.domain import (
+    app_info_ops,
+    document_ops,
+    product_ops,
+    repository_ops,
+    work_item_ops,
+)
+from app.models.user import User
+
+Call = Callable[[AsyncSession, uuid_pkg.UUID, uuid_pkg.UUID], Awaitable[Any]]
+
+QUERIES: List[Tuple[str, Call]] = [
+    (
+        "ix_products_user_created",
+        lambda db, user_id, _: product_ops.get_multi_by_user(db, user_id=user_id),
+    ),
+    (
+        "ix_repositories_user_product_created",
+        lambda db, user_id, product_id: repository_ops.get_by_product(
+            db, user_id=user_id, product_id=product_id
+        ),
+    ),
+    (
+        "ix_work_items_user_product_created",
+        lambda db, user_id, product_id: work_item_ops.get_by_product(
+            db, user_id=user_id, product_id=product_id
+        ),
+    ),
+    (
+        "ix_work_items_user_product_status_created",
+        lambda db, user_id, product_id: work_item_ops.get_by_product(
+            db, user_id=user_id, product_id=product_id, status="todo"
+        ),
+    ),
+    (
+        "ix_work_items_user_product_type_created",
+        lambda db, user_id, product_id: work_item_ops.get_by_product(
+            db, user_id=user_id, product_id=product_id, type="fix"
+        ),
+    ),
+    (
+        "ix_work_items_open",
+        lambda db, user_id, product_id: product_ops.get_workspace(
+            db, user_id=user_id, id=product_id
+        ),
+    ),
+    (
+        "ix_documents_user_product_created",
+        lambda db, user_id, product_id: document_ops.get_by_product(
+            db, user_id=user_id, product_id=product_id
+        ),
+    ),
+    (
+        "ix_documents_user_product_type_created",
+        lambda db, user_id, product_id: document_ops.get_by_product(
+            db, user_id=user_id, product_id=product_id, type="spec"
+        ),
+    ),
+    (
+        "ix_app_info_user_product_created",
+        lambda db, user_id, product_id: app_info_ops.get_by_product(
+            db, user_id=user_id, product_id=product_id
+        ),
+    ),
+    (
+        "ix_app_info_user_product_category_created",
+        lambda db, user_id, product_id: app_info_ops.get_by_product(
+            db, user_id=user_id, product_id=product_id, category="env"
+        ),
+    ),
+]
+
+
+async def explain(call: Call, user_id: uuid_pkg.UUID, product_id: uuid_pkg.UUID) -> str:
+    """The plans of every statement `call` runs, as EXPLAIN prints them."""
+    statements: List[Tuple[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    async with async_session_maker() as db:
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            await call(db, user_id, product_id)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+        connection = await db.connection()
+        await connection.execute(text("SET LOCAL enable_seqscan = off"))
+        plans = []
+        for statement, parameters in statements:
+            result = await connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            plans.extend(row[0] for row in result)
+        return "\n".join(plans)
+
+
+@pytest.fixture
+async def work_items(user: User, product_id: str) -> None:
+    async with async_session_maker() as db:
+        await db.execute(
+            text(
+                "INSERT INTO work_items (user_id, product_id, title, type, status) "
+                "SELECT :user_id, :product_id, 'Item ' || n, "
+                "(ARRAY['feature', 'fix', 'refactor'])[n % 3 + 1], "
+                "CASE WHEN n % 10 = 0 THEN 'todo' WHEN n % 10 = 1 THEN NULL ELSE 'done' END "
+                "FROM generate_series(1, 500) AS n"
+            ),
+            {"user_id": user.id, "product_id": uuid_pkg.UUID(product_id)},
+        )
+        await db.commit()
+        for table in ("products", "repositories", "work_items", "documents", "app_info"):
+            await db.execute(text(f"ANALYZE {table}"))
+        await db.commit()
+
+
+@pytest.mark.parametrize("index, call", QUERIES, ids=[index for index, _ in QUERIES])
+async def test_domain_query_uses_index(
+    work_items: None, user: User, product_id: str, index: str, call: Call
+):
+    plan = await explain(call, user.id, uuid_pkg.UUID(product_id))
+    assert f" {index} " in plan, plan
+    assert "Seq Scan" not in plan, plan
@@ -0,0 +1,34 @@
+import httpx
+
+from app.core.database import async_session_maker
+from app.domain import quickfind_ops
+from app.models.user import User
+
+
+async def labels(client: httpx.AsyncClient, q: str) -> list:
+    response = await client.get("/api/quickfind", params={"q": q})
+    assert response.status_code == 200, response.text
+    return sorted(hit["label"] for hit in response.json())
+
+
+async def test_quickfind_sees_committed_writes(client: httpx.AsyncClient, product_id: str):
+    assert await labels(client, "For") == ["Forum"]
+
+    await client.post("/api/products", params={"name": "Fork"})
+    assert await labels(client, "For") == ["Fork", "Forum"]
+
+    await client.delete(f"/api/products/{product_id}")
+    assert await labels(client, "For") == ["Fork"]
+
+
+async def test_quickfind_invalidation_waits_for_commit(user: User):
+    async with async_session_maker() as db:
+        quickfind_ops._cache.set(user.id, "cached")
+        quickfind_ops.invalidate(db, user.id)
+        assert quickfind_ops._cache.get(user.id) == "cached"
+        await db.rollback()
+        assert quickfind_ops._cache.get(user.id) == "cached"
+
+        quickfind_ops.invalidate(db, user.id)
+        await db.commit()
+        assert quickfind_ops._cache.get(user.id) is None
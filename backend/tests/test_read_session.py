@@ -0,0 +1,19 @@
+import pytest
+from sqlalchemy import literal, select
+
+from app.core.database import read_session_maker
+
+
+@pytest.mark.parametrize("method", ["execute", "scalar", "scalars"])
+async def test_read_session_releases_connection(db_clean: None, method: str):
+    async with read_session_maker() as db:
+        result = await getattr(db, method)(select(literal(1)))
+        assert not db.in_transaction()
+    value = result if method == "scalar" else result.first()
+    assert value in (1, (1,))
+
+
+async def test_read_session_refuses_to_stream(db_clean: None):
+    async with read_session_maker() as db:
+        with pytest.raises(NotImplementedError):
+            await db.stream(select(literal(1)))
@@ -0,0 +1,64 @@
+import uuid as uuid_pkg
+from typing import Any, Callable
+
+import pytest
+from sqlalchemy import event, literal, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.core import database
+from app.core.database import ReplicaRouter, read_engine, read_session_maker
+
+
+def test_writers_stay_on_primary_while_a_replica_may_lag():
+    replica = create_async_engine("postgresql+asyncpg://replica/forum")
+    router = ReplicaRouter(
+        primary=read_engine,
+        replicas=[replica],
+        sticky_seconds=5.0,
+        max_lag_seconds=30.0,
+        health_check_interval=10.0,
+    )
+    writer, reader = uuid_pkg.uuid4(), uuid_pkg.uuid4()
+    router.record_write(writer)
+
+    assert router.sticky_seconds == 40.0
+    assert router.reader(writer) is read_engine
+    assert router.reader(reader) is replica
+
+
+async def test_read_session_stays_on_one_replica(
+    db_clean: None, monkeypatch: pytest.MonkeyPatch
+):
+    # Two engines on the test database stand in for two replicas
+    replicas = [
+        create_async_engine(settings.database_url).execution_options(postgresql_readonly=True)
+        for _ in range(2)
+    ]
+    statements = dict.fromkeys(range(len(replicas)), 0)
+
+    def counter(index: int) -> Callable[..., None]:
+        def count(*_: Any) -> None:
+            statements[index] += 1
+
+        return count
+
+    for index, replica in enumerate(replicas):
+        event.listen(replica.sync_engine, "before_cursor_execute", counter(index))
+    router = ReplicaRouter(
+        primary=read_engine,
+        replicas=replicas,
+        sticky_seconds=5.0,
+        max_lag_seconds=30.0,
+        health_check_interval=10.0,
+    )
+    monkeypatch.setattr(database, "replica_router", router)
+
+    for expected in ({0: 3, 1: 0}, {0: 3, 1: 3}):
+        async with read_session_maker() as db:
+            for _ in range(3):
+                assert await db.scalar(select(literal(1))) == 1
+        assert statements == expected
+
+    for replica in replicas:
+        await replica.dispose()
@@ -0,0 +1,72 @@
+from typing import Iterator
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.core.result_cache import MemoryBackend, make_backend, result_cache
+
+
+@pytest.fixture
+def cache() -> Iterator[None]:
+    """A fresh in-process backend, with the counters at zero."""
+    result_cache.configure(MemoryBackend(max_entries=100, ttl_seconds=60.0))
+    yield
+    result_cache.configure(make_backend(settings.result_cache_backend))
+
+
+async def stats(client: httpx.AsyncClient) -> dict:
+    response = await client.get("/health/cache")
+    return response.json()["results"]
+
+
+async def names(client: httpx.AsyncClient) -> list:
+    response = await client.get("/api/products")
+    assert response.status_code == 200, response.text
+    return [product["name"] for product in response.json()]
+
+
+async def test_reads_are_served_from_cache(
+    cache: None, client: httpx.AsyncClient, product_id: str
+):
+    assert await names(client) == ["Forum"]
+    assert await names(client) == ["Forum"]
+    counters = await stats(client)
+    assert (counters["backend"], counters["misses"], counters["hits"]) == ("memory", 1, 1)
+    assert counters["hit_rate"] == 0.5
+
+
+async def test_write_invalidates_before_response(
+    cache: None, client: httpx.AsyncClient, product_id: str
+):
+    assert await names(client) == ["Forum"]
+
+    response = await client.patch(f"/api/products/{product_id}", params={"name": "Renamed"})
+    assert response.status_code == 200, response.text
+    assert await names(client) == ["Renamed"]
+
+    await client.post("/api/products", params={"name": "Second"})
+    assert await names(client) == ["Second", "Renamed"]
+
+    assert (await stats(client))["hits"] == 0
+
+
+async def test_rolled_back_batch_keeps_cache(
+    cache: None, client: httpx.AsyncClient, product_id: str
+):
+    assert await names(client) == ["Forum"]
+    invalidations = (await stats(client))["invalidations"]
+    response = await client.post(
+        "/api/batch",
+        json={
+            "atomic": True,
+            "requests": [
+                {"method": "PATCH", "url": f"/api/products/{product_id}?name=Renamed"},
+                {"method": "GET", "url": "/api/products/00000000-0000-0000-0000-000000000000"},
+            ],
+        },
+    )
+    assert response.json()["committed"] is False
+    assert await names(client) == ["Forum"]
+    counters = await stats(client)
+    assert (counters["invalidations"], counters["hits"]) == (invalidations, 1)
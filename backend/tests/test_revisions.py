@@ -0,0 +1,47 @@
+import uuid as uuid_pkg
+
+import httpx
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product
+
+
+async def test_revisions_of_deleted_products_are_hidden(
+    client: httpx.AsyncClient, session: AsyncSession, product_id: str
+):
+    response = await client.post(
+        "/api/docs", params={"product_id": product_id, "title": "Spec", "content": "Draft"}
+    )
+    assert response.status_code == 201, response.text
+    document_id = response.json()["id"]
+    response = await client.patch(f"/api/docs/{document_id}", params={"content": "Final"})
+    assert response.status_code == 200, response.text
+
+    response = await client.get(f"/api/docs/{document_id}/revisions")
+    assert response.status_code == 200, response.text
+    numbers = [revision["number"] for revision in response.json()]
+    assert len(numbers) == 2
+    response = await client.get(f"/api/docs/{document_id}/revisions/{numbers[-1]}")
+    assert response.status_code == 200, response.text
+    assert response.json()["content"] == "Draft"
+
+    # As DELETE leaves it until the background purge removes the children
+    await session.execute(
+        update(Product)
+        .where(Product.id == uuid_pkg.UUID(product_id))
+        .values(deleted_at=Product.created_at)
+    )
+    await session.commit()
+
+    for path in ("", "/revisions", f"/revisions/{numbers[-1]}"):
+        response = await client.get(f"/api/docs/{document_id}{path}")
+        assert response.status_code == 404, (path, response.text)
+
+
+async def test_revision_listing_limit_is_bounded(client: httpx.AsyncClient):
+    for limit in (0, 201):
+        response = await client.get(
+            f"/api/docs/{uuid_pkg.uuid4()}/revisions", params={"limit": limit}
+        )
+        assert response.status_code == 422, response.text
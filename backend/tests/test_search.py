@@ -0,0 +1,62 @@
+import uuid as uuid_pkg
+
+import httpx
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.document import Document
+from app.models.product import Product
+from app.models.user import User
+
+
+async def search(client: httpx.AsyncClient, q: str) -> list:
+    response = await client.get("/api/search", params={"q": q})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_search_indexes_a_prefix_of_long_bodies(
+    client: httpx.AsyncClient, session: AsyncSession, user: User, product_id: str
+):
+    # Far more distinct words than fit in a 1 MB tsvector
+    content = "zeppelin " + " ".join(f"w{number}" for number in range(200_000))
+    session.add(
+        Document(
+            user_id=user.id,
+            product_id=uuid_pkg.UUID(product_id),
+            title="Long",
+            content=content,
+        )
+    )
+    await session.commit()
+
+    assert [hit["title"] for hit in await search(client, "zeppelin")] == ["Long"]
+    assert await search(client, "w199999") == []
+
+
+async def test_search_leaves_out_deleted_products(
+    client: httpx.AsyncClient, session: AsyncSession, product_id: str
+):
+    response = await client.post("/api/products", params={"name": "Deleted"})
+    deleted_id = response.json()["id"]
+    for product in (product_id, deleted_id):
+        response = await client.post(
+            "/api/docs", params={"product_id": product, "title": "Zeppelin notes"}
+        )
+        assert response.status_code == 201, response.text
+        response = await client.post(
+            "/api/work/bulk", json=[{"product_id": product, "title": "Zeppelin launch"}]
+        )
+        assert response.status_code == 201, response.text
+
+    # As DELETE leaves it until the background purge removes the children
+    await session.execute(
+        update(Product)
+        .where(Product.id == uuid_pkg.UUID(deleted_id))
+        .values(deleted_at=Product.created_at)
+    )
+    await session.commit()
+
+    hits = await search(client, "zeppelin")
+    assert sorted(hit["kind"] for hit in hits) == ["documents", "work_items"]
+    assert {hit["product_id"] for hit in hits} == {product_id}
@@ -0,0 +1,27 @@
+import httpx
+
+
+async def test_summary_lists_products_without_counters(
+    client: httpx.AsyncClient, product_id: str
+):
+    response = await client.post("/api/products", params={"name": "Empty"})
+    empty_id = response.json()["id"]
+    response = await client.post(
+        "/api/work/bulk", json=[{"product_id": product_id, "title": "Next", "status": "todo"}]
+    )
+    assert response.status_code == 201, response.text
+
+    response = await client.get("/api/products/summary")
+    assert response.status_code == 200, response.text
+    summary = {entry["product_id"]: entry for entry in response.json()}
+    assert list(summary) == [empty_id, product_id]
+    assert summary[empty_id] == {
+        "product_id": empty_id,
+        "repositories": {"total": 0},
+        "work_items": {"total": 0},
+        "documents": {"total": 0},
+        "app_info": {"total": 0},
+    }
+    assert summary[product_id]["work_items"]["total"] == 1
+    assert summary[product_id]["work_items"]["status"] == {"todo": 1}
+    assert summary[product_id]["documents"] == {"total": 0}
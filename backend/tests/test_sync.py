@@ -0,0 +1,88 @@
+import uuid as uuid_pkg
+from typing import Any, Dict, Optional
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain import product_ops
+from app.models.user import User
+
+
+async def sync(client: httpx.AsyncClient, since: Optional[str] = None, **params: Any) -> Dict:
+    if since is not None:
+        params["since"] = since
+    response = await client.get("/api/sync", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def create_item(client: httpx.AsyncClient, product_id: str, title: str) -> str:
+    response = await client.post("/api/work", params={"product_id": product_id, "title": title})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def test_sync_returns_only_changes_after_the_token(
+    client: httpx.AsyncClient, product_id: str
+):
+    first = await create_item(client, product_id, "First")
+    page = await sync(client)
+    assert not page["has_more"]
+    assert [product["id"] for product in page["products"]] == [product_id]
+    assert [item["id"] for item in page["work_items"]] == [first]
+
+    second = await create_item(client, product_id, "Second")
+    page = await sync(client, page["token"])
+    assert page["products"] == []
+    assert [item["id"] for item in page["work_items"]] == [second]
+
+    page = await sync(client, page["token"])
+    assert page["work_items"] == [] and page["deleted"] == []
+
+
+async def test_sync_pages_through_a_round(client: httpx.AsyncClient, product_id: str):
+    ids = [await create_item(client, product_id, f"Item {n}") for n in range(3)]
+    seen = []
+    page = await sync(client, limit=2)
+    seen += [item["id"] for item in page["work_items"]]
+    assert page["has_more"]
+    while page["has_more"]:
+        page = await sync(client, page["token"], limit=2)
+        seen += [item["id"] for item in page["work_items"]]
+    assert sorted(seen) == sorted(ids)
+
+
+async def test_deleted_work_items_are_tombstoned(client: httpx.AsyncClient, product_id: str):
+    item_id = await create_item(client, product_id, "Doomed")
+    token = (await sync(client))["token"]
+
+    response = await client.delete(f"/api/work/{item_id}")
+    assert response.status_code == 204, response.text
+    page = await sync(client, token)
+    assert page["work_items"] == []
+    assert [(row["entity"], row["id"], row["product_id"]) for row in page["deleted"]] == [
+        ("work_items", item_id, product_id)
+    ]
+
+
+async def test_soft_deleted_products_are_tombstoned_at_once(
+    client: httpx.AsyncClient, session: AsyncSession, user: User, product_id: str
+):
+    await create_item(client, product_id, "Child")
+    token = (await sync(client))["token"]
+
+    # Without the background purge, which would write tombstones of its own
+    assert await product_ops.delete(session, id=uuid_pkg.UUID(product_id), user_id=user.id)
+    await session.commit()
+
+    for since in (token, None):
+        page = await sync(client, since)
+        assert page["products"] == [] and page["work_items"] == []
+        assert [(row["entity"], row["id"]) for row in page["deleted"]] == [
+            ("products", product_id)
+        ]
+
+
+async def test_malformed_token_is_rejected(client: httpx.AsyncClient):
+    response = await client.get("/api/sync", params={"since": "not-a-token"})
+    assert response.status_code == 400, response.text
@@ -0,0 +1,102 @@
+import uuid as uuid_pkg
+from typing import Dict, List
+
+import httpx
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product
+
+
+async def bulk_create(client: httpx.AsyncClient, product_id: str, *statuses: str) -> List[Dict]:
+    items = [
+        {"product_id": product_id, "title": f"Item {n}", "status": status}
+        for n, status in enumerate(statuses)
+    ]
+    response = await client.post("/api/work/bulk", json=items)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def status_counts(client: httpx.AsyncClient, product_id: str) -> Dict[str, int]:
+    response = await client.get("/api/products/summary")
+    assert response.status_code == 200, response.text
+    (entry,) = [entry for entry in response.json() if entry["product_id"] == product_id]
+    return {
+        status: count for status, count in entry["work_items"].get("status", {}).items() if count
+    }
+
+
+async def test_bulk_update_changes_each_row(client: httpx.AsyncClient, product_id: str):
+    first, second = await bulk_create(client, product_id, "todo", "todo")
+    updates = [
+        {"id": first["id"], "status": "done", "priority": 1},
+        # Null fields leave the column as it is
+        {"id": second["id"], "title": "Renamed"},
+    ]
+    response = await client.patch("/api/work/bulk", json=updates)
+    assert response.status_code == 200, response.text
+    updated = {item["id"]: item for item in response.json()}
+    assert (updated[first["id"]]["status"], updated[first["id"]]["priority"]) == ("done", 1)
+    assert updated[first["id"]]["title"] == "Item 0"
+    assert (updated[second["id"]]["status"], updated[second["id"]]["title"]) == ("todo", "Renamed")
+    assert await status_counts(client, product_id) == {"todo": 1, "done": 1}
+
+
+async def test_bulk_update_is_all_or_nothing(client: httpx.AsyncClient, product_id: str):
+    (item,) = await bulk_create(client, product_id, "todo")
+    updates = [
+        {"id": item["id"], "status": "done"},
+        {"id": str(uuid_pkg.uuid4()), "status": "done"},
+    ]
+    response = await client.patch("/api/work/bulk", json=updates)
+    assert response.status_code == 404, response.text
+
+    response = await client.get(f"/api/work/{item['id']}")
+    assert response.json()["status"] == "todo"
+
+    response = await client.patch("/api/work/bulk", json=[{"id": item["id"]}] * 2)
+    assert response.status_code == 400, response.text
+
+
+async def test_bulk_delete(client: httpx.AsyncClient, product_id: str):
+    items = await bulk_create(client, product_id, "todo", "done", "done")
+    response = await client.request(
+        "DELETE", "/api/work/bulk", json=[items[0]["id"], str(uuid_pkg.uuid4())]
+    )
+    assert response.status_code == 404, response.text
+
+    ids = [item["id"] for item in items[:2]]
+    response = await client.request("DELETE", "/api/work/bulk", json=ids)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"count": 2}
+    assert await status_counts(client, product_id) == {"done": 1}
+
+
+async def test_move_status(client: httpx.AsyncClient, product_id: str):
+    await bulk_create(client, product_id, "todo", "todo", "done")
+    move = {"product_id": product_id, "from_status": "todo", "to_status": "in_progress"}
+    response = await client.post("/api/work/bulk/status", json=move)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"count": 2}
+    assert await status_counts(client, product_id) == {"in_progress": 2, "done": 1}
+
+
+async def test_deleted_products_take_no_items(
+    client: httpx.AsyncClient, session: AsyncSession, product_id: str
+):
+    await bulk_create(client, product_id, "todo")
+    # As DELETE leaves it until the background purge removes the children
+    await session.execute(
+        update(Product)
+        .where(Product.id == uuid_pkg.UUID(product_id))
+        .values(deleted_at=Product.created_at)
+    )
+    await session.commit()
+
+    items = [{"product_id": product_id, "title": "Late"}]
+    response = await client.post("/api/work/bulk", json=items)
+    assert response.status_code == 404, response.text
+    move = {"product_id": product_id, "from_status": "todo", "to_status": "done"}
+    response = await client.post("/api/work/bulk/status", json=move)
+    assert response.status_code == 404, response.text
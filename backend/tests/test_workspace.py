@@ -0,0 +1,51 @@
+import uuid as uuid_pkg
+
+import httpx
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product
+
+
+async def test_workspace_open_work_items(client: httpx.AsyncClient, product_id: str):
+    items = [
+        {"product_id": product_id, "title": "Untriaged"},
+        {"product_id": product_id, "title": "Next", "status": "todo"},
+        {"product_id": product_id, "title": "Shipped", "status": "done"},
+    ]
+    response = await client.post("/api/work/bulk", json=items)
+    assert response.status_code == 201, response.text
+
+    response = await client.get(f"/api/products/{product_id}/workspace")
+    assert response.status_code == 200, response.text
+    open_items = response.json()["open_work_items"]
+    assert {status: [item["title"] for item in items] for status, items in open_items.items()} == {
+        "": ["Untriaged"],
+        "todo": ["Next"],
+    }
+
+
+async def test_workspace_timestamps_match_other_endpoints(
+    client: httpx.AsyncClient, session: AsyncSession, product_id: str
+):
+    response = await client.post("/api/work", params={"product_id": product_id, "title": "Next"})
+    assert response.status_code == 201, response.text
+    item = response.json()
+    # A whole second, which pydantic renders without a fraction
+    await session.execute(
+        update(Product)
+        .where(Product.id == uuid_pkg.UUID(product_id))
+        .values(updated_at=func.date_trunc("second", Product.updated_at))
+    )
+    await session.commit()
+    response = await client.get(f"/api/products/{product_id}")
+    assert response.status_code == 200, response.text
+    product = response.json()
+    assert "." not in product["updated_at"]
+
+    response = await client.get(f"/api/products/{product_id}/workspace")
+    assert response.status_code == 200, response.text
+    workspace = response.json()
+    for field in ("created_at", "updated_at"):
+        assert workspace["product"][field] == product[field]
+        assert workspace["open_work_items"][""][0][field] == item[field]
@@ -0,0 +1,92 @@
+"""
+Query-count checks for the single-record write routes.
+
+Every PATCH and DELETE should be one UPDATE or DELETE ... RETURNING on its
+table: no SELECT before it to load or check the row, and no refresh after
+it. Counted tables add the one product_counters upsert. Document edits to
+the title or content also record a revision, so the document PATCH here
+changes a field that is not versioned.
+"""
+import uuid as uuid_pkg
+from typing import Iterator, List
+
+import httpx
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import engine
+from app.models.product import Product
+
+# (collection path, query parameters to create one, PATCH parameters)
+ROUTES = [
+    ("/api/products", {"name": "Other"}, {"description": "Changed"}),
+    ("/api/repositories", {"name": "forum"}, {"description": "Changed"}),
+    ("/api/work", {"title": "Next", "status": "todo"}, {"status": "done"}),
+    ("/api/docs", {"title": "Spec", "content": "Draft"}, {"is_pinned": True}),
+    ("/api/app-info", {"key": "PORT", "value": "8000"}, {"value": "8080"}),
+]
+
+
+@pytest.fixture
+def statements() -> Iterator[List[str]]:
+    """SQL of every statement sent to the primary, as it runs."""
+    executed: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(" ".join(statement.split()))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize("path, create, patch", ROUTES, ids=[path for path, _, _ in ROUTES])
+async def test_single_statement_writes(
+    client: httpx.AsyncClient,
+    product_id: str,
+    statements: List[str],
+    path: str,
+    create: dict,
+    patch: dict,
+):
+    params = create if path == "/api/products" else {"product_id": product_id, **create}
+    response = await client.post(path, params=params)
+    assert response.status_code == 201, response.text
+    entity_id = response.json()["id"]
+
+    statements.clear()
+    response = await client.patch(f"{path}/{entity_id}", params=patch)
+    assert response.status_code == 200, response.text
+    assert_one_write(statements, "UPDATE")
+
+    statements.clear()
+    response = await client.delete(f"{path}/{entity_id}")
+    assert response.status_code in (202, 204), response.text
+    # Products are soft-deleted
+    assert_one_write(statements, "UPDATE" if path == "/api/products" else "DELETE")
+
+
+def assert_one_write(statements: List[str], verb: str) -> None:
+    write, *rest = statements
+    assert write.startswith(verb) and " RETURNING " in write, statements
+    assert all(statement.startswith("INSERT INTO product_counters ") for statement in rest), statements
+
+
+async def test_children_of_deleted_products_are_not_deleted(
+    client: httpx.AsyncClient, session: AsyncSession, product_id: str
+):
+    params = {"product_id": product_id, "title": "Spec", "content": "Draft"}
+    response = await client.post("/api/docs", params=params)
+    assert response.status_code == 201, response.text
+    document_id = response.json()["id"]
+    # As DELETE leaves it until the background purge removes the children
+    await session.execute(
+        update(Product)
+        .where(Product.id == uuid_pkg.UUID(product_id))
+        .values(deleted_at=Product.created_at)
+    )
+    await session.commit()
+
+    response = await client.delete(f"/api/docs/{document_id}")
+    assert response.status_code == 404, response.text